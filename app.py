@@ -1,4 +1,5 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import (Flask, render_template, request, jsonify, session, g, has_app_context, make_response,
+                   stream_with_context, send_from_directory, url_for)
 import sqlite3
 from pathlib import Path
 from dotenv import load_dotenv
@@ -8,39 +9,101 @@ from datetime import datetime, date, timedelta
 import time
 import traceback
 import threading
+import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from contextlib import closing, contextmanager
+from collections import OrderedDict
+from itertools import islice, groupby
 import schedule
 import pytz
 import logging
+import click
+import hashlib
+import base64
+import gzip
+import mimetypes
+import uuid
+import socket
+from urllib.parse import urlsplit
+from steam_client import SteamClient, SharedTokenBucket, STEAM_API_BASE, STEAM_STORE_BASE, endpoint_label
+from thumbnails import generate_cover_thumbnails, supported_formats
+from metrics import MetricsRegistry, MultiProcessStore
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; without it responses are gzip-encoded only
+    brotli = None
 
 # Load environment variables
 load_dotenv()
 
 # Paths and constants
 DB_PATH = Path(__file__).parent / "data" / "gametracker.db"
-DB_PATH.parent.mkdir(exist_ok=True)
 COVERS_PATH = Path(__file__).parent / "static" / "covers"
-COVERS_PATH.mkdir(exist_ok=True)
+LOG_PATH = 'daily_tracker.log'
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback_dev_key")
 STEAM_API_KEY = os.getenv("STEAM_API_KEY", "")
 STEAM_USER_ID = os.getenv("STEAM_USER_ID", "") 
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
-STEAM_API_LAST_CALL = 0
 STEAM_API_MIN_INTERVAL = 1.2
+# Steam API budget shared by every thread and process: sustained calls/sec and burst size
+STEAM_API_RATE = float(os.getenv("STEAM_API_RATE", 1 / STEAM_API_MIN_INTERVAL))
+STEAM_API_BURST = int(os.getenv("STEAM_API_BURST", 3))
+# Parallel achievement fetches during imports and bulk updates
+STEAM_FETCH_WORKERS = int(os.getenv("STEAM_FETCH_WORKERS", 4))
+# How long a cached GetSchemaForGame result is used before refreshing it
+STEAM_SCHEMA_TTL = float(os.getenv("STEAM_SCHEMA_TTL_HOURS", 24 * 7)) * 3600
+# How long one GetOwnedGames download is shared between callers
+STEAM_OWNED_GAMES_TTL = float(os.getenv("STEAM_OWNED_GAMES_TTL", 60))
+
+# Every this many days a daily snapshot stores all games instead of only the changes
+SNAPSHOT_KEYFRAME_DAYS = int(os.getenv("SNAPSHOT_KEYFRAME_DAYS", 30))
+# Rows per executemany batch, and roughly how many rows a bulk job writes per transaction
+BULK_WRITE_CHUNK_SIZE = int(os.getenv("BULK_WRITE_CHUNK_SIZE", 500))
+
+# 'embedded' runs the daily scheduler in the web processes (one is elected
+# leader); 'external' leaves it to a separate `flask run-scheduler` process
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "embedded")
+SCHEDULER_TICK_SECONDS = 60
+# A leader that hasn't renewed its lease for this long is presumed dead
+SCHEDULER_LEASE_SECONDS = 3 * SCHEDULER_TICK_SECONDS
+
+# How often each process writes its metrics for /api/admin/metrics to sum
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", 5))
+
+# SQLite connection tuning
+SQLITE_BUSY_TIMEOUT = 10  # seconds
+SQLITE_CACHE_SIZE_KB = 16000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('daily_tracker.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def configure_logging():
+    """Log to daily_tracker.log and the console; does nothing if logging is already set up"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_PATH),
+            logging.StreamHandler()
+        ]
+    )
+
 class DailyHoursTracker:
     """
     Daily hours tracker that records snapshots at midnight EST.
     Fixed to properly handle timezone conversion.
+    
+    daily_game_snapshots is delta-encoded: a keyframe snapshot (every
+    SNAPSHOT_KEYFRAME_DAYS) stores every game with hours, other days only
+    store games whose hours, title or cover changed. A game that dropped out
+    of the snapshot gets a tombstone row with hours_played = 0.
+    
+    Each snapshot also writes daily_play_deltas: the hours every game gained
+    since the most recent earlier snapshot, however many days back that is.
+    Those deltas are added to the week/month/year playtime rollups.
     """
     
     def __init__(self, db_path):
@@ -54,6 +117,41 @@ class DailyHoursTracker:
         est_now = utc_now.astimezone(self.est)
         return est_now.date()
     
+    @staticmethod
+    def is_keyframe_due(date_str, last_keyframe):
+        if last_keyframe is None:
+            return True
+        days = (date.fromisoformat(date_str) - date.fromisoformat(last_keyframe)).days
+        return days >= SNAPSHOT_KEYFRAME_DAYS
+    
+    @staticmethod
+    def get_snapshot_games(cur, date_str):
+        """
+        Rebuild the full per-game snapshot for a date from the latest keyframe
+        at or before it plus the deltas since. Returns game_id -> row dict,
+        ordered by hours played (most first).
+        """
+        cur.execute('''
+            SELECT MAX(date) as date FROM daily_snapshots
+            WHERE date <= ? AND is_keyframe = 1
+        ''', (date_str,))
+        keyframe = cur.fetchone()['date'] or ''
+        
+        # The newest row per game within [keyframe, date] is its state on that date
+        cur.execute('''
+            SELECT s.game_id, s.game_title, s.hours_played, s.cover_url
+            FROM daily_game_snapshots s
+            JOIN (
+                SELECT game_id, MAX(date) as date
+                FROM daily_game_snapshots
+                WHERE date >= ? AND date <= ?
+                GROUP BY game_id
+            ) latest ON latest.game_id = s.game_id AND latest.date = s.date
+            WHERE s.hours_played > 0
+            ORDER BY s.hours_played DESC, s.game_id ASC
+        ''', (keyframe, date_str))
+        return {row['game_id']: dict(row) for row in cur.fetchall()}
+    
     def record_daily_snapshot(self):
         try:
             current_date = self.get_current_date_est()
@@ -69,14 +167,25 @@ class DailyHoursTracker:
             logger.info(f"EST time: {est_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
             logger.info(f"Date being recorded: {date_str}")
             
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_db(self.db_path)
             cur = conn.cursor()
             
             # Check if we already have a snapshot for today
             cur.execute('SELECT id FROM daily_snapshots WHERE date = ?', (date_str,))
             existing_snapshot = cur.fetchone()
             
+            # State as of the most recent earlier snapshot, to diff against
+            cur.execute('SELECT MAX(date) as date FROM daily_snapshots WHERE date < ?', (date_str,))
+            prev_date = cur.fetchone()['date']
+            prev_games = self.get_snapshot_games(cur, prev_date) if prev_date else {}
+            prev_hours = {game_id: game['hours_played'] for game_id, game in prev_games.items()}
+            
+            cur.execute('''
+                SELECT MAX(date) as date FROM daily_snapshots
+                WHERE date < ? AND is_keyframe = 1
+            ''', (date_str,))
+            is_keyframe = self.is_keyframe_due(date_str, cur.fetchone()['date'])
+            
             # Get current total hours across all games
             cur.execute('SELECT SUM(hours_played) as total FROM games WHERE hours_played IS NOT NULL')
             row = cur.fetchone()
@@ -91,19 +200,21 @@ class DailyHoursTracker:
                 logger.info(f"Updating existing snapshot for {date_str}")
                 cur.execute('''
                     UPDATE daily_snapshots 
-                    SET total_hours = ?, games_played = ?, created_at = CURRENT_TIMESTAMP
+                    SET total_hours = ?, games_played = ?, is_keyframe = ?, created_at = CURRENT_TIMESTAMP
                     WHERE date = ?
-                ''', (total_hours, games_count, date_str))
+                ''', (total_hours, games_count, int(is_keyframe), date_str))
                 
                 # Delete existing game snapshots for this date
                 cur.execute('DELETE FROM daily_game_snapshots WHERE date = ?', (date_str,))
+                apply_play_deltas_to_rollups(cur, date_str, sign=-1)
+                cur.execute('DELETE FROM daily_play_deltas WHERE date = ?', (date_str,))
             else:
                 # Insert new snapshot
                 logger.info(f"Creating new snapshot for {date_str}")
                 cur.execute('''
-                    INSERT INTO daily_snapshots (date, total_hours, games_played)
-                    VALUES (?, ?, ?)
-                ''', (date_str, total_hours, games_count))
+                    INSERT INTO daily_snapshots (date, total_hours, games_played, is_keyframe)
+                    VALUES (?, ?, ?, ?)
+                ''', (date_str, total_hours, games_count, int(is_keyframe)))
             
             # Snapshot individual game hours
             cur.execute('''
@@ -113,17 +224,34 @@ class DailyHoursTracker:
             ''')
             games = cur.fetchall()
             
+            rows = []
             for game in games:
-                cur.execute('''
-                    INSERT INTO daily_game_snapshots (date, game_id, game_title, hours_played, cover_url)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (date_str, game['id'], game['title'], game['hours_played'], game['cover_url']))
+                prev = prev_games.pop(game['id'], None)
+                unchanged = prev is not None and (prev['game_title'], prev['hours_played'], prev['cover_url']) == \
+                    (game['title'], game['hours_played'], game['cover_url'])
+                if is_keyframe or not unchanged:
+                    rows.append((date_str, game['id'], game['title'], game['hours_played'], game['cover_url']))
+            
+            if not is_keyframe:
+                # Tombstones for games that no longer have hours
+                rows.extend((date_str, game_id, prev['game_title'], 0, prev['cover_url'])
+                            for game_id, prev in prev_games.items())
+            
+            bulk_insert(cur, 'daily_game_snapshots', ('date', 'game_id', 'game_title', 'hours_played', 'cover_url'), rows)
+            
+            if prev_date:
+                insert_play_deltas(cur, date_str, prev_date, prev_hours,
+                                   ((g['id'], g['title'], g['hours_played'], g['cover_url']) for g in games))
+                apply_play_deltas_to_rollups(cur, date_str)
             
             conn.commit()
             conn.close()
+            data_version.bump()
+            response_cache.invalidate('stats', 'playtime')
             
             action = "updated" if existing_snapshot else "recorded"
-            logger.info(f"✓ Snapshot {action}: {total_hours}h across {games_count} games")
+            kind = "keyframe" if is_keyframe else f"{len(rows)} changed rows"
+            logger.info(f"✓ Snapshot {action}: {total_hours}h across {games_count} games ({kind})")
             logger.info(f"=" * 60)
             
             return {
@@ -151,8 +279,7 @@ class DailyHoursTracker:
         Returns: list of dicts with date, total_hours, hours_added, games_played
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_db(self.db_path)
             cur = conn.cursor()
             
             # Get snapshots for the last N days
@@ -196,66 +323,37 @@ class DailyHoursTracker:
     
     def get_games_played_on_date(self, date_str):
         """
-        Get games that had hours added on a specific date.
-        Compares the snapshot for date_str with the previous day's snapshot.
+        Get games that had hours added on a specific date, compared with the
+        most recent earlier snapshot. Reads the deltas stored by record_daily_snapshot().
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_db(self.db_path)
             cur = conn.cursor()
             
-            # Get snapshot for the requested date
-            cur.execute('''
-                SELECT game_id, game_title, hours_played, cover_url
-                FROM daily_game_snapshots
-                WHERE date = ?
-                ORDER BY hours_played DESC
-            ''', (date_str,))
-            
-            current_snapshot = [dict(row) for row in cur.fetchall()]
-            
-            if not current_snapshot:
+            cur.execute('SELECT 1 FROM daily_snapshots WHERE date = ?', (date_str,))
+            if not cur.fetchone():
                 conn.close()
                 return []
             
-            # Get previous day's snapshot
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-            prev_date = (date_obj - timedelta(days=1)).isoformat()
-            
-            cur.execute('''
-                SELECT game_id, hours_played
-                FROM daily_game_snapshots
-                WHERE date = ?
-            ''', (prev_date,))
-            
-            prev_snapshot = {row['game_id']: row['hours_played'] for row in cur.fetchall()}
-            conn.close()
-            
-            # If no previous snapshot exists, return special flag
-            if not prev_snapshot:
+            # If no earlier snapshot exists, return special flag
+            cur.execute('SELECT 1 FROM daily_snapshots WHERE date < ? LIMIT 1', (date_str,))
+            if not cur.fetchone():
+                conn.close()
                 return [{
                     'is_first_day': True,
                     'date': date_str
                 }]
             
-            # Calculate games played that day
-            result = []
-            for game in current_snapshot:
-                prev_hours = prev_snapshot.get(game['game_id'], 0)
-                hours_added = game['hours_played'] - prev_hours
-                
-                # Only include games where hours increased
-                if hours_added > 0.01:
-                    result.append({
-                        'game_id': game['game_id'],
-                        'game_title': game['game_title'],
-                        'hours_added': round(hours_added, 1),
-                        'total_hours': round(game['hours_played'], 1),
-                        'cover_url': game['cover_url']
-                    })
-            
-            # Sort by hours added that day
-            result.sort(key=lambda x: x['hours_added'], reverse=True)
+            # Deltas were computed when the snapshot was recorded; since_date is
+            # the snapshot they were measured against (earlier than the day before after a gap)
+            cur.execute('''
+                SELECT game_id, game_title, hours_added, total_hours, cover_url, prev_date as since_date
+                FROM daily_play_deltas
+                WHERE date = ?
+                ORDER BY hours_added DESC, total_hours DESC, game_id ASC
+            ''', (date_str,))
+            result = [dict(row) for row in cur.fetchall()]
+            conn.close()
             return result
             
         except Exception as e:
@@ -266,7 +364,7 @@ class DailyHoursTracker:
     def create_tables(self):
         """Create necessary database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_db(self.db_path)
             cur = conn.cursor()
             
             # Main daily snapshots table
@@ -316,70 +414,421 @@ class DailyHoursTracker:
             return False
 
 
-def setup_daily_scheduler(tracker):
+# Per-process schedule; only the process holding the lease runs it
+daily_scheduler = schedule.Scheduler()
+
+class SchedulerLease:
     """
-    Set up scheduler to run at midnight EST every day.
-    FIXED: Now runs at 00:05 EST (05:05 UTC) to ensure we're past midnight
+    Leader election for the daily scheduler across worker processes.
+
+    Every process that starts a scheduler competes for one row in
+    scheduler_lease. The holder renews it on each tick; once it has gone
+    SCHEDULER_LEASE_SECONDS without renewal (its process died) another
+    process takes over. The row also records the EST date of the last daily
+    job, so a new leader catches up on a missed run but never repeats one.
     """
-    def job():
-        """Job that runs just after midnight EST"""
-        logger.info("\n" + "=" * 60)
-        logger.info("SCHEDULED JOB TRIGGERED - Recording daily snapshot")
-        
-        utc_now = datetime.now(pytz.UTC)
-        est_now = utc_now.astimezone(tracker.est)
-        logger.info(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.info(f"EST time: {est_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.info("=" * 60 + "\n")
-        
+
+    def __init__(self, name='daily-snapshot'):
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    def acquire(self):
+        """Take or renew the lease. Returns True while this process is the leader."""
+        now = time.time()
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute('''
+                INSERT INTO scheduler_lease (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+                WHERE scheduler_lease.holder = excluded.holder OR scheduler_lease.expires_at < ?
+            ''', (self.name, self.holder, now + SCHEDULER_LEASE_SECONDS, now))
+            conn.commit()
+            is_leader = cur.rowcount == 1
+        finally:
+            conn.close()
+
+        if is_leader != self.is_leader:
+            logger.info(f"Scheduler {self.holder} {'became' if is_leader else 'is no longer'} the leader")
+        self.is_leader = is_leader
+        return is_leader
+
+    @contextmanager
+    def renewing(self):
+        """Keep renewing the lease in a side thread while the body runs (e.g. a long Steam update)"""
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(SCHEDULER_TICK_SECONDS):
+                try:
+                    self.acquire()
+                except Exception as e:
+                    logger.error(f"Scheduler lease renewal failed: {e}")
+
+        thread = threading.Thread(target=renew, daemon=True, name='scheduler-lease')
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def release(self):
+        conn = get_db()
+        try:
+            conn.execute('UPDATE scheduler_lease SET expires_at = 0 WHERE name = ? AND holder = ?',
+                         (self.name, self.holder))
+            conn.commit()
+        finally:
+            conn.close()
+        self.is_leader = False
+
+    def claim_run(self, date_str):
+        """Mark the daily job as run for date_str. False if it already ran or the lease was lost."""
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute('''
+                UPDATE scheduler_lease SET last_run_date = ?
+                WHERE name = ? AND holder = ? AND COALESCE(last_run_date, '') < ?
+            ''', (date_str, self.name, self.holder, date_str))
+            conn.commit()
+            return cur.rowcount == 1
+        finally:
+            conn.close()
+
+    def last_run_date(self):
+        conn = get_db()
+        try:
+            row = conn.execute('SELECT last_run_date FROM scheduler_lease WHERE name = ?', (self.name,)).fetchone()
+        finally:
+            conn.close()
+        return row['last_run_date'] if row else None
+
+
+def run_daily_job(tracker, lease):
+    """Update Steam hours and record the daily snapshot, at most once per EST date across all processes"""
+    date_str = tracker.get_current_date_est().isoformat()
+    if not lease.claim_run(date_str):
+        logger.info(f"Daily job for {date_str} already ran or this process lost the lease; skipping")
+        return
+
+    logger.info("\n" + "=" * 60)
+    logger.info("SCHEDULED JOB TRIGGERED - Recording daily snapshot")
+
+    utc_now = datetime.now(pytz.UTC)
+    est_now = utc_now.astimezone(tracker.est)
+    logger.info(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    logger.info(f"EST time: {est_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    logger.info("=" * 60 + "\n")
+
+    # The Steam update can outlast SCHEDULER_LEASE_SECONDS; renew so no follower takes over mid-job
+    with lease.renewing():
         # First update Steam hours
         logger.info("Updating Steam hours before snapshot...")
         update_all_steam_hours_sync()
-        
+
         # Then record snapshot
         result = tracker.record_daily_snapshot()
-        
-        if result['success']:
-            logger.info(f"✓ Daily snapshot recorded successfully: {result.get('message')}")
-        else:
-            logger.error(f"✗ Daily snapshot failed: {result.get('error')}")
-    
+
+    if result['success']:
+        logger.info(f"✓ Daily snapshot recorded successfully: {result.get('message')}")
+    else:
+        logger.error(f"✗ Daily snapshot failed: {result.get('error')}")
+
+def run_scheduler_loop(tracker, lease, stop_event=None):
+    """
+    Tick every SCHEDULER_TICK_SECONDS: renew the lease and, while leader, run
+    the daily job once it's due. Followers only keep trying for the lease.
+    Runs until stop_event is set (forever without one).
+    """
+    stop_event = stop_event or threading.Event()
     # FIXED: Schedule at 00:05 EST (05:05 UTC) to ensure we're past midnight
-    schedule.every().day.at("05:05").do(job)
-    
-    def run_scheduler():
-        """Run the scheduler in a background thread"""
-        logger.info("Starting daily snapshot scheduler...")
-        logger.info("Schedule: 00:05 AM EST (05:05 UTC) daily")
-        logger.info(f"Next run: {schedule.next_run()}")
-        
-        while True:
+    daily_scheduler.clear()
+    daily_scheduler.every().day.at("05:05").do(run_daily_job, tracker, lease)
+
+    logger.info("Starting daily snapshot scheduler...")
+    logger.info("Schedule: 00:05 AM EST (05:05 UTC) daily")
+    logger.info(f"Next run: {daily_scheduler.next_run}")
+
+    try:
+        while not stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                if lease.acquire():
+                    # A leader that took over after 05:05 runs the job a dead leader
+                    # missed; with no run recorded yet it waits for the schedule
+                    today = tracker.get_current_date_est().isoformat()
+                    last_run = lease.last_run_date()
+                    if (datetime.now(pytz.UTC).strftime('%H:%M') >= '05:05'
+                            and last_run and last_run < today):
+                        run_daily_job(tracker, lease)
+                    daily_scheduler.run_pending()
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
                 logger.error(traceback.format_exc())
-                time.sleep(60)
-    
-    # Start scheduler in daemon thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+            # This process serves no requests, so publish its SQL and Steam counts here
+            metrics_store.flush(metrics)
+            stop_event.wait(SCHEDULER_TICK_SECONDS)
+    finally:
+        if lease.is_leader:
+            lease.release()
+
+def setup_daily_scheduler(tracker):
+    """
+    Start the scheduler loop in a daemon thread, unless SCHEDULER_MODE is
+    'external' and a separate `flask run-scheduler` process runs it instead.
+    Safe in every gunicorn worker: the SQLite lease elects one leader, and
+    only the leader runs the 05:05 UTC job.
+    """
+    if SCHEDULER_MODE == 'external':
+        logger.info("Daily snapshot scheduler runs externally (SCHEDULER_MODE=external)")
+        return None
+
+    scheduler_thread = threading.Thread(target=run_scheduler_loop, args=(tracker, SchedulerLease()),
+                                        daemon=True, name='daily-scheduler')
     scheduler_thread.start()
-    
+
     logger.info("✓ Daily snapshot scheduler started")
     return scheduler_thread
 
+# ==============================================================================
+# INSTRUMENTATION
+# ==============================================================================
+
+metrics = MetricsRegistry()
+# Every process's values are written here, and a scrape sums all of them
+metrics_store = MultiProcessStore(str(DB_PATH.parent / "metrics"), interval=METRICS_FLUSH_SECONDS)
+http_requests = metrics.counter(
+    'gametracker_http_requests_total', 'HTTP requests by route, method and status',
+    ('endpoint', 'method', 'status'))
+http_request_seconds = metrics.histogram(
+    'gametracker_http_request_duration_seconds', 'Time spent in the route and its hooks', ('endpoint',))
+sql_statements = metrics.counter(
+    'gametracker_sql_statements_total', 'SQLite statements executed, by route (background outside requests)',
+    ('endpoint',))
+sql_seconds = metrics.counter(
+    'gametracker_sql_seconds_total', 'Time spent executing SQLite statements and fetching their rows',
+    ('endpoint',))
+sql_statements_per_request = metrics.histogram(
+    'gametracker_sql_statements_per_request', 'SQLite statements executed by one request', ('endpoint',),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000))
+sql_seconds_per_request = metrics.histogram(
+    'gametracker_sql_seconds_per_request', 'SQLite time spent by one request', ('endpoint',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5))
+steam_requests = metrics.counter(
+    'gametracker_steam_requests_total', 'Outbound Steam HTTP attempts by endpoint and status (error when it raised)',
+    ('endpoint', 'status'))
+steam_request_seconds = metrics.histogram(
+    'gametracker_steam_request_duration_seconds', 'Outbound Steam HTTP attempt latency, excluding rate limit waits',
+    ('endpoint',))
+
+# Per-thread SQL tally for the request being served; `endpoint` is None outside requests
+sql_activity = threading.local()
+
+def record_sql(seconds, statements=0):
+    """Add one cursor call to the current request's tally, or to the background totals"""
+    endpoint = getattr(sql_activity, 'endpoint', None)
+    if endpoint is None:
+        sql_statements.inc(statements, endpoint='background')
+        sql_seconds.inc(seconds, endpoint='background')
+        return
+    sql_activity.statements += statements
+    sql_activity.seconds += seconds
+
+def observe_steam_request(url, status, seconds):
+    endpoint = endpoint_label(url)
+    steam_requests.inc(endpoint=endpoint, status=status or 'error')
+    steam_request_seconds.observe(seconds, endpoint=endpoint)
+
 # ==============================================================================
 # DATABASE HELPERS
 # ==============================================================================
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports statement counts and time to record_sql()"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_sql(time.perf_counter() - started, 1)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_sql(time.perf_counter() - started, 1)
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            record_sql(time.perf_counter() - started, 1)
+
+    # Row iteration (`for row in cur`) isn't timed, only the explicit fetches
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            record_sql(time.perf_counter() - started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            record_sql(time.perf_counter() - started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            record_sql(time.perf_counter() - started)
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection that goes back to its pool on close() instead of closing.
+    Any transaction left open by the caller is rolled back on release.
+    Statements run through TimedCursor, including the execute() shortcuts.
+    """
+    pool = None
+    checked_out = False
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def close_for_good(self):
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of tuned SQLite connections.
+
+    sqlite3 connections may only be used from the thread that created them, so
+    each thread keeps its own idle list per database file. Nested get_db() calls
+    on one thread get separate connections, so an inner close() never rolls back
+    an outer caller's transaction.
+    """
+
+    def __init__(self, max_idle_per_thread=4):
+        self.max_idle_per_thread = max_idle_per_thread
+        self._local = threading.local()
+
+    def _idle(self, db_path):
+        if not hasattr(self._local, 'idle'):
+            self._local.idle = {}
+        return self._local.idle.setdefault(str(db_path), [])
+
+    def acquire(self, db_path):
+        idle = self._idle(db_path)
+        conn = idle.pop() if idle else self._connect(db_path)
+        conn.checked_out = True
+        return conn
+
+    def release(self, conn):
+        if not conn.checked_out:
+            return
+        conn.checked_out = False
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close_for_good()
+            return
+
+        idle = self._idle(conn.db_path)
+        if len(idle) < self.max_idle_per_thread:
+            idle.append(conn)
+        else:
+            conn.close_for_good()
+
+    def _connect(self, db_path):
+        conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT, factory=PooledConnection)
+        conn.row_factory = sqlite3.Row
+        conn.pool = self
+        conn.db_path = str(db_path)
+
+        # WAL lets readers run alongside the snapshot job and Steam imports;
+        # NORMAL sync is durable across application crashes in WAL mode
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(SQLITE_CACHE_SIZE_KB)}')
+        conn.execute(f'PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+
+db_pool = ConnectionPool()
+
+# Databases whose schema is up to date in this process
+_initialized_dbs = set()
+_initializing_dbs = set()
+_init_db_lock = threading.RLock()
+
+def get_db(db_path=None):
+    """
+    Get a pooled connection. Calling close() returns it to the pool.
+    Inside a request, anything not closed by the route is released at teardown.
+    The first call for a database creates and migrates its schema.
+    """
+    db_path = db_path or DB_PATH
+    if str(db_path) not in _initialized_dbs:
+        init_db(db_path)
+    conn = db_pool.acquire(db_path)
+    if has_app_context():
+        g.setdefault('db_connections', []).append(conn)
     return conn
 
-def init_db():
-    conn = get_db()
+def release_db_connections(exception=None):
+    for conn in g.pop('db_connections', []):
+        db_pool.release(conn)
+
+def init_db(db_path=None):
+    """
+    Create the tables and run pending migrations, once per database per process.
+    get_db() calls this lazily, so nothing touches the database at import time.
+    """
+    db_path = Path(db_path or DB_PATH)
+    with _init_db_lock:
+        # The lock is re-entrant: the connections opened below land back here
+        if str(db_path) in _initialized_dbs or str(db_path) in _initializing_dbs:
+            return
+        _initializing_dbs.add(str(db_path))
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            _create_schema(db_path)
+            DailyHoursTracker(db_path).create_tables()
+            _initialized_dbs.add(str(db_path))
+        finally:
+            _initializing_dbs.discard(str(db_path))
+
+def _create_schema(db_path):
+    conn = get_db(db_path)
     cur = conn.cursor()
     cur.executescript('''
     CREATE TABLE IF NOT EXISTS games (
@@ -444,113 +893,1576 @@ def init_db():
     );
     ''')
     conn.commit()
+    run_migrations(conn)
     conn.close()
 
-# Flask app
-app = Flask(__name__, static_folder='static', template_folder='templates')
-app.config['SECRET_KEY'] = SECRET_KEY
-app.config['PERMANENT_SESSION_LIFETIME'] = 86400 * 30
+# ==============================================================================
+# STATS SUMMARY
+# ==============================================================================
 
-# Initialize database
-init_db()
+# /api/stats reads these tables instead of aggregating games and achievements
+# on every call. Triggers keep them current on every write path, including
+# direct SQL, so routes don't need to remember to update them.
+STATS_SUMMARY_SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS stats_summary (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_games INTEGER NOT NULL DEFAULT 0,
+        total_hours REAL NOT NULL DEFAULT 0,
+        rated_games INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        five_star INTEGER NOT NULL DEFAULT 0,
+        four_star INTEGER NOT NULL DEFAULT 0,
+        three_star INTEGER NOT NULL DEFAULT 0,
+        two_star INTEGER NOT NULL DEFAULT 0,
+        one_star INTEGER NOT NULL DEFAULT 0,
+        unrated INTEGER NOT NULL DEFAULT 0,
+        achievements_total INTEGER NOT NULL DEFAULT 0,
+        achievements_unlocked INTEGER NOT NULL DEFAULT 0
+    );
 
-# Initialize daily hours tracker
-tracker = DailyHoursTracker(DB_PATH)
-tracker.create_tables()
+    -- Game counts per status / platform
+    CREATE TABLE IF NOT EXISTS stats_breakdown (
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (kind, value)
+    );
 
-# Start the daily snapshot scheduler
-setup_daily_scheduler(tracker)
+    -- Per-game achievement counts
+    CREATE TABLE IF NOT EXISTS game_achievement_stats (
+        game_id INTEGER PRIMARY KEY,
+        unlocked INTEGER NOT NULL DEFAULT 0,
+        total INTEGER NOT NULL DEFAULT 0
+    );
 
-logger.info("Application initialized successfully")
+    CREATE TRIGGER IF NOT EXISTS trg_stats_games_insert AFTER INSERT ON games
+    BEGIN
+        UPDATE stats_summary SET
+            total_games = total_games + 1,
+            total_hours = total_hours + COALESCE(NEW.hours_played, 0),
+            rated_games = rated_games + (NEW.rating IS NOT NULL),
+            rating_sum = rating_sum + COALESCE(NEW.rating, 0),
+            five_star = five_star + (NEW.rating IS 5),
+            four_star = four_star + (NEW.rating IS 4),
+            three_star = three_star + (NEW.rating IS 3),
+            two_star = two_star + (NEW.rating IS 2),
+            one_star = one_star + (NEW.rating IS 1),
+            unrated = unrated + (NEW.rating IS NULL)
+        WHERE id = 1;
 
-# Authentication decorator
-from functools import wraps
-def login_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('logged_in'):
-            return jsonify({'error': 'Authentication required'}), 401
-        return f(*args, **kwargs)
-    return decorated_function
+        INSERT OR IGNORE INTO stats_breakdown (kind, value)
+        SELECT 'status', NEW.status WHERE NEW.status IS NOT NULL AND NEW.status != '';
+        UPDATE stats_breakdown SET count = count + 1 WHERE kind = 'status' AND value = NEW.status;
 
-# ==============================================================================
-# STEAM API HELPERS
-# ==============================================================================
+        INSERT OR IGNORE INTO stats_breakdown (kind, value)
+        SELECT 'platform', NEW.platform WHERE NEW.platform IS NOT NULL AND NEW.platform != '';
+        UPDATE stats_breakdown SET count = count + 1 WHERE kind = 'platform' AND value = NEW.platform;
+    END;
 
-def search_steam_games(query):
-    """Search for games on Steam"""
-    try:
-        url = f"https://store.steampowered.com/api/storesearch/?term={query}&l=english&cc=US"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            items = data.get('items', [])[:5]
-            for item in items:
-                app_id = item.get('id')
-                item['capsule_image'] = f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg"
-            return items
-    except:
-        pass
-    return []
+    CREATE TRIGGER IF NOT EXISTS trg_stats_games_delete AFTER DELETE ON games
+    BEGIN
+        UPDATE stats_summary SET
+            total_games = total_games - 1,
+            total_hours = total_hours - COALESCE(OLD.hours_played, 0),
+            rated_games = rated_games - (OLD.rating IS NOT NULL),
+            rating_sum = rating_sum - COALESCE(OLD.rating, 0),
+            five_star = five_star - (OLD.rating IS 5),
+            four_star = four_star - (OLD.rating IS 4),
+            three_star = three_star - (OLD.rating IS 3),
+            two_star = two_star - (OLD.rating IS 2),
+            one_star = one_star - (OLD.rating IS 1),
+            unrated = unrated - (OLD.rating IS NULL)
+        WHERE id = 1;
 
-def steam_api_call_with_rate_limit(url):
-    """Make Steam API call with rate limiting"""
-    global STEAM_API_LAST_CALL
-    
-    time_since_last_call = time.time() - STEAM_API_LAST_CALL
-    if time_since_last_call < STEAM_API_MIN_INTERVAL:
-        sleep_time = STEAM_API_MIN_INTERVAL - time_since_last_call
-        logger.info(f"Rate limiting: waiting {sleep_time:.2f}s before next Steam API call")
-        time.sleep(sleep_time)
-    
-    try:
-        response = requests.get(url, timeout=15)
-        STEAM_API_LAST_CALL = time.time()
-        return response
-    except Exception as e:
-        STEAM_API_LAST_CALL = time.time()
-        raise e
+        UPDATE stats_breakdown SET count = count - 1 WHERE kind = 'status' AND value = OLD.status;
+        UPDATE stats_breakdown SET count = count - 1 WHERE kind = 'platform' AND value = OLD.platform;
+    END;
 
-def get_steam_achievements(app_id, steam_id=None):
-    """Get achievements for a Steam game"""
-    if not STEAM_API_KEY:
-        return []
-    
+    CREATE TRIGGER IF NOT EXISTS trg_stats_games_update
+    AFTER UPDATE OF hours_played, rating, status, platform ON games
+    BEGIN
+        UPDATE stats_summary SET
+            total_hours = total_hours - COALESCE(OLD.hours_played, 0) + COALESCE(NEW.hours_played, 0),
+            rated_games = rated_games - (OLD.rating IS NOT NULL) + (NEW.rating IS NOT NULL),
+            rating_sum = rating_sum - COALESCE(OLD.rating, 0) + COALESCE(NEW.rating, 0),
+            five_star = five_star - (OLD.rating IS 5) + (NEW.rating IS 5),
+            four_star = four_star - (OLD.rating IS 4) + (NEW.rating IS 4),
+            three_star = three_star - (OLD.rating IS 3) + (NEW.rating IS 3),
+            two_star = two_star - (OLD.rating IS 2) + (NEW.rating IS 2),
+            one_star = one_star - (OLD.rating IS 1) + (NEW.rating IS 1),
+            unrated = unrated - (OLD.rating IS NULL) + (NEW.rating IS NULL)
+        WHERE id = 1;
+
+        UPDATE stats_breakdown SET count = count - 1 WHERE kind = 'status' AND value = OLD.status;
+        INSERT OR IGNORE INTO stats_breakdown (kind, value)
+        SELECT 'status', NEW.status WHERE NEW.status IS NOT NULL AND NEW.status != '';
+        UPDATE stats_breakdown SET count = count + 1 WHERE kind = 'status' AND value = NEW.status;
+
+        UPDATE stats_breakdown SET count = count - 1 WHERE kind = 'platform' AND value = OLD.platform;
+        INSERT OR IGNORE INTO stats_breakdown (kind, value)
+        SELECT 'platform', NEW.platform WHERE NEW.platform IS NOT NULL AND NEW.platform != '';
+        UPDATE stats_breakdown SET count = count + 1 WHERE kind = 'platform' AND value = NEW.platform;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_achievements_insert AFTER INSERT ON achievements
+    BEGIN
+        UPDATE stats_summary SET
+            achievements_total = achievements_total + 1,
+            achievements_unlocked = achievements_unlocked + (NEW.unlocked IS 1)
+        WHERE id = 1;
+
+        INSERT OR IGNORE INTO game_achievement_stats (game_id)
+        SELECT NEW.game_id WHERE NEW.game_id IS NOT NULL;
+        UPDATE game_achievement_stats SET
+            total = total + 1,
+            unlocked = unlocked + (NEW.unlocked IS 1)
+        WHERE game_id = NEW.game_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_achievements_delete AFTER DELETE ON achievements
+    BEGIN
+        UPDATE stats_summary SET
+            achievements_total = achievements_total - 1,
+            achievements_unlocked = achievements_unlocked - (OLD.unlocked IS 1)
+        WHERE id = 1;
+
+        UPDATE game_achievement_stats SET
+            total = total - 1,
+            unlocked = unlocked - (OLD.unlocked IS 1)
+        WHERE game_id = OLD.game_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_achievements_update
+    AFTER UPDATE OF game_id, unlocked ON achievements
+    BEGIN
+        UPDATE stats_summary SET
+            achievements_unlocked = achievements_unlocked - (OLD.unlocked IS 1) + (NEW.unlocked IS 1)
+        WHERE id = 1;
+
+        UPDATE game_achievement_stats SET
+            total = total - 1,
+            unlocked = unlocked - (OLD.unlocked IS 1)
+        WHERE game_id = OLD.game_id;
+
+        INSERT OR IGNORE INTO game_achievement_stats (game_id)
+        SELECT NEW.game_id WHERE NEW.game_id IS NOT NULL;
+        UPDATE game_achievement_stats SET
+            total = total + 1,
+            unlocked = unlocked + (NEW.unlocked IS 1)
+        WHERE game_id = NEW.game_id;
+    END;
+'''
+
+# Recomputes every summary table from the live data
+STATS_SUMMARY_REBUILD_SQL = '''
+    DELETE FROM stats_summary;
+    DELETE FROM stats_breakdown;
+    DELETE FROM game_achievement_stats;
+
+    INSERT INTO stats_summary (
+        id, total_games, total_hours, rated_games, rating_sum,
+        five_star, four_star, three_star, two_star, one_star, unrated,
+        achievements_total, achievements_unlocked
+    )
+    SELECT 1,
+           COUNT(*),
+           COALESCE(SUM(hours_played), 0),
+           COUNT(rating),
+           COALESCE(SUM(rating), 0),
+           COALESCE(SUM(rating IS 5), 0),
+           COALESCE(SUM(rating IS 4), 0),
+           COALESCE(SUM(rating IS 3), 0),
+           COALESCE(SUM(rating IS 2), 0),
+           COALESCE(SUM(rating IS 1), 0),
+           COALESCE(SUM(rating IS NULL), 0),
+           (SELECT COUNT(*) FROM achievements),
+           (SELECT COUNT(*) FROM achievements WHERE unlocked=1)
+    FROM games;
+
+    INSERT INTO stats_breakdown (kind, value, count)
+    SELECT 'status', status, COUNT(*) FROM games
+    WHERE status IS NOT NULL AND status != ''
+    GROUP BY status;
+
+    INSERT INTO stats_breakdown (kind, value, count)
+    SELECT 'platform', platform, COUNT(*) FROM games
+    WHERE platform IS NOT NULL AND platform != ''
+    GROUP BY platform;
+
+    INSERT INTO game_achievement_stats (game_id, unlocked, total)
+    SELECT game_id, COUNT(CASE WHEN unlocked=1 THEN 1 END), COUNT(*)
+    FROM achievements
+    WHERE game_id IS NOT NULL
+    GROUP BY game_id;
+'''
+
+def rebuild_stats_summary(conn):
+    """Recompute the stats summary tables from scratch in one transaction"""
     try:
-        schema_url = f"https://api.steampowered.com/ISteamUserStats/GetSchemaForGame/v2/?key={STEAM_API_KEY}&appid={app_id}"
-        schema_response = steam_api_call_with_rate_limit(schema_url)
-        
-        if schema_response.status_code != 200:
-            if schema_response.status_code == 429:
-                logger.info(f"Rate limited when fetching achievements for app {app_id}")
-            return []
-            
-        try:
-            schema_data = schema_response.json()
-        except ValueError:
-            logger.info(f"Invalid JSON in schema response for app {app_id}")
-            return []
-            
-        schema_achievements = schema_data.get('game', {}).get('availableGameStats', {}).get('achievements', [])
-        
-        if not schema_achievements:
-            return []
-        
-        user_achievements = {}
-        if STEAM_USER_ID:
-            try:
-                user_url = f"https://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v0001/?appid={app_id}&key={STEAM_API_KEY}&steamid={STEAM_USER_ID}"
-                user_response = steam_api_call_with_rate_limit(user_url)
-                
-                if user_response.status_code == 200:
-                    try:
-                        user_data = user_response.json()
-                        if user_data.get('playerstats', {}).get('success'):
-                            for ach in user_data.get('playerstats', {}).get('achievements', []):
-                                user_achievements[ach['apiname']] = {
-                                    'achieved': ach.get('achieved', 0),
-                                    'unlocktime': ach.get('unlocktime', 0)
-                                }
+        conn.executescript(f'''
+            BEGIN;
+            {STATS_SUMMARY_REBUILD_SQL}
+            COMMIT;
+        ''')
+    except Exception:
+        conn.rollback()
+        raise
+    logger.info("Stats summary rebuilt")
+
+def read_stats_summary(cur):
+    """
+    Read the aggregate part of /api/stats from the summary tables.
+    Returns the same keys as compute_live_stats().
+    """
+    cur.execute('SELECT * FROM stats_summary WHERE id = 1')
+    summary = cur.fetchone()
+
+    cur.execute('SELECT kind, value, count FROM stats_breakdown WHERE count > 0')
+    breakdowns = {'status': {}, 'platform': {}}
+    for row in cur.fetchall():
+        breakdowns[row['kind']][row['value']] = row['count']
+
+    cur.execute('''
+        SELECT g.id, g.title,
+               s.unlocked as unlocked_achievements,
+               s.total as total_achievements,
+               ROUND((s.unlocked * 100.0 / s.total), 1) as completion_percentage
+        FROM game_achievement_stats s
+        JOIN games g ON g.id = s.game_id
+        WHERE s.total > 0
+        ORDER BY completion_percentage DESC, total_achievements DESC, g.id ASC
+    ''')
+    achievement_progress = [dict(r) for r in cur.fetchall()]
+
+    total = summary['total_games']
+    rating_keys = ['five_star', 'four_star', 'three_star', 'two_star', 'one_star', 'unrated']
+    # SUM() over an empty games table is NULL, so mirror that for an empty library
+    rating_distribution = {key: (summary[key] if total > 0 else None) for key in rating_keys}
+
+    return {
+        'total_games': total,
+        'completed_games': breakdowns['status'].get('Completed', 0),
+        'total_hours': summary['total_hours'],
+        'achievements_unlocked': summary['achievements_unlocked'],
+        'achievements_total': summary['achievements_total'],
+        'achievement_progress': achievement_progress,
+        'status_breakdown': breakdowns['status'],
+        'platform_breakdown': breakdowns['platform'],
+        'avg_rating': summary['rating_sum'] / summary['rated_games'] if summary['rated_games'] else None,
+        'rating_distribution': rating_distribution
+    }
+
+def compute_live_stats(cur):
+    """Compute the aggregate part of /api/stats directly from games and achievements"""
+    cur.execute('SELECT COUNT(*) as total FROM games')
+    total = cur.fetchone()['total']
+
+    cur.execute("SELECT COUNT(*) as completed FROM games WHERE status='Completed'")
+    completed = cur.fetchone()['completed']
+
+    cur.execute('SELECT SUM(hours_played) as total_hours FROM games')
+    total_hours = cur.fetchone()['total_hours'] or 0
+
+    cur.execute('SELECT COUNT(*) as total_achievements FROM achievements WHERE unlocked=1')
+    achievements_unlocked = cur.fetchone()['total_achievements']
+
+    cur.execute('SELECT COUNT(*) as total_achievements FROM achievements')
+    achievements_total = cur.fetchone()['total_achievements']
+
+    cur.execute('''
+        SELECT g.id, g.title,
+               COUNT(CASE WHEN a.unlocked=1 THEN 1 END) as unlocked_achievements,
+               COUNT(a.id) as total_achievements,
+               CASE
+                 WHEN COUNT(a.id) > 0 THEN
+                   ROUND((COUNT(CASE WHEN a.unlocked=1 THEN 1 END) * 100.0 / COUNT(a.id)), 1)
+                 ELSE 0
+               END as completion_percentage
+        FROM games g
+        LEFT JOIN achievements a ON g.id = a.game_id
+        GROUP BY g.id
+        HAVING total_achievements > 0
+        ORDER BY completion_percentage DESC, total_achievements DESC, g.id ASC
+    ''')
+    achievement_progress = [dict(r) for r in cur.fetchall()]
+
+    cur.execute('''
+        SELECT status, COUNT(*) as count FROM games
+        WHERE status IS NOT NULL AND status != ''
+        GROUP BY status
+    ''')
+    status_breakdown = {row['status']: row['count'] for row in cur.fetchall()}
+
+    cur.execute('''
+        SELECT platform, COUNT(*) as count FROM games
+        WHERE platform IS NOT NULL AND platform != ''
+        GROUP BY platform
+    ''')
+    platform_breakdown = {row['platform']: row['count'] for row in cur.fetchall()}
+
+    cur.execute('SELECT AVG(rating) as avg_rating FROM games WHERE rating IS NOT NULL')
+    avg_rating = cur.fetchone()['avg_rating']
+
+    cur.execute('''
+        SELECT
+            SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END) as five_star,
+            SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END) as four_star,
+            SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END) as three_star,
+            SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END) as two_star,
+            SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END) as one_star,
+            SUM(CASE WHEN rating IS NULL THEN 1 ELSE 0 END) as unrated
+        FROM games
+    ''')
+    rating_distribution = dict(cur.fetchone())
+
+    return {
+        'total_games': total,
+        'completed_games': completed,
+        'total_hours': total_hours,
+        'achievements_unlocked': achievements_unlocked,
+        'achievements_total': achievements_total,
+        'achievement_progress': achievement_progress,
+        'status_breakdown': status_breakdown,
+        'platform_breakdown': platform_breakdown,
+        'avg_rating': avg_rating,
+        'rating_distribution': rating_distribution
+    }
+
+def check_stats_summary(conn):
+    """
+    Compare the stats summary tables against the live aggregates.
+    Returns a list of human readable mismatches (empty when consistent).
+    """
+    cur = conn.cursor()
+    stored = read_stats_summary(cur)
+    live = compute_live_stats(cur)
+
+    mismatches = []
+    for key, live_value in live.items():
+        stored_value = stored[key]
+        if isinstance(live_value, float) or isinstance(stored_value, float):
+            # Incremental float sums drift slightly from a fresh SUM()
+            if live_value is None or stored_value is None:
+                consistent = live_value is stored_value
+            else:
+                consistent = abs(live_value - stored_value) < 0.01
+        else:
+            consistent = live_value == stored_value
+
+        if not consistent:
+            mismatches.append(f"{key}: summary={stored_value!r} live={live_value!r}")
+
+    return mismatches
+
+# ==============================================================================
+# PLAYTIME ROLLUPS
+# ==============================================================================
+
+# SQL expression for the first day of the period containing a date.
+# Weeks run Monday to Sunday.
+ROLLUP_PERIOD_SQL = {
+    'week': "date({}, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m-01', {})",
+    'year': "strftime('%Y-01-01', {})",
+}
+
+def apply_play_deltas_to_rollups(cur, date_str, sign=1):
+    """Add (or with sign=-1, remove) one day of daily_play_deltas to every rollup bucket"""
+    for bucket, period_sql in ROLLUP_PERIOD_SQL.items():
+        period = period_sql.format('date')
+        cur.execute(f'''
+            INSERT INTO playtime_rollups (bucket, period, hours)
+            SELECT ?, {period}, ? * SUM(hours_added)
+            FROM daily_play_deltas WHERE date = ?
+            GROUP BY date
+            ON CONFLICT(bucket, period) DO UPDATE SET hours = hours + excluded.hours
+        ''', (bucket, sign, date_str))
+        cur.execute(f'''
+            INSERT INTO playtime_game_rollups (bucket, period, game_id, game_title, hours)
+            SELECT ?, {period}, game_id, game_title, ? * hours_added
+            FROM daily_play_deltas WHERE date = ?
+            ON CONFLICT(bucket, period, game_id) DO UPDATE SET
+                hours = hours + excluded.hours,
+                game_title = excluded.game_title
+        ''', (bucket, sign, date_str))
+
+def rebuild_playtime_rollups(conn):
+    """Recompute every rollup from daily_play_deltas"""
+    conn.execute('DELETE FROM playtime_rollups')
+    conn.execute('DELETE FROM playtime_game_rollups')
+    for bucket, period_sql in ROLLUP_PERIOD_SQL.items():
+        period = period_sql.format('date')
+        conn.execute(f'''
+            INSERT INTO playtime_rollups (bucket, period, hours)
+            SELECT ?, {period} as period, SUM(hours_added)
+            FROM daily_play_deltas
+            GROUP BY period
+        ''', (bucket,))
+        # Title as of the latest day in the period, like the incremental path
+        conn.execute(f'''
+            INSERT INTO playtime_game_rollups (bucket, period, game_id, game_title, hours)
+            SELECT ?, period, game_id, game_title, hours FROM (
+                SELECT {period} as period, game_id,
+                       SUM(hours_added) OVER w as hours,
+                       game_title,
+                       ROW_NUMBER() OVER (PARTITION BY {period}, game_id ORDER BY date DESC) as rn
+                FROM daily_play_deltas
+                WINDOW w AS (PARTITION BY {period}, game_id)
+            ) WHERE rn = 1
+        ''', (bucket,))
+
+def query_playtime(cur, bucket, from_date, to_date, top=10):
+    """
+    Playtime per period between two ISO dates, plus the most played games in
+    that range. Week/month/year read the rollup tables, with from_date
+    snapped back to the start of its period; 'day' reads daily_play_deltas.
+    """
+    if bucket == 'day':
+        cur.execute('''
+            SELECT date as period, SUM(hours_added) as hours
+            FROM daily_play_deltas
+            WHERE date >= ? AND date <= ?
+            GROUP BY date ORDER BY date
+        ''', (from_date, to_date))
+        series = cur.fetchall()
+        cur.execute('''
+            SELECT game_id, MAX(game_title) as game_title, SUM(hours_added) as hours
+            FROM daily_play_deltas
+            WHERE date >= ? AND date <= ?
+            GROUP BY game_id ORDER BY hours DESC, game_id ASC LIMIT ?
+        ''', (from_date, to_date, top))
+        top_games = cur.fetchall()
+    else:
+        from_date = cur.execute(f"SELECT {ROLLUP_PERIOD_SQL[bucket].format('?')}", (from_date,)).fetchone()[0]
+        cur.execute('''
+            SELECT period, hours FROM playtime_rollups
+            WHERE bucket = ? AND period >= ? AND period <= ? AND hours > 0.001
+            ORDER BY period
+        ''', (bucket, from_date, to_date))
+        series = cur.fetchall()
+        cur.execute('''
+            SELECT game_id, MAX(game_title) as game_title, SUM(hours) as hours
+            FROM playtime_game_rollups
+            WHERE bucket = ? AND period >= ? AND period <= ?
+            GROUP BY game_id HAVING SUM(hours) > 0.001
+            ORDER BY hours DESC, game_id ASC LIMIT ?
+        ''', (bucket, from_date, to_date, top))
+        top_games = cur.fetchall()
+    
+    series = [{'period': row['period'], 'hours': round(row['hours'], 1)} for row in series]
+    return {
+        'bucket': bucket,
+        'from': from_date,
+        'to': to_date,
+        'total_hours': round(sum(item['hours'] for item in series), 1),
+        'series': series,
+        'top_games': [
+            {'game_id': row['game_id'], 'game_title': row['game_title'], 'hours': round(row['hours'], 1)}
+            for row in top_games
+        ],
+    }
+
+# ==============================================================================
+# SCHEMA MIGRATIONS
+# ==============================================================================
+
+# Ordered list of (version, description, sql). sql may also be a function that
+# takes the connection, for data migrations. The applied version is stored in
+# PRAGMA user_version, so each migration runs exactly once per database.
+# Never edit a migration that has shipped - append a new one instead.
+MIGRATIONS = [
+    (1, 'Index foreign keys and filter columns used by the hot queries', '''
+        CREATE INDEX IF NOT EXISTS idx_achievements_game_unlocked
+        ON achievements(game_id, unlocked);
+
+        CREATE INDEX IF NOT EXISTS idx_tags_game
+        ON tags(game_id);
+
+        CREATE INDEX IF NOT EXISTS idx_games_steam_app_id
+        ON games(steam_app_id);
+
+        CREATE INDEX IF NOT EXISTS idx_games_status
+        ON games(status);
+
+        CREATE INDEX IF NOT EXISTS idx_completionist_game_completed
+        ON completionist_achievements(game_id, completed);
+    '''),
+    (2, 'Materialized stats summary maintained by triggers',
+     STATS_SUMMARY_SCHEMA_SQL + STATS_SUMMARY_REBUILD_SQL),
+    (3, 'Persisted background jobs', '''
+        CREATE TABLE IF NOT EXISTS background_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            params TEXT,
+            processed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            errors INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            result TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            heartbeat_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_background_jobs_kind_status
+        ON background_jobs(kind, status);
+    '''),
+    (4, 'Steam achievement schema cache', '''
+        CREATE TABLE IF NOT EXISTS steam_schema_cache (
+            app_id INTEGER PRIMARY KEY,
+            achievements TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+    '''),
+    (5, 'Local cover mirror', '''
+        CREATE TABLE IF NOT EXISTS cover_mirror (
+            url TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cover_mirror_filename ON cover_mirror(filename);
+    '''),
+    (6, 'Keyframe flag for delta-encoded daily game snapshots', '''
+        -- The tracker normally creates these after migrations run
+        CREATE TABLE IF NOT EXISTS daily_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL UNIQUE,
+            total_hours REAL NOT NULL,
+            games_played INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS daily_game_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            game_title TEXT NOT NULL,
+            hours_played REAL NOT NULL,
+            cover_url TEXT,
+            UNIQUE(date, game_id),
+            FOREIGN KEY(game_id) REFERENCES games(id) ON DELETE CASCADE
+        );
+        -- Existing snapshots are full copies
+        ALTER TABLE daily_snapshots ADD COLUMN is_keyframe INTEGER NOT NULL DEFAULT 1;
+    '''),
+    (7, 'Compact existing daily game snapshots into keyframes and deltas',
+        lambda conn: compact_daily_game_snapshots(conn)),
+    (8, 'Per-day play deltas', '''
+        CREATE TABLE IF NOT EXISTS daily_play_deltas (
+            date TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            prev_date TEXT NOT NULL,
+            game_title TEXT NOT NULL,
+            cover_url TEXT,
+            hours_added REAL NOT NULL,
+            total_hours REAL NOT NULL,
+            PRIMARY KEY (date, game_id)
+        );
+    '''),
+    (9, 'Backfill per-day play deltas from snapshot history',
+        lambda conn: backfill_daily_play_deltas(conn)),
+    (10, 'Weekly, monthly and yearly playtime rollups', '''
+        CREATE TABLE IF NOT EXISTS playtime_rollups (
+            bucket TEXT NOT NULL,
+            period TEXT NOT NULL,
+            hours REAL NOT NULL,
+            PRIMARY KEY (bucket, period)
+        );
+        CREATE TABLE IF NOT EXISTS playtime_game_rollups (
+            bucket TEXT NOT NULL,
+            period TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            game_title TEXT NOT NULL,
+            hours REAL NOT NULL,
+            PRIMARY KEY (bucket, period, game_id)
+        );
+    '''),
+    (11, 'Backfill playtime rollups', lambda conn: rebuild_playtime_rollups(conn)),
+    (12, 'Stable Steam achievement keys', '''
+        ALTER TABLE achievements ADD COLUMN apiname TEXT;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_achievements_game_apiname
+        ON achievements(game_id, apiname) WHERE apiname IS NOT NULL;
+    '''),
+    (13, 'Index for the paginated games list order', '''
+        CREATE INDEX IF NOT EXISTS idx_games_list_order
+        ON games(COALESCE(is_favorite, 0) DESC, COALESCE(created_at, '') DESC, id);
+    '''),
+    (14, 'Checkpoints for resumable NDJSON imports', '''
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            export_id TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            last_rowid INTEGER NOT NULL,
+            rows INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    '''),
+    (15, 'Leader lease for the daily scheduler', '''
+        CREATE TABLE IF NOT EXISTS scheduler_lease (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            last_run_date TEXT
+        );
+
+        -- Count the newest recorded snapshot as the last run, so the first
+        -- leader doesn't treat an upgrade as a missed day and run at once
+        INSERT OR IGNORE INTO scheduler_lease (name, holder, expires_at, last_run_date)
+        SELECT 'daily-snapshot', '', 0, MAX(date) FROM daily_snapshots;
+    '''),
+    (16, 'Steam rate limit budget shared by all worker processes', '''
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    '''),
+]
+
+def compact_daily_game_snapshots(conn):
+    """
+    Convert full daily copies in daily_game_snapshots into keyframes plus
+    deltas, matching what record_daily_snapshot() now writes. Runs once, as
+    migration 7; reconstructed snapshots are unchanged.
+    """
+    dates = [row['date'] for row in conn.execute('SELECT date FROM daily_snapshots ORDER BY date')]
+    prev_games = {}
+    last_keyframe = None
+    removed = 0
+    
+    for date_str in dates:
+        games = {
+            row['game_id']: (row['game_title'], row['hours_played'], row['cover_url'])
+            for row in conn.execute('''
+                SELECT game_id, game_title, hours_played, cover_url
+                FROM daily_game_snapshots WHERE date = ? AND hours_played > 0
+            ''', (date_str,))
+        }
+        
+        is_keyframe = DailyHoursTracker.is_keyframe_due(date_str, last_keyframe)
+        conn.execute('UPDATE daily_snapshots SET is_keyframe = ? WHERE date = ?', (int(is_keyframe), date_str))
+        
+        if is_keyframe:
+            last_keyframe = date_str
+        else:
+            unchanged = [(date_str, game_id) for game_id, state in games.items()
+                         if prev_games.get(game_id) == state]
+            conn.executemany('DELETE FROM daily_game_snapshots WHERE date = ? AND game_id = ?', unchanged)
+            conn.executemany('''
+                INSERT INTO daily_game_snapshots (date, game_id, game_title, hours_played, cover_url)
+                VALUES (?, ?, ?, 0, ?)
+            ''', [(date_str, game_id, title, cover_url)
+                  for game_id, (title, _, cover_url) in prev_games.items() if game_id not in games])
+            removed += len(unchanged)
+        
+        prev_games = games
+    
+    logger.info(f"Compacted daily game snapshots: removed {removed} unchanged rows across {len(dates)} days")
+
+def insert_play_deltas(cur, date_str, prev_date, prev_hours, games):
+    """
+    Store the hours each game gained between prev_date and date_str.
+    prev_hours maps game_id -> hours at prev_date; games yields
+    (game_id, title, hours_played, cover_url) as of date_str.
+    """
+    rows = []
+    for game_id, title, hours_played, cover_url in games:
+        hours_added = hours_played - prev_hours.get(game_id, 0)
+        # Only games where hours increased
+        if hours_added > 0.01:
+            rows.append((date_str, game_id, prev_date, title, cover_url,
+                         round(hours_added, 1), round(hours_played, 1)))
+    cur.executemany('''
+        INSERT INTO daily_play_deltas (date, game_id, prev_date, game_title, cover_url, hours_added, total_hours)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    return len(rows)
+
+def backfill_daily_play_deltas(conn):
+    """Compute daily_play_deltas for every recorded snapshot. Runs once, as migration 9."""
+    snapshots = conn.execute('SELECT date, is_keyframe FROM daily_snapshots ORDER BY date').fetchall()
+    state = {}
+    prev_date = None
+    total = 0
+    
+    for snapshot in snapshots:
+        date_str = snapshot['date']
+        # Replay the delta-encoded rows to get this day's full state
+        new_state = {} if snapshot['is_keyframe'] else dict(state)
+        for row in conn.execute('''
+            SELECT game_id, game_title, hours_played, cover_url
+            FROM daily_game_snapshots WHERE date = ?
+        ''', (date_str,)):
+            if row['hours_played'] > 0:
+                new_state[row['game_id']] = (row['game_title'], row['hours_played'], row['cover_url'])
+            else:
+                new_state.pop(row['game_id'], None)
+        
+        if prev_date:
+            total += insert_play_deltas(
+                conn, date_str, prev_date,
+                {game_id: hours for game_id, (_, hours, _) in state.items()},
+                ((game_id, title, hours, cover_url) for game_id, (title, hours, cover_url) in new_state.items())
+            )
+        state = new_state
+        prev_date = date_str
+    
+    logger.info(f"Backfilled {total} play deltas across {len(snapshots)} snapshots")
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def _split_sql_script(script):
+    """Split a migration script into statements; trigger bodies stay whole"""
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ''
+    if statement.strip():
+        yield statement
+
+def run_migrations(conn):
+    """
+    Upgrade the database in place to the latest schema version.
+    Each migration runs in its own transaction together with the version bump.
+    The transaction takes the write lock first and re-reads the version, so
+    workers starting at the same time apply each migration exactly once.
+    Returns the list of versions that were applied.
+    """
+    applied = []
+
+    for version, description, sql in MIGRATIONS:
+        if version <= get_schema_version(conn):
+            continue
+
+        try:
+            # Schema changes and the version bump commit together or not at all
+            conn.execute('BEGIN IMMEDIATE')
+            if version <= get_schema_version(conn):
+                # Another process applied it while this one waited for the lock
+                conn.rollback()
+                continue
+            logger.info(f"Applying schema migration {version}: {description}")
+            if callable(sql):
+                # Data migrations are Python functions run inside the same transaction
+                sql(conn)
+            else:
+                for statement in _split_sql_script(sql):
+                    conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"Schema migration {version} failed")
+            raise
+
+        applied.append(version)
+
+    if applied:
+        logger.info(f"✓ Database schema upgraded to version {applied[-1]}")
+    return applied
+
+def get_tags_by_game(cur, game_ids=None):
+    """
+    Fetch tags for many games in a single query.
+    Returns a dict of game_id -> list of tags, in insertion order.
+    """
+    if game_ids is None:
+        cur.execute('SELECT game_id, tag FROM tags ORDER BY game_id, id')
+    else:
+        game_ids = list(game_ids)
+        if not game_ids:
+            return {}
+        placeholders = ','.join(['?'] * len(game_ids))
+        cur.execute(f'SELECT game_id, tag FROM tags WHERE game_id IN ({placeholders}) ORDER BY game_id, id',
+                    game_ids)
+
+    tags_by_game = {}
+    for row in cur.fetchall():
+        tags_by_game.setdefault(row['game_id'], []).append(row['tag'])
+    return tags_by_game
+
+# ==============================================================================
+# BULK WRITES
+# ==============================================================================
+
+# Write paths that touch many rows go through executemany in chunks instead of
+# one execute per row. Callers own the transaction and decide when to commit.
+
+def chunked(items, size=BULK_WRITE_CHUNK_SIZE):
+    """Yield lists of at most `size` items"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+def bulk_insert(cur, table, columns, rows, or_clause=''):
+    """
+    INSERT many rows with one executemany per chunk.
+    table and columns are trusted identifiers, never user input.
+    Returns the number of rows written.
+    """
+    sql = (f"INSERT {or_clause} INTO {table} ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['?'] * len(columns))})")
+    written = 0
+    for chunk in chunked(rows):
+        cur.executemany(sql, chunk)
+        written += len(chunk)
+    return written
+
+def lookup_game_ids(cur, app_ids):
+    """Map Steam app IDs to game IDs (the oldest game if there are duplicates)"""
+    game_ids = {}
+    for chunk in chunked(app_ids):
+        placeholders = ','.join(['?'] * len(chunk))
+        cur.execute(f'''
+            SELECT steam_app_id, MIN(id) as id FROM games
+            WHERE steam_app_id IN ({placeholders})
+            GROUP BY steam_app_id
+        ''', chunk)
+        game_ids.update((row['steam_app_id'], row['id']) for row in cur.fetchall())
+    return game_ids
+
+def replace_game_tags(cur, game_id, tags):
+    """Replace a game's tags, keeping their order"""
+    cur.execute('DELETE FROM tags WHERE game_id = ?', (game_id,))
+    bulk_insert(cur, 'tags', ('game_id', 'tag'), ((game_id, tag) for tag in tags))
+
+# ==============================================================================
+# DATA VERSION
+# ==============================================================================
+
+class DataVersion:
+    """
+    Version token that changes after every write to the library.
+
+    The token lives in a small file next to the database so every worker
+    process and the scheduler thread see the same value. Each bump writes a
+    brand new unique token (no read-modify-write), so concurrent bumps can
+    never collapse into one. Reading it never touches SQLite.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def bump(self):
+        """Call after a write has been committed"""
+        with self._lock:
+            self._counter += 1
+            modified = time.time()
+            token = f"{time.time_ns():x}-{os.getpid():x}-{self._counter:x}"
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            # The data directory may not exist yet, e.g. before the first database is created
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(f"{token} {modified}")
+            os.replace(tmp_path, self.path)
+        return token, modified
+
+    def current(self):
+        """Return (token, modified_timestamp)"""
+        try:
+            token, modified = self.path.read_text().split()
+            return token, float(modified)
+        except (OSError, ValueError):
+            return self.bump()
+
+
+DATA_VERSION_PATH = DB_PATH.parent / "data_version"
+data_version = DataVersion(DATA_VERSION_PATH)
+
+# ==============================================================================
+# RESPONSE CACHE
+# ==============================================================================
+
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+class ResponseCache:
+    """
+    LRU cache of serialized JSON bodies, keyed by route scope and URL.
+
+    Each scope ('games', 'stats', 'top10', 'completionist') has its own
+    DataVersion token. Entries remember the token they were built under and
+    are only served while it is unchanged, so invalidating a scope in one
+    worker process invalidates it in all of them. An entry also keeps the
+    Brotli/gzip encodings of its body once compress_response has made them.
+    """
+
+    def __init__(self, version_dir, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.version_dir = Path(version_dir)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (scope, key) -> (token, body, {encoding: encoded body})
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _version(self, scope):
+        with self._lock:
+            if scope not in self._versions:
+                self._versions[scope] = DataVersion(self.version_dir / f"cache_version.{scope}")
+            return self._versions[scope]
+
+    def token(self, scope):
+        return self._version(scope).current()[0]
+
+    def get(self, scope, key, token):
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None or entry[0] != token:
+                # A stale entry can never be served again, so free it now
+                if entry is not None:
+                    del self._entries[(scope, key)]
+                    self.current_bytes -= self._entry_bytes(entry)
+                self.misses += 1
+                return None
+            self._entries.move_to_end((scope, key))
+            self.hits += 1
+            return entry[1]
+
+    @staticmethod
+    def _entry_bytes(entry):
+        return len(entry[1]) + sum(len(encoded) for encoded in entry[2].values())
+
+    def _evict_to_fit(self):
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= self._entry_bytes(evicted)
+            self.evictions += 1
+
+    def put(self, scope, key, token, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop((scope, key), None)
+            if old is not None:
+                self.current_bytes -= self._entry_bytes(old)
+            self._entries[(scope, key)] = (token, body, {})
+            self.current_bytes += len(body)
+            self._evict_to_fit()
+
+    def get_encoded(self, scope, key, token, encoding):
+        """The cached `encoding` of an entry's body, or None"""
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None or entry[0] != token:
+                return None
+            return entry[2].get(encoding)
+
+    def put_encoded(self, scope, key, token, encoding, encoded):
+        """Attach an encoded body to the entry it was made from, if that entry is still current"""
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None or entry[0] != token or encoding in entry[2]:
+                return
+            entry[2][encoding] = encoded
+            self.current_bytes += len(encoded)
+            self._evict_to_fit()
+
+    def invalidate(self, *scopes):
+        """Call after the write affecting these scopes has been committed"""
+        for scope in scopes:
+            self._version(scope).bump()
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] in scopes]:
+                self.current_bytes -= self._entry_bytes(self._entries.pop(cache_key))
+            self.invalidations += len(scopes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries_by_scope = {}
+            for scope, _ in self._entries:
+                entries_by_scope[scope] = entries_by_scope.get(scope, 0) + 1
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'entries_by_scope': entries_by_scope,
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+response_cache = ResponseCache(DB_PATH.parent)
+
+# ==============================================================================
+# BACKGROUND JOBS
+# ==============================================================================
+
+# A queued/running job whose heartbeat is older than this belongs to a dead process
+JOB_STALE_SECONDS = 300
+JOB_PROGRESS_INTERVAL = 1.0
+
+# One job at a time; Steam rate limits make parallel imports pointless
+job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='background-job')
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested"""
+
+
+class BackgroundJob:
+    """
+    Handle passed to a job function for reporting progress.
+    Progress is written to background_jobs at most once per JOB_PROGRESS_INTERVAL,
+    which also serves as the heartbeat and the cancellation check.
+    """
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.processed = 0
+        self.total = 0
+        self.errors = 0
+        self.message = None
+        self.result = None
+        self._last_flush = 0
+
+    def update(self, processed=None, total=None, errors=None, message=None, force=False):
+        """
+        Record progress and raise JobCancelled if cancellation was requested.
+        Uses its own connection, so call it between the job's own transactions.
+        """
+        if processed is not None:
+            self.processed = processed
+        if total is not None:
+            self.total = total
+        if errors is not None:
+            self.errors = errors
+        if message is not None:
+            self.message = message
+
+        if not force and time.time() - self._last_flush < JOB_PROGRESS_INTERVAL:
+            return
+        self._last_flush = time.time()
+
+        conn = get_db()
+        try:
+            cur = conn.cursor()
+            cur.execute('''
+                UPDATE background_jobs
+                SET processed = ?, total = ?, errors = ?, message = ?, heartbeat_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (self.processed, self.total, self.errors, self.message, self.id))
+            conn.commit()
+            cur.execute('SELECT cancel_requested FROM background_jobs WHERE id = ?', (self.id,))
+            cancel_requested = cur.fetchone()['cancel_requested']
+        finally:
+            conn.close()
+
+        if cancel_requested:
+            raise JobCancelled()
+
+
+def _finish_job(job, status, message=None):
+    conn = get_db()
+    try:
+        conn.execute('''
+            UPDATE background_jobs
+            SET status = ?, processed = ?, total = ?, errors = ?, message = ?, result = ?,
+                finished_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (status, job.processed, job.total, job.errors, message or job.message,
+              json.dumps(job.result) if job.result is not None else None, job.id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def _run_job(job_id, target, params):
+    job = BackgroundJob(job_id)
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            UPDATE background_jobs
+            SET status = 'running', started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'queued' AND cancel_requested = 0
+        ''', (job_id,))
+        conn.commit()
+        started = cur.rowcount == 1
+    finally:
+        conn.close()
+
+    if not started:
+        _finish_job(job, 'cancelled', 'Cancelled before it started')
+        return
+
+    logger.info(f"Background job {job_id} started")
+    try:
+        job.result = target(job, params)
+        _finish_job(job, 'completed')
+        logger.info(f"✓ Background job {job_id} completed")
+    except JobCancelled:
+        _finish_job(job, 'cancelled', 'Cancelled by user')
+        logger.info(f"Background job {job_id} cancelled")
+    except Exception as e:
+        logger.error(f"Background job {job_id} failed: {e}")
+        logger.error(traceback.format_exc())
+        _finish_job(job, 'failed', str(e))
+
+def start_background_job(kind, params, target):
+    """
+    Persist a job and run target(job, params) on the job thread.
+    target returns a JSON-serializable result; it may also keep job.result
+    updated so a cancelled job still reports partial counts.
+    """
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute('INSERT INTO background_jobs (kind, params) VALUES (?, ?)', (kind, json.dumps(params)))
+        conn.commit()
+        job_id = cur.lastrowid
+    finally:
+        conn.close()
+
+    job_executor.submit(_run_job, job_id, target, params)
+    return job_id
+
+def _job_row_to_dict(row):
+    job = dict(row)
+    job['params'] = json.loads(job['params']) if job['params'] else {}
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    job['cancel_requested'] = bool(job['cancel_requested'])
+    return job
+
+def get_job(job_id):
+    conn = get_db()
+    try:
+        row = conn.execute('SELECT * FROM background_jobs WHERE id = ?', (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return _job_row_to_dict(row) if row else None
+
+def get_recent_jobs(limit=20):
+    conn = get_db()
+    try:
+        rows = conn.execute('SELECT * FROM background_jobs ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+    finally:
+        conn.close()
+    return [_job_row_to_dict(row) for row in rows]
+
+def find_active_job(kind):
+    """Return the queued/running job of this kind with a live heartbeat, if any"""
+    conn = get_db()
+    try:
+        row = conn.execute('''
+            SELECT * FROM background_jobs
+            WHERE kind = ? AND status IN ('queued', 'running')
+              AND heartbeat_at >= datetime('now', ?)
+            ORDER BY id DESC LIMIT 1
+        ''', (kind, f'-{JOB_STALE_SECONDS} seconds')).fetchone()
+    finally:
+        conn.close()
+    return _job_row_to_dict(row) if row else None
+
+def request_job_cancel(job_id):
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            UPDATE background_jobs SET cancel_requested = 1
+            WHERE id = ? AND status IN ('queued', 'running')
+        ''', (job_id,))
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+def fail_stale_jobs():
+    """Mark jobs left behind by a dead or restarted process as failed"""
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            UPDATE background_jobs
+            SET status = 'failed', message = 'Interrupted by a server restart', finished_at = CURRENT_TIMESTAMP
+            WHERE status IN ('queued', 'running') AND heartbeat_at < datetime('now', ?)
+        ''', (f'-{JOB_STALE_SECONDS} seconds',))
+        conn.commit()
+        if cur.rowcount:
+            logger.info(f"Marked {cur.rowcount} interrupted background jobs as failed")
+    finally:
+        conn.close()
+
+# Flask app
+app = Flask(__name__, static_folder='static', template_folder='templates')
+app.config['SECRET_KEY'] = SECRET_KEY
+app.config['PERMANENT_SESSION_LIFETIME'] = 86400 * 30
+
+app.teardown_appcontext(release_db_connections)
+
+# Daily hours tracker; its tables are created along with the rest of the schema
+tracker = DailyHoursTracker(DB_PATH)
+
+_app_initialized = False
+_app_init_lock = threading.Lock()
+
+def initialize_app():
+    """
+    Everything the server needs before its first request: logging, the
+    database schema, static bundles and the daily scheduler. Runs once per
+    process; importing this module does none of it, so CLI tools, tests and
+    thumbnail pool workers stay cheap to start.
+    """
+    global _app_initialized, static_bundles
+    with _app_init_lock:
+        if _app_initialized:
+            return
+        configure_logging()
+        COVERS_PATH.mkdir(exist_ok=True)
+        init_db()
+        data_version.bump()
+        fail_stale_jobs()
+        static_bundles = build_static_bundles()
+        setup_daily_scheduler(tracker)
+        _app_initialized = True
+    logger.info("Application initialized successfully")
+
+def create_app():
+    """Application factory for WSGI servers: `gunicorn 'app:create_app()'`"""
+    initialize_app()
+    return app
+
+@app.before_request
+def initialize_on_first_request():
+    # Servers given the bare `app:app` object initialize on their first request
+    if not _app_initialized:
+        initialize_app()
+
+# Authentication decorator
+from functools import wraps
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('logged_in'):
+            return jsonify({'error': 'Authentication required'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Conditional GET decorator
+def conditional_response(f):
+    """
+    Answer GET requests with 304 Not Modified while the data version is unchanged.
+    The ETag is derived from the data version and the URL, so a matching
+    If-None-Match is answered without running the route or touching the database.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method != 'GET':
+            return f(*args, **kwargs)
+        
+        token, modified = data_version.current()
+        etag = hashlib.sha1(f"{token}:{request.full_path}".encode()).hexdigest()[:24]
+        # Last-Modified has 1 s resolution, so a second write within the same
+        # second wouldn't change it. Until that second is over, only the ETag
+        # is sent and trusted.
+        last_modified = None
+        if time.time() >= int(modified) + 1:
+            last_modified = datetime.fromtimestamp(int(modified), tz=pytz.UTC)
+        
+        # If-None-Match wins over If-Modified-Since when both are sent; the
+        # comparison is weak because compress_response weakens the ETag
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since and last_modified:
+            not_modified = last_modified <= request.if_modified_since
+        else:
+            not_modified = False
+        
+        if not_modified:
+            response = app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        # Let the browser keep the body but revalidate on every use
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return decorated_function
+
+# Server-side cache decorator
+def cached_response(scope):
+    """
+    Serve GET responses from the in-process response cache.
+    Write paths must call response_cache.invalidate() for the scopes they change.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+            
+            key = request.full_path
+            # Read the token before building the body so a concurrent write
+            # can never be cached under the newer token
+            token = response_cache.token(scope)
+            body = response_cache.get(scope, key, token)
+            if body is not None:
+                g.response_cache_entry = (scope, key, token)
+                return app.response_class(body, mimetype='application/json')
+            
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and response.mimetype == 'application/json':
+                response_cache.put(scope, key, token, response.get_data())
+                # compress_response stores its encodings in the same entry
+                g.response_cache_entry = (scope, key, token)
+            return response
+        return decorated_function
+    return decorator
+
+# Routes that change data but not the library
+DATA_VERSION_EXEMPT_ENDPOINTS = {'login', 'logout'}
+
+@app.after_request
+def bump_data_version_after_write(response):
+    """Invalidate conditional GETs after any successful write request"""
+    if (request.method in ('POST', 'PUT', 'PATCH', 'DELETE')
+            and response.status_code < 400
+            and request.endpoint not in DATA_VERSION_EXEMPT_ENDPOINTS):
+        data_version.bump()
+    return response
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    sql_activity.endpoint = request.endpoint or 'unmatched'
+    sql_activity.statements = 0
+    sql_activity.seconds = 0.0
+
+@app.after_request
+def record_request_metrics(response):
+    """Latency and SQL totals per route; streamed bodies are timed up to the first byte"""
+    started = g.pop('request_started', None)
+    endpoint = getattr(sql_activity, 'endpoint', None)
+    if started is None or endpoint is None:
+        return response
+    sql_activity.endpoint = None
+    
+    http_requests.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    http_request_seconds.observe(time.perf_counter() - started, endpoint=endpoint)
+    sql_statements.inc(sql_activity.statements, endpoint=endpoint)
+    sql_seconds.inc(sql_activity.seconds, endpoint=endpoint)
+    sql_statements_per_request.observe(sql_activity.statements, endpoint=endpoint)
+    sql_seconds_per_request.observe(sql_activity.seconds, endpoint=endpoint)
+    metrics_store.flush(metrics)
+    return response
+
+@app.teardown_request
+def end_request_metrics(exception=None):
+    # after_request is skipped when a request fails early; don't charge later SQL on this thread to it
+    sql_activity.endpoint = None
+
+# ==============================================================================
+# STEAM API HELPERS
+# ==============================================================================
+
+def search_steam_games(query):
+    """Search for games on Steam"""
+    try:
+        response = steam_client.get(f"{STEAM_STORE_BASE}/api/storesearch/",
+                                    params={'term': query, 'l': 'english', 'cc': 'US'},
+                                    retries=1)
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get('items', [])[:5]
+            for item in items:
+                app_id = item.get('id')
+                item['capsule_image'] = f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg"
+            return items
+    except:
+        pass
+    return []
+
+# Kept in SQLite so gunicorn workers and the scheduler process share one budget
+steam_rate_limiter = SharedTokenBucket(get_db, 'steam-api', STEAM_API_RATE, STEAM_API_BURST)
+steam_client = SteamClient(rate_limiters={urlsplit(STEAM_API_BASE).netloc: steam_rate_limiter},
+                           observer=observe_steam_request)
+
+def steam_api_call_with_rate_limit(url):
+    """Make Steam API call within the shared rate budget"""
+    return steam_client.get(url)
+
+class SteamAPIError(Exception):
+    """A Steam Web API call returned a non-200 status"""
+    def __init__(self, status_code):
+        super().__init__(f"Steam API returned status {status_code}")
+        self.status_code = status_code
+
+class OwnedGamesSnapshot:
+    """
+    The user's GetOwnedGames library as an appid -> entry dict, shared by
+    every caller for `ttl` seconds. Concurrent callers that miss the cache
+    wait for a single in-flight download instead of starting their own.
+    The snapshot is per process: each gunicorn worker downloads its own copy.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._library = None
+        self._fetched_at = 0.0
+        self._inflight = None
+    
+    def get(self, max_age=None):
+        """
+        Return the library, downloading it if the snapshot is older than
+        max_age seconds. Raises SteamAPIError or a requests exception when
+        the download fails; failures are not cached.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._library is not None and time.monotonic() - self._fetched_at < max_age:
+                return self._library
+            future = self._inflight
+            owner = future is None
+            if owner:
+                future = self._inflight = Future()
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            library = self._fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight = None
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._library = library
+            self._fetched_at = time.monotonic()
+            self._inflight = None
+        future.set_result(library)
+        return library
+    
+    def get_game(self, app_id, max_age=None):
+        return self.get(max_age).get(app_id)
+    
+    def invalidate(self):
+        with self._lock:
+            self._library = None
+    
+    def _fetch(self):
+        games_url = f"{STEAM_API_BASE}/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1&include_played_free_games=1"
+        games_response = steam_api_call_with_rate_limit(games_url)
+        if games_response.status_code != 200:
+            raise SteamAPIError(games_response.status_code)
+        
+        games_data = games_response.json()
+        return {game['appid']: game for game in games_data.get('response', {}).get('games', [])}
+
+steam_owned_games = OwnedGamesSnapshot(STEAM_OWNED_GAMES_TTL)
+
+def _read_cached_schema(app_id):
+    conn = get_db()
+    try:
+        return conn.execute(
+            'SELECT achievements, fetched_at FROM steam_schema_cache WHERE app_id = ?', (app_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+def _store_cached_schema(app_id, schema_achievements):
+    conn = get_db()
+    try:
+        conn.execute(
+            'INSERT OR REPLACE INTO steam_schema_cache (app_id, achievements, fetched_at) VALUES (?, ?, ?)',
+            (app_id, json.dumps(schema_achievements), time.time())
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        # The cache is an optimization; never fail a Steam fetch because of it
+        logger.error(f"Could not cache achievement schema for app {app_id}: {e}")
+    finally:
+        conn.close()
+
+def get_steam_achievement_schema(app_id, max_age=None):
+    """
+    Get the GetSchemaForGame achievement list for a game, served from
+    steam_schema_cache while it is younger than max_age seconds
+    (STEAM_SCHEMA_TTL by default). A stale entry is refreshed from Steam, and
+    kept if the refresh fails. Returns None when nothing could be fetched.
+    """
+    max_age = STEAM_SCHEMA_TTL if max_age is None else max_age
+    cached = _read_cached_schema(app_id)
+    if cached and time.time() - cached['fetched_at'] < max_age:
+        return json.loads(cached['achievements'])
+    
+    stale = json.loads(cached['achievements']) if cached else None
+    
+    schema_url = f"{STEAM_API_BASE}/ISteamUserStats/GetSchemaForGame/v2/?key={STEAM_API_KEY}&appid={app_id}"
+    schema_response = steam_api_call_with_rate_limit(schema_url)
+    
+    if schema_response.status_code != 200:
+        if schema_response.status_code == 429:
+            logger.info(f"Rate limited when fetching achievements for app {app_id}")
+        return stale
+        
+    try:
+        schema_data = schema_response.json()
+    except ValueError:
+        logger.info(f"Invalid JSON in schema response for app {app_id}")
+        return stale
+        
+    schema_achievements = schema_data.get('game', {}).get('availableGameStats', {}).get('achievements', [])
+    
+    # Games without achievements are cached too, so they aren't refetched every time
+    _store_cached_schema(app_id, schema_achievements)
+    return schema_achievements
+
+def get_steam_achievements(app_id, steam_id=None):
+    """
+    Get achievements for a Steam game.
+    The schema comes from the local cache; only the player's unlock state is
+    fetched from Steam on every call.
+    """
+    if not STEAM_API_KEY:
+        return []
+    
+    try:
+        schema_achievements = get_steam_achievement_schema(app_id)
+        
+        if not schema_achievements:
+            return []
+        
+        user_achievements = {}
+        if STEAM_USER_ID:
+            try:
+                user_url = f"{STEAM_API_BASE}/ISteamUserStats/GetPlayerAchievements/v0001/?appid={app_id}&key={STEAM_API_KEY}&steamid={STEAM_USER_ID}"
+                user_response = steam_api_call_with_rate_limit(user_url)
+                
+                if user_response.status_code == 200:
+                    try:
+                        user_data = user_response.json()
+                        if user_data.get('playerstats', {}).get('success'):
+                            for ach in user_data.get('playerstats', {}).get('achievements', []):
+                                user_achievements[ach['apiname']] = {
+                                    'achieved': ach.get('achieved', 0),
+                                    'unlocktime': ach.get('unlocktime', 0)
+                                }
                     except ValueError:
                         logger.info(f"Invalid JSON in user achievements for app {app_id}")
             except Exception as user_err:
@@ -582,6 +2494,128 @@ def get_steam_achievements(app_id, steam_id=None):
         logger.error(f"Error fetching Steam achievements for app {app_id}: {e}")
         return []
     
+def fetch_steam_achievements_bulk(app_ids, max_workers=None):
+    """
+    Fetch achievements for many games in parallel within the shared rate budget.
+    Yields lists of (app_id, achievements, error): each list is every fetch
+    that finished since the previous one, so callers can write a whole list in
+    one transaction without holding it open while waiting on Steam. Closing
+    the generator early cancels fetches that have not started yet.
+    """
+    app_ids = list(app_ids)
+    if not app_ids:
+        return
+    
+    max_workers = min(max_workers or STEAM_FETCH_WORKERS, len(app_ids))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='steam-fetch')
+    try:
+        futures = {executor.submit(get_steam_achievements, app_id): app_id for app_id in app_ids}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            batch = []
+            for future in done:
+                try:
+                    batch.append((futures[future], future.result(), None))
+                except Exception as e:
+                    batch.append((futures[future], None, e))
+            yield batch
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def sync_game_achievements(cur, game_id, steam_achievements):
+    """
+    Bring a game's achievements in line with the list returned by
+    get_steam_achievements(), keyed on the Steam apiname. Only rows whose
+    title, description, unlock state, date or icon changed are updated; new
+    achievements are inserted and ones Steam no longer lists are deleted, so
+    row IDs stay stable across syncs.
+    Rows from before apinames were stored are matched by title on first sync.
+    Returns {'added', 'updated', 'removed', 'unchanged'} counts.
+    """
+    wanted = {}
+    for ach in steam_achievements:
+        # Achievements without a name can't be stored (title is NOT NULL)
+        if ach.get('name') is None:
+            continue
+        apiname = ach.get('apiname') or ach['name']
+        wanted[apiname] = (ach['name'], ach.get('description'), ach.get('unlock_date'),
+                           ach.get('achieved', 0), ach.get('icon'))
+    
+    cur.execute('''
+        SELECT id, apiname, title, description, date, unlocked, icon_url
+        FROM achievements WHERE game_id = ?
+    ''', (game_id,))
+    by_apiname = {}
+    unkeyed_by_title = {}
+    for row in cur.fetchall():
+        if row['apiname'] is not None:
+            by_apiname[row['apiname']] = row
+        else:
+            unkeyed_by_title.setdefault(row['title'], []).append(row)
+    
+    summary = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    inserts = []
+    updates = []
+    for apiname, values in wanted.items():
+        row = by_apiname.pop(apiname, None)
+        adopted = row is None and bool(unkeyed_by_title.get(values[0]))
+        if adopted:
+            row = unkeyed_by_title[values[0]].pop(0)
+        
+        if row is None:
+            inserts.append((game_id, apiname) + values)
+            summary['added'] += 1
+            continue
+        
+        changed = (row['title'], row['description'], row['date'], row['unlocked'], row['icon_url']) != values
+        summary['updated' if changed else 'unchanged'] += 1
+        if changed or adopted:
+            updates.append(values + (apiname, row['id']))
+    
+    removed = [(row['id'],) for row in by_apiname.values()]
+    removed += [(row['id'],) for rows in unkeyed_by_title.values() for row in rows]
+    summary['removed'] = len(removed)
+    
+    for chunk in chunked(removed):
+        cur.executemany('DELETE FROM achievements WHERE id = ?', chunk)
+    for chunk in chunked(updates):
+        cur.executemany('''
+            UPDATE achievements SET title = ?, description = ?, date = ?, unlocked = ?, icon_url = ?, apiname = ?
+            WHERE id = ?
+        ''', chunk)
+    bulk_insert(cur, 'achievements', ('game_id', 'apiname', 'title', 'description', 'date', 'unlocked', 'icon_url'),
+                inserts)
+    return summary
+
+def mark_completed_if_all_unlocked(cur, game_id, steam_achievements):
+    """
+    Mark the game Completed when every Steam achievement is unlocked.
+    The completion date is the latest unlock date.
+    Returns (all_achievements_unlocked, completion_date).
+    """
+    if not steam_achievements:
+        return False, None
+    
+    unlocked_count = sum(1 for ach in steam_achievements if ach.get('achieved', 0))
+    if unlocked_count != len(steam_achievements):
+        return False, None
+    
+    achievement_dates = [ach.get('unlock_date') for ach in steam_achievements if ach.get('unlock_date')]
+    if achievement_dates:
+        try:
+            date_objects = [datetime.strptime(date, '%Y-%m-%d') for date in achievement_dates if date]
+            latest_date = max(date_objects)
+            completion_date = latest_date.strftime('%Y-%m-%d')
+        except Exception:
+            completion_date = datetime.now().strftime('%Y-%m-%d')
+    else:
+        completion_date = datetime.now().strftime('%Y-%m-%d')
+    
+    cur.execute('UPDATE games SET status=?, completion_date=? WHERE id=?', 
+               ('Completed', completion_date, game_id))
+    return True, completion_date
+
 def get_steam_game_details(app_id):
     """Get game details including hours played and tags"""
     details = {
@@ -591,19 +2625,17 @@ def get_steam_game_details(app_id):
     
     try:
         if STEAM_API_KEY and STEAM_USER_ID:
-            games_url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1&include_played_free_games=1"
-            games_response = requests.get(games_url, timeout=5)
+            try:
+                game = steam_owned_games.get_game(app_id)
+            except SteamAPIError:
+                game = None
             
-            if games_response.status_code == 200:
-                games_data = games_response.json()
-                for game in games_data.get('response', {}).get('games', []):
-                    if game.get('appid') == app_id:
-                        playtime_minutes = game.get('playtime_forever', 0)
-                        details['hours_played'] = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else None
-                        break
+            if game:
+                playtime_minutes = game.get('playtime_forever', 0)
+                details['hours_played'] = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else None
         
-        store_url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
-        store_response = requests.get(store_url, timeout=5)
+        store_url = f"{STEAM_STORE_BASE}/api/appdetails?appids={app_id}"
+        store_response = steam_client.get(store_url)
         
         if store_response.status_code == 200:
             store_data = store_response.json()
@@ -652,30 +2684,31 @@ def update_all_steam_hours_sync():
         
         logger.info(f"Auto-updating {len(steam_games)} Steam games...")
         
-        games_url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1"
-        games_response = steam_api_call_with_rate_limit(games_url)
-        
-        if games_response.status_code != 200:
-            logger.info(f"Steam API returned status {games_response.status_code}")
+        try:
+            steam_library = steam_owned_games.get()
+        except SteamAPIError as e:
+            logger.info(str(e))
             conn.close()
             return False
         
-        games_data = games_response.json()
-        steam_library = {game['appid']: game for game in games_data.get('response', {}).get('games', [])}
-        
-        updated_count = 0
+        updates = []
         for game in steam_games:
             app_id = game['steam_app_id']
             steam_game = steam_library.get(app_id)
-            
+
             if steam_game:
                 playtime_minutes = steam_game.get('playtime_forever', 0)
                 hours_played = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else 0
-                cur.execute('UPDATE games SET hours_played=? WHERE id=?', (hours_played, game['id']))
-                updated_count += 1
-        
+                updates.append((hours_played, game['id']))
+
+        for chunk in chunked(updates):
+            cur.executemany('UPDATE games SET hours_played=? WHERE id=?', chunk)
+        updated_count = len(updates)
+
         conn.commit()
         conn.close()
+        data_version.bump()
+        response_cache.invalidate('games', 'stats', 'top10')
         
         logger.info(f"Auto-updated {updated_count} Steam games")
         return True
@@ -683,6 +2716,695 @@ def update_all_steam_hours_sync():
         logger.error(f"Error auto-updating Steam hours: {e}")
         return False
 
+# ==============================================================================
+# EXPORT AND IMPORT
+# ==============================================================================
+
+# Tables in a full export, parents before children. Derived tables (stats
+# summary, rollups, caches, jobs) are rebuilt after an import instead.
+EXPORT_TABLES = ('games', 'tags', 'achievements', 'completionist_achievements', 'top10_games',
+                 'steam_import_status', 'daily_snapshots', 'daily_game_snapshots', 'daily_play_deltas')
+EXPORT_FORMAT = 'gametracker-ndjson'
+EXPORT_FORMAT_VERSION = 1
+# Rows fetched from SQLite, and yielded as one chunk of the stream, at a time
+EXPORT_FETCH_SIZE = 1000
+
+def iter_export_lines(conn, export_id=None, from_table=None, after_rowid=0, include_header=True):
+    """
+    Yield the database as NDJSON: a header line, one line per row tagged with
+    its table and rowid, then an end marker. Each yielded string holds up to
+    EXPORT_FETCH_SIZE lines, so memory use doesn't grow with the database.
+    Everything is read in one transaction, so the export is a consistent snapshot.
+    from_table/after_rowid resume an interrupted export: earlier tables are
+    skipped, and so are from_table's rows up to after_rowid.
+    """
+    start = EXPORT_TABLES.index(from_table) if from_table else 0
+    conn.execute('BEGIN')
+    try:
+        if include_header:
+            yield json.dumps({
+                'format': EXPORT_FORMAT,
+                'version': EXPORT_FORMAT_VERSION,
+                'schema_version': get_schema_version(conn),
+                'export_id': export_id or uuid.uuid4().hex,
+                'exported_at': datetime.now(pytz.UTC).isoformat()
+            }) + '\n'
+        
+        rows = 0
+        for index, table in enumerate(EXPORT_TABLES[start:], start):
+            cur = conn.execute(f'SELECT rowid AS export_rowid, * FROM {table} WHERE rowid > ? ORDER BY rowid',
+                               (after_rowid if index == start else 0,))
+            while True:
+                batch = cur.fetchmany(EXPORT_FETCH_SIZE)
+                if not batch:
+                    break
+                lines = []
+                for row in batch:
+                    row = dict(row)
+                    rowid = row.pop('export_rowid')
+                    lines.append(json.dumps({'table': table, 'rowid': rowid, 'row': row}) + '\n')
+                rows += len(batch)
+                yield ''.join(lines)
+        
+        yield json.dumps({'end': True, 'rows': rows}) + '\n'
+    finally:
+        conn.rollback()
+
+def _import_batch(cur, table, records):
+    """Upsert one table's rows by primary key; consecutive rows with the same columns share an executemany"""
+    for columns, group in groupby(records, key=lambda record: tuple(record['row'])):
+        cur.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+            [tuple(record['row'].values()) for record in group]
+        )
+
+def import_ndjson(conn, lines):
+    """
+    Load an export written by iter_export_lines() from any iterable of lines
+    (str or bytes), without holding more than one chunk in memory. Rows are
+    upserted by primary key in transactions of BULK_WRITE_CHUNK_SIZE rows,
+    and each transaction also records a checkpoint for the export_id, so
+    running an interrupted import again skips what was already committed.
+    Derived tables are rebuilt at the end.
+    Raises ValueError for input it can't use; chunks committed before that stay.
+    Returns {'export_id', 'rows': {table: count}, 'skipped', 'complete'}.
+    """
+    summary = {'export_id': None, 'rows': {}, 'skipped': 0, 'complete': False}
+    cur = conn.cursor()
+    columns_by_table = {}
+    checkpoint = None
+    batch = []
+    
+    def flush():
+        table = batch[0]['table']
+        _import_batch(cur, table, batch)
+        summary['rows'][table] = summary['rows'].get(table, 0) + len(batch)
+        cur.execute('''
+            INSERT OR REPLACE INTO import_checkpoints (export_id, table_name, last_rowid, rows, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (summary['export_id'], table, batch[-1]['rowid'], sum(summary['rows'].values()), time.time()))
+        conn.commit()
+        batch.clear()
+    
+    try:
+        for number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError(f'Line {number} is not valid JSON')
+            
+            if 'format' in record:
+                # A resumed download repeats the header; it must belong to the same export
+                if summary['export_id'] is None:
+                    if record.get('format') != EXPORT_FORMAT or record.get('version') != EXPORT_FORMAT_VERSION:
+                        raise ValueError('Not a gametracker NDJSON export')
+                    if record.get('schema_version', 0) > get_schema_version(conn):
+                        raise ValueError('The export comes from a newer version of the app; upgrade first')
+                    summary['export_id'] = record['export_id']
+                    saved = cur.execute('SELECT table_name, last_rowid FROM import_checkpoints WHERE export_id = ?',
+                                        (summary['export_id'],)).fetchone()
+                    if saved:
+                        checkpoint = (EXPORT_TABLES.index(saved['table_name']), saved['last_rowid'])
+                elif record.get('export_id') != summary['export_id']:
+                    raise ValueError(f'Line {number} starts a different export')
+                continue
+            
+            if summary['export_id'] is None:
+                raise ValueError('Missing export header')
+            if record.get('end'):
+                summary['complete'] = True
+                break
+            
+            table = record.get('table')
+            if table not in EXPORT_TABLES or not isinstance(record.get('row'), dict):
+                raise ValueError(f'Line {number} is not an exported row')
+            if (EXPORT_TABLES.index(table), record['rowid']) <= (checkpoint or (-1, 0)):
+                summary['skipped'] += 1
+                continue
+            
+            if table not in columns_by_table:
+                columns_by_table[table] = {row['name'] for row in cur.execute(f'PRAGMA table_info({table})')}
+            unknown = set(record['row']) - columns_by_table[table]
+            if unknown:
+                raise ValueError(f"Line {number}: {table} has no column {', '.join(sorted(unknown))}")
+            
+            if batch and (batch[0]['table'] != table or len(batch) >= BULK_WRITE_CHUNK_SIZE):
+                flush()
+            batch.append(record)
+        
+        if batch:
+            flush()
+        if summary['complete']:
+            cur.execute('DELETE FROM import_checkpoints WHERE export_id = ?', (summary['export_id'],))
+            conn.commit()
+    finally:
+        conn.rollback()
+        if summary['rows']:
+            # Upserts replace rows without firing delete triggers, so recompute from scratch
+            rebuild_stats_summary(conn)
+            rebuild_playtime_rollups(conn)
+            conn.commit()
+            data_version.bump()
+            response_cache.invalidate('games', 'stats', 'top10', 'completionist', 'playtime')
+    
+    logger.info(f"✓ Imported {sum(summary['rows'].values())} rows "
+                f"({summary['skipped']} already imported, complete: {summary['complete']})")
+    return summary
+
+# ==============================================================================
+# COVER MIRROR
+# ==============================================================================
+
+# Upper bound for static/covers; least recently served covers are evicted first
+COVER_MIRROR_MAX_BYTES = int(os.getenv("COVER_MIRROR_MAX_MB", 200)) * 1024 * 1024
+COVER_MAX_FILE_BYTES = 5 * 1024 * 1024
+# A failed or evicted download is not retried for this long
+COVER_RETRY_SECONDS = 3600
+COVER_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+# Thumbnail widths (px) and formats for srcset; formats Pillow can't encode are dropped
+COVER_THUMB_WIDTHS = [int(w) for w in os.getenv("COVER_THUMB_WIDTHS", "80,160,320").split(',')]
+COVER_THUMB_FORMATS = supported_formats(os.getenv("COVER_THUMB_FORMATS", "avif,webp").split(','))
+COVER_THUMB_WORKERS = int(os.getenv("COVER_THUMB_WORKERS", 2))
+
+class CoverMirror:
+    """
+    Local copies of remote cover images, stored content-addressed in
+    static/covers and tracked in the cover_mirror table (url -> filename).
+    Lookups never block: an unmirrored URL is queued for a background
+    download and served remotely until the file exists. Downloaded covers
+    get resized copies in static/covers/thumbs, generated in a process pool.
+
+    Each worker process keeps its own url -> filename map. Whenever files are
+    deleted (eviction, rebuild) the mirror's DataVersion token is bumped, and
+    ensure_current() reloads the map once it sees a token it didn't load.
+    """
+
+    def __init__(self, covers_path, max_bytes, version_path, workers=2):
+        self.covers_path = Path(covers_path)
+        self.thumbs_path = self.covers_path / 'thumbs'
+        self.max_bytes = max_bytes
+        self.version = DataVersion(version_path)
+        self._files = None
+        self._loaded_token = None
+        self._thumbs = {}  # cover stem -> {format: {width: thumbnail name}}
+        self._used = {}
+        self._backoff = {}
+        self._pending = set()
+        self._thumbs_pending = set()
+        self._changed = False
+        self._lock = threading.Lock()
+        # Only one eviction pass at a time; both download threads can trigger one
+        self._evict_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cover-mirror')
+        self._thumb_pool = None
+
+    def _ensure_loaded(self):
+        if self._files is not None:
+            return
+        self._load()
+
+    def ensure_current(self):
+        """Reload the map if another process (or thread) deleted mirrored files since it was loaded"""
+        token = self.version.current()[0]
+        if self._files is None or token != self._loaded_token:
+            self._load(token)
+
+    def _load(self, token=None):
+        token = token or self.version.current()[0]
+        conn = get_db()
+        try:
+            rows = conn.execute('SELECT url, filename FROM cover_mirror').fetchall()
+        finally:
+            conn.close()
+        self.thumbs_path.mkdir(parents=True, exist_ok=True)
+        thumbs = {}
+        for path in self.thumbs_path.iterdir():
+            self._add_thumbnail(thumbs, path.name)
+        with self._lock:
+            self._thumbs = thumbs
+            self._files = {row['url']: row['filename'] for row in rows}
+            self._loaded_token = token
+
+    @staticmethod
+    def _add_thumbnail(thumbs, name):
+        # Names look like <cover stem>-<width>.<format>
+        if name.startswith('.') or name.count('.') != 1:
+            return
+        base, ext = name.split('.')
+        stem, _, width = base.rpartition('-')
+        if stem and width.isdigit():
+            thumbs.setdefault(stem, {}).setdefault(ext, {})[int(width)] = name
+
+    def local_url(self, url):
+        """The /static/covers URL for a remote cover, or None if it isn't mirrored yet"""
+        if not url or not url.startswith(('http://', 'https://')):
+            return None
+        self._ensure_loaded()
+        filename = self._files.get(url)
+        if filename:
+            with self._lock:
+                self._used[url] = time.time()
+            return f'/static/covers/{filename}'
+        self.schedule(url)
+        return None
+
+    def schedule(self, url):
+        with self._lock:
+            if url in self._pending or time.time() - self._backoff.get(url, 0) < COVER_RETRY_SECONDS:
+                return
+            self._pending.add(url)
+        self._executor.submit(self._download_task, url)
+
+    def _download_task(self, url):
+        changed = False
+        try:
+            self.download(url)
+            changed = True
+        except Exception as e:
+            logger.info(f"Cover download failed for {url}: {e}")
+            with self._lock:
+                self._backoff[url] = time.time()
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+            self._task_done(changed)
+
+    def _task_done(self, changed):
+        with self._lock:
+            self._changed = self._changed or changed
+            drained = self._changed and not self._pending and not self._thumbs_pending
+            if drained:
+                self._changed = False
+        if drained:
+            # Cached responses still carry the old cover URLs
+            data_version.bump()
+            response_cache.invalidate('games', 'stats', 'top10')
+
+    def srcset(self, filename):
+        """{format: srcset string} for a mirrored cover, or None until thumbnails exist"""
+        if not COVER_THUMB_FORMATS:
+            return None
+        thumbs = self._thumbs.get(Path(filename).stem)
+        if thumbs is None:
+            self.schedule_thumbnails(filename)
+            return None
+        return {
+            ext: ', '.join(f'/static/covers/thumbs/{name} {width}w' for width, name in sorted(by_width.items()))
+            for ext, by_width in thumbs.items()
+        } or None
+
+    def schedule_thumbnails(self, filename):
+        """Queue thumbnail generation for a mirrored cover. Returns the future, or None."""
+        if not COVER_THUMB_FORMATS:
+            return None
+        with self._lock:
+            if filename in self._thumbs_pending:
+                return None
+            self._thumbs_pending.add(filename)
+            if self._thumb_pool is None:
+                # spawn, not fork: the app process is multi-threaded
+                self._thumb_pool = ProcessPoolExecutor(max_workers=COVER_THUMB_WORKERS,
+                                                       mp_context=multiprocessing.get_context('spawn'))
+            pool = self._thumb_pool
+        try:
+            future = pool.submit(generate_cover_thumbnails, self.covers_path / filename,
+                                 self.thumbs_path, COVER_THUMB_WIDTHS, COVER_THUMB_FORMATS)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.error(f"Thumbnail pool unavailable: {e}")
+            with self._lock:
+                self._thumbs_pending.discard(filename)
+                if self._thumb_pool is pool:
+                    self._thumb_pool = None
+            return None
+        future.add_done_callback(lambda f: self._thumbnails_done(filename, f))
+        return future
+
+    def _thumbnails_done(self, filename, future):
+        thumbs = {}
+        try:
+            for name in future.result():
+                self._add_thumbnail(thumbs, name)
+        except Exception as e:
+            # Recorded as done with no thumbnails so it isn't retried on every lookup
+            logger.info(f"Thumbnail generation failed for {filename}: {e}")
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    self._thumb_pool = None
+        with self._lock:
+            self._thumbs[Path(filename).stem] = thumbs.get(Path(filename).stem, {})
+            self._thumbs_pending.discard(filename)
+        self._task_done(bool(thumbs))
+
+    def download(self, url):
+        """Fetch one cover into the mirror. Returns its filename."""
+        self._ensure_loaded()
+        conn = get_db()
+        try:
+            # Another worker process may have mirrored it already
+            row = conn.execute('SELECT filename FROM cover_mirror WHERE url = ?', (url,)).fetchone()
+            if row and (self.covers_path / row['filename']).exists():
+                with self._lock:
+                    self._files[url] = row['filename']
+                return row['filename']
+
+            response = steam_client.get(url, retries=1)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            extension = COVER_EXTENSIONS.get(content_type)
+            if not extension:
+                raise RuntimeError(f"unsupported content type {content_type!r}")
+            content = response.content
+            if len(content) > COVER_MAX_FILE_BYTES:
+                raise RuntimeError(f"{len(content)} bytes is over the size limit")
+
+            filename = hashlib.sha256(content).hexdigest()[:32] + extension
+            path = self.covers_path / filename
+            if not path.exists():
+                tmp_path = path.with_name(f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, path)
+
+            now = time.time()
+            conn.execute(
+                '''INSERT OR REPLACE INTO cover_mirror (url, filename, size, fetched_at, last_used_at)
+                   VALUES (?, ?, ?, ?, ?)''',
+                (url, filename, len(content), now, now)
+            )
+            conn.commit()
+            with self._lock:
+                self._files[url] = filename
+            self.schedule_thumbnails(filename)
+            self.evict(conn)
+            return filename
+        finally:
+            conn.close()
+
+    def evict(self, conn):
+        """Delete least recently served covers until the mirror fits in max_bytes"""
+        with self._evict_lock:
+            return self._evict(conn)
+
+    def _evict(self, conn):
+        with self._lock:
+            used, self._used = self._used, {}
+        if used:
+            conn.executemany('UPDATE cover_mirror SET last_used_at = ? WHERE url = ?',
+                             [(ts, url) for url, ts in used.items()])
+            conn.commit()
+
+        files = conn.execute('''
+            SELECT filename, MAX(size) as size, MAX(last_used_at) as last_used_at
+            FROM cover_mirror
+            GROUP BY filename
+            ORDER BY last_used_at ASC
+        ''').fetchall()
+        total = sum(row['size'] for row in files)
+
+        evicted = 0
+        for row in files:
+            if total <= self.max_bytes:
+                break
+            urls = [r['url'] for r in conn.execute(
+                'SELECT url FROM cover_mirror WHERE filename = ?', (row['filename'],))]
+            conn.execute('DELETE FROM cover_mirror WHERE filename = ?', (row['filename'],))
+            conn.commit()
+            stem = Path(row['filename']).stem
+            with self._lock:
+                for url in urls:
+                    self._files.pop(url, None)
+                    # Don't fetch it straight back on the next lookup
+                    self._backoff[url] = time.time()
+                self._thumbs.pop(stem, None)
+            (self.covers_path / row['filename']).unlink(missing_ok=True)
+            for path in self.thumbs_path.glob(f'{stem}-*'):
+                path.unlink(missing_ok=True)
+            total -= row['size']
+            evicted += 1
+
+        if evicted:
+            # Other workers still map the evicted URLs to the deleted files
+            self.version.bump()
+            logger.info(f"Cover mirror: evicted {evicted} files, {total / 1024 / 1024:.1f} MB kept")
+        return evicted
+
+    def rebuild(self, urls, force=False):
+        """
+        Mirror every URL in `urls` synchronously, regenerate missing
+        thumbnails and delete files that no longer belong to any URL.
+        Returns counts of downloaded, failed, thumbnailed and removed files.
+        """
+        conn = get_db()
+        try:
+            if force:
+                conn.execute('DELETE FROM cover_mirror')
+                conn.commit()
+            # Drop rows whose file has gone missing so they are fetched again
+            for row in conn.execute('SELECT url, filename FROM cover_mirror').fetchall():
+                if not (self.covers_path / row['filename']).exists():
+                    conn.execute('DELETE FROM cover_mirror WHERE url = ?', (row['url'],))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._backoff.clear()
+        self.version.bump()
+        self._load()
+
+        counts = {'downloaded': 0, 'failed': 0, 'thumbnailed': 0, 'removed': 0}
+        missing = [url for url in dict.fromkeys(urls)
+                   if url and url.startswith(('http://', 'https://')) and url not in self._files]
+        futures = [self._executor.submit(self.download, url) for url in missing]
+        for url, future in zip(missing, futures):
+            try:
+                future.result()
+                counts['downloaded'] += 1
+            except Exception as e:
+                logger.info(f"Cover download failed for {url}: {e}")
+                counts['failed'] += 1
+
+        conn = get_db()
+        try:
+            referenced = {row['filename'] for row in conn.execute('SELECT DISTINCT filename FROM cover_mirror')}
+        finally:
+            conn.close()
+        for path in self.covers_path.iterdir():
+            if path.is_file() and path.name not in referenced:
+                path.unlink()
+                counts['removed'] += 1
+
+        stems = {Path(filename).stem for filename in referenced}
+        for path in self.thumbs_path.iterdir():
+            if path.name.rpartition('-')[0] not in stems:
+                path.unlink()
+                counts['removed'] += 1
+
+        with self._lock:
+            self._thumbs = {}
+        self.version.bump()
+        futures = [self.schedule_thumbnails(filename) for filename in sorted(referenced)]
+        for future in futures:
+            if future is None:
+                continue
+            try:
+                counts['thumbnailed'] += 1 if future.result() else 0
+            except Exception:
+                pass
+
+        data_version.bump()
+        response_cache.invalidate('games', 'stats', 'top10')
+        return counts
+
+cover_mirror = CoverMirror(COVERS_PATH, COVER_MIRROR_MAX_BYTES, DB_PATH.parent / "cover_mirror_version")
+
+def mirror_covers(items):
+    """
+    Point cover_url at the local mirror for every dict in `items`, keeping the
+    remote address in cover_source_url and adding cover_srcset
+    ({format: srcset}) once thumbnails exist. Unmirrored covers stay remote.
+    """
+    cover_mirror.ensure_current()
+    for item in items:
+        url = item.get('cover_url')
+        local_url = cover_mirror.local_url(url)
+        if local_url:
+            item['cover_source_url'] = url
+            item['cover_url'] = local_url
+            srcset = cover_mirror.srcset(Path(local_url).name)
+            if srcset:
+                item['cover_srcset'] = srcset
+    return items
+
+@app.after_request
+def cache_mirrored_covers(response):
+    # Mirrored files are content-addressed, so a URL never changes content
+    if request.endpoint == 'static' and request.path.startswith('/static/covers/') and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+# ==============================================================================
+# RESPONSE COMPRESSION
+# ==============================================================================
+
+# Smaller bodies aren't worth the CPU or the extra header bytes
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+COMPRESS_MIMETYPES = {'application/json', 'text/html'}
+# Levels for bodies compressed per request; static bundles use the maximum once
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Bundles served fingerprinted and precompressed from static/dist
+STATIC_BUNDLES = ('css/style.css', 'js/app.js')
+STATIC_DIST_PATH = Path(__file__).parent / "static" / "dist"
+ENCODING_SUFFIXES = {'br': 'br', 'gzip': 'gz'}
+MAX_LEVELS = {'br': 11, 'gzip': 9}
+# Bundle generations `flask build-assets` keeps, so pages from the previous release still load
+STATIC_BUNDLE_GENERATIONS = 2
+
+def _content_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def compress_body(body, encoding, level=None):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+@app.after_request
+def compress_response(response):
+    """
+    Brotli or gzip encode JSON and HTML bodies of at least COMPRESS_MIN_BYTES,
+    whichever the client prefers. The ETag becomes weak because the encoded
+    bytes differ from the identity body; conditional_response compares weakly.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESS_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(_content_encodings())
+    if encoding is None:
+        return response
+    
+    # Cached bodies are compressed once per encoding, not on every hit
+    cache_entry = g.get('response_cache_entry')
+    encoded = response_cache.get_encoded(*cache_entry, encoding) if cache_entry else None
+    if encoded is None:
+        encoded = compress_body(body, encoding)
+        if cache_entry:
+            response_cache.put_encoded(*cache_entry, encoding, encoded)
+    
+    response.set_data(encoded)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def build_static_bundles(force=False):
+    """
+    Write a content-hashed copy of every STATIC_BUNDLES file to static/dist,
+    plus .gz and .br (when Brotli is installed) versions at maximum
+    compression. Bundles that already exist are kept unless force is set.
+    Older fingerprints are left alone; see prune_static_bundles().
+    Returns {source path: dist file name}.
+    """
+    STATIC_DIST_PATH.mkdir(exist_ok=True)
+    static_path = Path(app.static_folder)
+    names = {}
+    
+    for filename in STATIC_BUNDLES:
+        source = static_path / filename
+        if not source.exists():
+            continue
+        body = source.read_bytes()
+        stem, ext = os.path.splitext(source.name)
+        name = f"{stem}.{hashlib.sha1(body).hexdigest()[:12]}{ext}"
+        names[filename] = name
+        
+        if force or not (STATIC_DIST_PATH / name).exists():
+            variants = {name: body}
+            for encoding in _content_encodings():
+                variants[f"{name}.{ENCODING_SUFFIXES[encoding]}"] = compress_body(body, encoding, MAX_LEVELS[encoding])
+            # The plain file goes last: its existence marks the bundle complete.
+            # Temporary names keep other workers from serving a partial file.
+            for variant in reversed(list(variants)):
+                tmp_path = STATIC_DIST_PATH / f".{variant}.{os.getpid()}.tmp"
+                tmp_path.write_bytes(variants[variant])
+                os.replace(tmp_path, STATIC_DIST_PATH / variant)
+    
+    return names
+
+def prune_static_bundles(current, keep=STATIC_BUNDLE_GENERATIONS):
+    """
+    Delete old fingerprints, keeping the current bundle and the newest
+    keep - 1 before it. Workers still running the previous release during a
+    reload keep serving pages that link the previous bundle, which was sent
+    as immutable, so it has to stay. Only `flask build-assets` prunes; a
+    starting worker can't know which bundles other workers still link.
+    Returns the number of files removed.
+    """
+    removed = 0
+    for filename, name in current.items():
+        stem, ext = os.path.splitext(os.path.basename(filename))
+        bundles = sorted((path for path in STATIC_DIST_PATH.glob(f"{stem}.*{ext}") if path.name != name),
+                         key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in bundles[keep - 1:]:
+            for variant in [path] + [path.with_name(f"{path.name}.{suffix}") for suffix in ENCODING_SUFFIXES.values()]:
+                if variant.exists():
+                    variant.unlink()
+                    removed += 1
+    return removed
+
+# Built by initialize_app(), or on first use
+static_bundles = None
+
+@app.template_global()
+def static_asset_url(filename):
+    """Fingerprinted URL for a bundled static file, falling back to the plain static URL"""
+    global static_bundles
+    if static_bundles is None:
+        static_bundles = build_static_bundles()
+    name = static_bundles.get(filename)
+    if name is None:
+        return url_for('static', filename=filename)
+    return url_for('static_bundle', filename=name)
+
+@app.route('/assets/<path:filename>')
+def static_bundle(filename):
+    """
+    Serve a fingerprinted bundle, precompressed when the client accepts it.
+    The name changes whenever the content does, so it's cached for a year.
+    """
+    encodings = [encoding for encoding in _content_encodings()
+                 if (STATIC_DIST_PATH / f"{filename}.{ENCODING_SUFFIXES[encoding]}").exists()]
+    encoding = request.accept_encodings.best_match(encodings) if encodings else None
+    
+    if encoding is None:
+        response = send_from_directory(STATIC_DIST_PATH, filename, max_age=31536000)
+    else:
+        response = send_from_directory(STATIC_DIST_PATH, f"{filename}.{ENCODING_SUFFIXES[encoding]}",
+                                       mimetype=mimetypes.guess_type(filename)[0], max_age=31536000)
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 # ==============================================================================
 # FLASK ROUTES
 # ==============================================================================
@@ -718,6 +3440,7 @@ def check_auth():
 # ==============================================================================
 
 @app.route('/api/daily-snapshots')
+@conditional_response
 def get_daily_snapshots():
     """Get daily hours history"""
     days = request.args.get('days', 30, type=int)
@@ -725,14 +3448,39 @@ def get_daily_snapshots():
     return jsonify(history)
 
 @app.route('/api/daily-snapshots/<date>')
+@conditional_response
 def get_daily_snapshot(date):
     """Get games played on a specific date"""
     try:
         games = tracker.get_games_played_on_date(date)
-        return jsonify(games)
+        return jsonify(mirror_covers(games))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/playtime')
+@conditional_response
+@cached_response('playtime')
+def api_playtime():
+    """Playtime per day/week/month/year over a date range, with the top games in it"""
+    bucket = request.args.get('bucket', 'month')
+    if bucket != 'day' and bucket not in ROLLUP_PERIOD_SQL:
+        return jsonify({'error': 'bucket must be one of day, week, month, year'}), 400
+    
+    try:
+        to_date = date.fromisoformat(request.args.get('to') or tracker.get_current_date_est().isoformat())
+        from_date = date.fromisoformat(request.args.get('from') or (to_date - timedelta(days=365)).isoformat())
+    except ValueError:
+        return jsonify({'error': 'from and to must be YYYY-MM-DD dates'}), 400
+    if from_date > to_date:
+        return jsonify({'error': 'from must not be after to'}), 400
+    top = max(0, min(request.args.get('top', 10, type=int), 100))
+    
+    conn = get_db()
+    try:
+        return jsonify(query_playtime(conn.cursor(), bucket, from_date.isoformat(), to_date.isoformat(), top))
+    finally:
+        conn.close()
+
 @app.route('/api/daily-snapshots/record', methods=['POST'])
 @login_required
 def record_snapshot_now():
@@ -770,6 +3518,10 @@ def get_snapshot_status():
         cur.execute('SELECT * FROM daily_snapshots WHERE date = ?', (current_date,))
         today_snapshot = cur.fetchone()
         
+        # Whichever process holds the lease runs the job, possibly not this one
+        cur.execute('SELECT holder, expires_at, last_run_date FROM scheduler_lease WHERE name = ?', ('daily-snapshot',))
+        lease = cur.fetchone()
+        
         conn.close()
         
         utc_now = datetime.now(pytz.UTC)
@@ -782,7 +3534,9 @@ def get_snapshot_status():
             'last_snapshot': dict(last_snapshot) if last_snapshot else None,
             'today_snapshot_exists': today_snapshot is not None,
             'total_snapshots': total_snapshots,
-            'next_scheduled_run': str(schedule.next_run()) if schedule.jobs else 'No jobs scheduled',
+            'next_scheduled_run': str(daily_scheduler.next_run) if daily_scheduler.jobs else 'No jobs scheduled',
+            'scheduler_leader': lease['holder'] if lease and lease['expires_at'] > time.time() else None,
+            'last_scheduled_run_date': lease['last_run_date'] if lease else None,
             'schedule_time': '00:05 AM EST (05:05 UTC) daily'
         })
         
@@ -834,53 +3588,44 @@ def toggle_favorite(game_id):
     cur.execute('UPDATE games SET is_favorite=? WHERE id=?', (new_status, game_id))
     conn.commit()
     conn.close()
+    response_cache.invalidate('games')
     
     return jsonify({'is_favorite': new_status})
 
-@app.route('/api/steam/import-library', methods=['POST'])
-@login_required
-def import_steam_library():
-    if not STEAM_API_KEY or not STEAM_USER_ID:
-        return jsonify({'error': 'Steam API not configured. Please check your .env file.'}), 400
+def run_steam_import_job(job, params):
+    """
+    Background job: import the Steam library, optionally with achievements.
+    Resumable through steam_import_status, so a cancelled or interrupted import
+    picks up where it stopped the next time it runs.
+    """
+    import_achievements = params.get('import_achievements', False)
     
-    import_achievements = False
+    logger.info("Starting Steam library import...")
+    job.update(message='Fetching Steam library', force=True)
     
     try:
-        if request.is_json:
-            data = request.get_json() or {}
-            import_achievements = data.get('import_achievements', False)
-        else:
-            import_achievements = request.form.get('import_achievements', 'false').lower() == 'true'
-    except Exception as e:
-        logger.error(f"Error parsing request data: {e}")
+        steam_games = list(steam_owned_games.get().values())
+    except requests.exceptions.Timeout:
+        raise RuntimeError('Steam API request timed out. Please try again later.')
+    except requests.exceptions.ConnectionError:
+        raise RuntimeError('Cannot connect to Steam API. Please check your internet connection.')
+    except SteamAPIError as e:
+        error_msg = str(e)
+        if e.status_code == 429:
+            error_msg = "Steam API rate limit exceeded. Please wait a few minutes and try again."
+        elif e.status_code == 401:
+            error_msg = "Steam API key invalid or expired. Please check your API key."
+        elif e.status_code == 403:
+            error_msg = "Access forbidden. Your Steam profile may be private."
+        raise RuntimeError(error_msg)
+    except ValueError as e:
+        raise RuntimeError(f'Invalid response from Steam API: {str(e)}')
     
+    if not steam_games:
+        raise RuntimeError('No games found in your Steam library.')
+    
+    conn = get_db()
     try:
-        logger.info("Starting Steam library import...")
-        
-        games_url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1&include_played_free_games=1"
-        games_response = steam_api_call_with_rate_limit(games_url)
-        
-        if games_response.status_code != 200:
-            error_msg = f"Steam API returned status {games_response.status_code}"
-            if games_response.status_code == 429:
-                error_msg = "Steam API rate limit exceeded. Please wait a few minutes and try again."
-            elif games_response.status_code == 401:
-                error_msg = "Steam API key invalid or expired. Please check your API key."
-            elif games_response.status_code == 403:
-                error_msg = "Access forbidden. Your Steam profile may be private."
-            return jsonify({'error': error_msg}), 400
-        
-        try:
-            games_data = games_response.json()
-        except ValueError as e:
-            return jsonify({'error': f'Invalid response from Steam API: {str(e)}'}), 400
-        
-        steam_games = games_data.get('response', {}).get('games', [])
-        
-        if not steam_games:
-            return jsonify({'error': 'No games found in your Steam library.'}), 400
-        
-        conn = get_db()
         cur = conn.cursor()
         
         cur.execute('SELECT steam_app_id, game_imported, achievements_imported FROM steam_import_status')
@@ -893,143 +3638,162 @@ def import_steam_library():
         cur.execute('SELECT steam_app_id FROM steam_import_status WHERE error_message = "User excluded this game"')
         excluded_app_ids = set(row['steam_app_id'] for row in cur.fetchall())
         
-        imported_count = 0
-        skipped_count = 0
-        resumed_count = 0
-        achievements_imported = 0
-        achievements_failed = 0
-        games_with_achievements = 0
+        # Kept on the job so a cancelled import still reports what it did
+        counts = job.result = {
+            'success': True,
+            'imported': 0,
+            'resumed': 0,
+            'skipped': 0,
+            'achievements_imported': 0,
+            'achievements_failed': 0,
+            'games_with_achievements': 0,
+            'imported_achievements': import_achievements
+        }
         
         steam_games.sort(key=lambda x: x.get('playtime_forever', 0), reverse=True)
+        job.update(processed=0, total=len(steam_games), message='Importing games', force=True)
         
-        MAX_GAMES_TO_IMPORT = 20 if import_achievements else 1000
-        if len(steam_games) > MAX_GAMES_TO_IMPORT:
-            steam_games = steam_games[:MAX_GAMES_TO_IMPORT]
-        
-        for i, game in enumerate(steam_games):
-            app_id = game.get('appid')
-            title = game.get('name', f'App {app_id}')
+        # app_id -> game_id of games whose achievements still need importing
+        pending_achievements = {}
+        achievements_status = 0 if import_achievements else 1
 
-            if app_id in excluded_app_ids:
-                skipped_count += 1
-                logger.info(f"Skipping excluded game: {title} (app_id: {app_id})")
-                continue
-            
-            status = import_status.get(app_id)
-            
-            if status and status['game_imported'] == 1 and (not import_achievements or status['achievements_imported'] == 1):
-                skipped_count += 1
-                continue
-            
-            if app_id in existing_app_ids and (not status or status['game_imported'] == 0):
-                cur.execute(
-                    'INSERT OR REPLACE INTO steam_import_status (steam_app_id, game_imported, achievements_imported) VALUES (?, 1, ?)',
-                    (app_id, 1 if not import_achievements else 0)
-                )
-                skipped_count += 1
-                continue
-            
-            if not status or status['game_imported'] == 0:
-                hours_played = round(game.get('playtime_forever', 0) / 60, 1) if game.get('playtime_forever', 0) > 0 else None
-                cover_url = f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg"
-                
-                cur.execute(
-                    """INSERT INTO games (title, platform, status, hours_played, steam_app_id, cover_url, rating, completion_date) 
-                       VALUES (?,?,?,?,?,?,?,?)""",
-                    (title, 'PC', 'Playing', hours_played, app_id, cover_url, None, None)
-                )
-                game_id = cur.lastrowid
-                
-                achievements_status = 1 if not import_achievements else 0
-                cur.execute(
-                    'INSERT OR REPLACE INTO steam_import_status (steam_app_id, game_imported, achievements_imported) VALUES (?, 1, ?)',
-                    (app_id, achievements_status)
-                )
-                imported_count += 1
-            else:
-                game_id = cur.execute('SELECT id FROM games WHERE steam_app_id = ?', (app_id,)).fetchone()['id']
-                if import_achievements:
-                    resumed_count += 1
-            
-            if import_achievements and app_id and (not status or status['achievements_imported'] == 0):
-                try:
-                    steam_achievements = get_steam_achievements(app_id)
-                    if steam_achievements and len(steam_achievements) > 0:
-                        games_with_achievements += 1
-                        
-                        cur.execute('DELETE FROM achievements WHERE game_id = ?', (game_id,))
-                        
-                        for ach in steam_achievements:
-                            try:
-                                cur.execute(
-                                    'INSERT INTO achievements (game_id, title, description, date, unlocked, icon_url) VALUES (?,?,?,?,?,?)',
-                                    (game_id, ach.get('name'), ach.get('description'), 
-                                     ach.get('unlock_date'), ach.get('achieved', 0), ach.get('icon'))
-                                )
-                            except Exception:
-                                continue
-                        
-                        achievements_imported += len(steam_achievements)
+        # One transaction per chunk of games: rows go in with executemany, then
+        # progress is reported between transactions
+        for start in range(0, len(steam_games), BULK_WRITE_CHUNK_SIZE):
+            job.update(processed=start)
+            new_games = []
+            status_rows = []
+            pending_app_ids = []
+
+            for game in steam_games[start:start + BULK_WRITE_CHUNK_SIZE]:
+                app_id = game.get('appid')
+                title = game.get('name', f'App {app_id}')
+
+                if app_id in excluded_app_ids:
+                    counts['skipped'] += 1
+                    logger.info(f"Skipping excluded game: {title} (app_id: {app_id})")
+                    continue
+
+                status = import_status.get(app_id)
+
+                if status and status['game_imported'] == 1 and (not import_achievements or status['achievements_imported'] == 1):
+                    counts['skipped'] += 1
+                    continue
+
+                if app_id in existing_app_ids and (not status or status['game_imported'] == 0):
+                    status_rows.append((app_id, achievements_status))
+                    counts['skipped'] += 1
+                    continue
+
+                if not status or status['game_imported'] == 0:
+                    hours_played = round(game.get('playtime_forever', 0) / 60, 1) if game.get('playtime_forever', 0) > 0 else None
+                    cover_url = f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg"
+                    new_games.append((title, 'PC', 'Playing', hours_played, app_id, cover_url, None, None))
+                    status_rows.append((app_id, achievements_status))
+                    counts['imported'] += 1
+                elif import_achievements:
+                    counts['resumed'] += 1
+
+                if import_achievements and app_id and (not status or status['achievements_imported'] == 0):
+                    # Fetched in parallel once every game row exists
+                    pending_app_ids.append(app_id)
+
+            bulk_insert(cur, 'games', ('title', 'platform', 'status', 'hours_played', 'steam_app_id',
+                                       'cover_url', 'rating', 'completion_date'), new_games)
+            bulk_insert(cur, 'steam_import_status', ('steam_app_id', 'game_imported', 'achievements_imported'),
+                        ((app_id, 1, achievements) for app_id, achievements in status_rows), or_clause='OR REPLACE')
+            pending_achievements.update(lookup_game_ids(cur, pending_app_ids))
+            conn.commit()
+
+        total = len(steam_games) + len(pending_achievements)
+        job.update(processed=len(steam_games), total=total, message='Importing achievements', force=True)
+        
+        # Fetch concurrently within the shared Steam rate budget; all writes stay on this
+        # thread, one transaction per batch of finished fetches
+        done = 0
+        with closing(fetch_steam_achievements_bulk(pending_achievements)) as batches:
+            for batch in batches:
+                for app_id, steam_achievements, error in batch:
+                    game_id = pending_achievements[app_id]
+                    
+                    if error is not None:
+                        counts['achievements_failed'] += 1
+                        job.errors += 1
+                        cur.execute(
+                            'UPDATE steam_import_status SET error_message = ? WHERE steam_app_id = ?',
+                            (str(error), app_id)
+                        )
+                    elif steam_achievements:
+                        counts['games_with_achievements'] += 1
+                        sync_game_achievements(cur, game_id, steam_achievements)
+                        counts['achievements_imported'] += len(steam_achievements)
                         cur.execute(
                             'UPDATE steam_import_status SET achievements_imported = 1 WHERE steam_app_id = ?',
                             (app_id,)
                         )
                     else:
-                        achievements_failed += 1
+                        counts['achievements_failed'] += 1
                         cur.execute(
                             'UPDATE steam_import_status SET achievements_imported = 1 WHERE steam_app_id = ?',
                             (app_id,)
                         )
-                except Exception as e:
-                    achievements_failed += 1
-                    cur.execute(
-                        'UPDATE steam_import_status SET error_message = ? WHERE steam_app_id = ?',
-                        (str(e), app_id)
-                    )
-            elif not import_achievements:
-                cur.execute(
-                    'UPDATE steam_import_status SET achievements_imported = 1 WHERE steam_app_id = ?',
-                    (app_id,)
-                )
-            
-            conn.commit()
-            
-            if import_achievements and i < len(steam_games) - 1:
-                time.sleep(1)
-        
-        conn.close()
-        
-        message = f'Import completed: {imported_count} new games'
-        if resumed_count > 0:
-            message += f', {resumed_count} resumed'
-        if skipped_count > 0:
-            message += f', {skipped_count} skipped'
-        if import_achievements and achievements_imported > 0:
-            message += f' - {achievements_imported} achievements from {games_with_achievements} games'
-        if import_achievements and achievements_failed > 0:
-            message += f' - {achievements_failed} games had no achievements'
+                
+                conn.commit()
+                done += len(batch)
+                job.update(processed=len(steam_games) + done)
         
-        return jsonify({
-            'success': True,
-            'imported': imported_count,
-            'resumed': resumed_count,
-            'skipped': skipped_count,
-            'achievements_imported': achievements_imported,
-            'achievements_failed': achievements_failed,
-            'imported_achievements': import_achievements,
-            'message': message
-        })
+        job.update(processed=total, force=True)
+    finally:
+        conn.close()
+        # Games committed so far are new data, even if the job was cancelled or failed
+        data_version.bump()
+        response_cache.invalidate('games', 'stats')
     
-    except requests.exceptions.Timeout:
-        return jsonify({'error': 'Steam API request timed out. Please try again later.'}), 408
-    except requests.exceptions.ConnectionError:
-        return jsonify({'error': 'Cannot connect to Steam API. Please check your internet connection.'}), 503
+    message = f'Import completed: {counts["imported"]} new games'
+    if counts['resumed'] > 0:
+        message += f', {counts["resumed"]} resumed'
+    if counts['skipped'] > 0:
+        message += f', {counts["skipped"]} skipped'
+    if import_achievements and counts['achievements_imported'] > 0:
+        message += f' - {counts["achievements_imported"]} achievements from {counts["games_with_achievements"]} games'
+    if import_achievements and counts['achievements_failed'] > 0:
+        message += f' - {counts["achievements_failed"]} games had no achievements'
+    
+    counts['message'] = message
+    job.message = message
+    return counts
+
+@app.route('/api/steam/import-library', methods=['POST'])
+@login_required
+def import_steam_library():
+    """Start a Steam library import as a background job; poll /api/jobs/<id> for progress"""
+    if not STEAM_API_KEY or not STEAM_USER_ID:
+        return jsonify({'error': 'Steam API not configured. Please check your .env file.'}), 400
+    
+    import_achievements = False
+    
+    try:
+        if request.is_json:
+            data = request.get_json() or {}
+            import_achievements = data.get('import_achievements', False)
+        else:
+            import_achievements = request.form.get('import_achievements', 'false').lower() == 'true'
     except Exception as e:
-        logger.error(f'Unexpected error in import_steam_library: {str(e)}')
-        logger.error(traceback.format_exc())
-        return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
+        logger.error(f"Error parsing request data: {e}")
+    
+    # Only one import at a time - hand back the running one instead
+    active_job = find_active_job('steam_import')
+    if active_job:
+        return jsonify({'success': True, 'job_id': active_job['id'], 'already_running': True, 'job': active_job}), 202
+    
+    job_id = start_background_job('steam_import', {'import_achievements': bool(import_achievements)},
+                                  run_steam_import_job)
+    
+    return jsonify({'success': True, 'job_id': job_id, 'already_running': False, 'job': get_job(job_id)}), 202
 
 @app.route('/api/top10', methods=['GET', 'POST', 'PUT'])
+@conditional_response
+@cached_response('top10')
 def api_top10():
     if request.method == 'GET':
         conn = get_db()
@@ -1043,7 +3807,7 @@ def api_top10():
         ''')
         rows = [dict(r) for r in cur.fetchall()]
         conn.close()
-        return jsonify(rows)
+        return jsonify(mirror_covers(rows))
     
     elif request.method == 'POST':
         if not session.get('logged_in'):
@@ -1063,6 +3827,7 @@ def api_top10():
         
         conn.commit()
         conn.close()
+        response_cache.invalidate('top10')
         return jsonify({'success': True})
     
     elif request.method == 'PUT':
@@ -1080,6 +3845,7 @@ def api_top10():
         
         conn.commit()
         conn.close()
+        response_cache.invalidate('top10')
         return jsonify({'success': True})
 
 @app.route('/api/top10/<int:game_id>', methods=['DELETE'])
@@ -1090,6 +3856,7 @@ def api_delete_top10(game_id):
     cur.execute('DELETE FROM top10_games WHERE game_id=?', (game_id,))
     conn.commit()
     conn.close()
+    response_cache.invalidate('top10')
     return jsonify({'success': True})
 
 @app.route('/api/excluded-games', methods=['GET'])
@@ -1134,33 +3901,128 @@ def remove_from_excluded(app_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
-@app.route('/api/games')
-def api_games():
-    conn = None
+# /api/games list order. The COALESCEs match idx_games_list_order and give
+# NULLs a fixed place, so keyset cursors compare cleanly.
+GAME_LIST_ORDER = "COALESCE(g.is_favorite, 0) DESC, COALESCE(g.created_at, '') DESC, g.id ASC"
+GAME_LIST_MAX_LIMIT = 500
+GAME_COLUMNS = ('id', 'title', 'platform', 'status', 'notes', 'rating', 'hours_played', 'steam_app_id',
+                'cover_url', 'completion_date', 'created_at', 'is_favorite')
+GAME_ACHIEVEMENT_FIELDS = ('unlocked_achievements', 'total_achievements', 'completion_percentage',
+                           'achievement_progress')
+# Added by mirror_covers() alongside cover_url
+GAME_COVER_FIELDS = ('cover_source_url', 'cover_srcset')
+GAME_FIELDS = set(GAME_COLUMNS + GAME_ACHIEVEMENT_FIELDS + GAME_COVER_FIELDS + ('tags',))
+
+def encode_game_cursor(game):
+    key = [game['is_favorite'] or 0, game['created_at'] or '', game['id']]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def decode_game_cursor(cursor):
+    """Inverse of encode_game_cursor(); raises ValueError for anything it didn't produce"""
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        
-        cur.execute('''
-            SELECT g.*, 
-                   COUNT(CASE WHEN a.unlocked=1 THEN 1 END) as unlocked_achievements,
-                   COUNT(a.id) as total_achievements,
-                   CASE 
-                     WHEN COUNT(a.id) > 0 THEN 
-                       ROUND((COUNT(CASE WHEN a.unlocked=1 THEN 1 END) * 100.0 / COUNT(a.id)), 1)
-                     ELSE 0 
-                   END as completion_percentage
-            FROM games g
-            LEFT JOIN achievements a ON g.id = a.game_id
-            GROUP BY g.id
-            ORDER BY g.is_favorite DESC, g.created_at DESC
+        is_favorite, created_at, game_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not (isinstance(is_favorite, int) and isinstance(created_at, str) and isinstance(game_id, int)):
+        raise ValueError('Invalid cursor')
+    return is_favorite, created_at, game_id
+
+def parse_game_fields(value):
+    """The set of fields requested with ?fields=, or None for all of them"""
+    if not value:
+        return None
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = fields - GAME_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields | {'id'}
+
+def query_games(cur, fields=None, status=None, platform=None, search='', favorite=None, cursor=None, limit=None):
+    """
+    The rows behind /api/games, favorites first and then newest first, with
+    tags and achievement progress attached when they are wanted. fields is
+    a set from parse_game_fields() or None for everything; favorite is
+    True/False to keep only (non-)favorites; cursor is a decoded keyset cursor. Returns (rows, next_cursor); next_cursor is None
+    on the last page and whenever limit is None.
+    """
+    wants = (lambda name: True) if fields is None else fields.__contains__
+    wants_cover = any(wants(name) for name in ('cover_url',) + GAME_COVER_FIELDS)
+    
+    # The cursor needs is_favorite and created_at even when they aren't returned,
+    # and the mirrored cover fields are derived from cover_url
+    columns = [f'g.{column}' for column in GAME_COLUMNS
+               if wants(column) or column in ('is_favorite', 'created_at')
+               or (column == 'cover_url' and wants_cover)]
+    joins = ''
+    if any(wants(name) for name in GAME_ACHIEVEMENT_FIELDS):
+        # Achievement counts come pre-aggregated from game_achievement_stats
+        # instead of grouping the full games x achievements join
+        columns.append('''
+            COALESCE(a.unlocked, 0) as unlocked_achievements,
+            COALESCE(a.total, 0) as total_achievements,
+            CASE
+              WHEN a.total > 0 THEN ROUND((a.unlocked * 100.0 / a.total), 1)
+              ELSE 0
+            END as completion_percentage
         ''')
-        rows = [dict(r) for r in cur.fetchall()]
+        joins = 'LEFT JOIN game_achievement_stats a ON g.id = a.game_id'
+    
+    where = []
+    params = []
+    for column, value in (('status', status), ('platform', platform)):
+        if value:
+            where.append(f'g.{column} = ?')
+            params.append(value)
+    if favorite is not None:
+        where.append('COALESCE(g.is_favorite, 0) = ?')
+        params.append(int(favorite))
+    
+    search = (search or '').strip().lower()
+    if search:
+        # SQLite's lower() only folds ASCII, so non-ASCII titles match case-sensitively
+        where.append('''(
+            instr(lower(g.title), ?) > 0
+            OR instr(lower(COALESCE(g.notes, '')), ?) > 0
+            OR EXISTS (SELECT 1 FROM tags t WHERE t.game_id = g.id AND instr(lower(t.tag), ?) > 0)
+        )''')
+        params.extend([search] * 3)
+    
+    if cursor:
+        where.append('''(
+            COALESCE(g.is_favorite, 0) < ?
+            OR (COALESCE(g.is_favorite, 0) = ? AND COALESCE(g.created_at, '') < ?)
+            OR (COALESCE(g.is_favorite, 0) = ? AND COALESCE(g.created_at, '') = ? AND g.id > ?)
+        )''')
+        is_favorite, created_at, game_id = cursor
+        params.extend([is_favorite, is_favorite, created_at, is_favorite, created_at, game_id])
+    
+    sql = f"SELECT {', '.join(columns)} FROM games g {joins}"
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += f' ORDER BY {GAME_LIST_ORDER}'
+    if limit is not None:
+        # One extra row tells whether there is a next page
+        sql += ' LIMIT ?'
+        params.append(limit + 1)
+    
+    cur.execute(sql, params)
+    rows = [dict(r) for r in cur.fetchall()]
+    
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_game_cursor(rows[-1])
+    
+    if wants('tags'):
+        # One query for the tags of every returned game instead of one per game
+        paged = limit is not None or where
+        tags_by_game = get_tags_by_game(cur, [game['id'] for game in rows] if paged else None)
+    
+    for game in rows:
+        if wants('tags'):
+            game['tags'] = tags_by_game.get(game['id'], [])
         
-        for game in rows:
-            cur.execute('SELECT tag FROM tags WHERE game_id=?', (game['id'],))
-            game['tags'] = [r['tag'] for r in cur.fetchall()]
-            
+        if wants('achievement_progress'):
             if game['total_achievements'] > 0:
                 game['achievement_progress'] = {
                     'unlocked_achievements': game['unlocked_achievements'],
@@ -1169,13 +4031,67 @@ def api_games():
                 }
             else:
                 game['achievement_progress'] = None
+    
+    return rows, next_cursor
+
+@app.route('/api/games')
+@conditional_response
+@cached_response('games')
+def api_games():
+    """
+    List games, favorites first and then newest first.
+    Query parameters, all optional:
+      status, platform - exact match, like the client's filter dropdowns
+      search           - case-insensitive match on title, notes or any tag
+      favorite         - 1 for favorites only, 0 for everything else
+      fields           - comma-separated fields to return (id is always included)
+      limit, cursor    - keyset pagination; the response becomes
+                         {"games": [...], "next_cursor": ...} and next_cursor
+                         is passed back as cursor for the following page
+    Without limit every matching game is returned as a plain array.
+    """
+    try:
+        fields = parse_game_fields(request.args.get('fields'))
+        limit = request.args.get('limit')
+        if limit is not None:
+            limit = int(limit)
+            if not 1 <= limit <= GAME_LIST_MAX_LIMIT:
+                raise ValueError(f'limit must be between 1 and {GAME_LIST_MAX_LIMIT}')
+        cursor = request.args.get('cursor')
+        cursor = decode_game_cursor(cursor) if cursor else None
+        favorite = request.args.get('favorite')
+        if favorite is not None:
+            if favorite not in ('0', '1'):
+                raise ValueError('favorite must be 0 or 1')
+            favorite = favorite == '1'
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = None
+    try:
+        conn = get_db()
+        rows, next_cursor = query_games(conn.cursor(), fields, request.args.get('status'),
+                                        request.args.get('platform'), request.args.get('search', ''),
+                                        favorite, cursor, limit)
         
-        return jsonify(rows)
+        if fields is None or any(name in fields for name in ('cover_url',) + GAME_COVER_FIELDS):
+            mirror_covers(rows)
+        
+        if fields is not None:
+            # cover_url brings its mirror fields along; each can also be asked for on its own
+            rows = [{key: value for key, value in game.items()
+                     if key in fields or (key in GAME_COVER_FIELDS and 'cover_url' in fields)}
+                    for game in rows]
+        
+        if limit is None:
+            return jsonify(rows)
+        return jsonify({'games': rows, 'next_cursor': next_cursor})
     finally:
         if conn:
             conn.close()
 
 @app.route('/api/games/<int:game_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional_response
 def api_game(game_id):
     if request.method in ['PUT', 'DELETE'] and not session.get('logged_in'):
         return jsonify({'error': 'Authentication required'}), 401
@@ -1191,6 +4107,7 @@ def api_game(game_id):
             cur.execute('SELECT tag FROM tags WHERE game_id=?', (game_id,))
             game['tags'] = [r['tag'] for r in cur.fetchall()]
             conn.close()
+            mirror_covers([game])
             return jsonify(game)
         conn.close()
         return ('', 404)
@@ -1207,12 +4124,11 @@ def api_game(game_id):
              data.get('completion_date'), game_id)
         )
         
-        cur.execute('DELETE FROM tags WHERE game_id=?', (game_id,))
-        for tag in data.get('tags', []):
-            cur.execute('INSERT INTO tags (game_id, tag) VALUES (?,?)', (game_id, tag))
-        
+        replace_game_tags(cur, game_id, data.get('tags', []))
+
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats', 'top10', 'completionist')
         return ('', 204)
     
     else:  # DELETE
@@ -1231,9 +4147,11 @@ def api_game(game_id):
         cur.execute('DELETE FROM games WHERE id=?', (game_id,))
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats', 'top10', 'completionist')
         return ('', 204)
 
 @app.route('/api/games/<int:game_id>/achievements', methods=['GET', 'POST'])
+@conditional_response
 def api_achievements(game_id):
     if request.method == 'POST' and not session.get('logged_in'):
         return jsonify({'error': 'Authentication required'}), 401
@@ -1251,6 +4169,7 @@ def api_achievements(game_id):
         conn.commit()
         new_id = cur.lastrowid
         conn.close()
+        response_cache.invalidate('games', 'stats')
         return jsonify({'id': new_id}), 201
     else:
         cur.execute('SELECT * FROM achievements WHERE game_id=? ORDER BY date DESC, id DESC', (game_id,))
@@ -1272,13 +4191,55 @@ def api_achievement(game_id, ach_id):
         )
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats')
         return ('', 204)
     else:  # DELETE
         cur.execute('DELETE FROM achievements WHERE id=? AND game_id=?', (ach_id, game_id))
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats')
         return ('', 204)
 
+@app.route('/api/games/<int:game_id>/achievements/sync', methods=['POST'])
+@login_required
+def sync_achievements_from_steam(game_id):
+    """
+    Sync a game's achievements from Steam in one transaction and return the new list.
+    Uses the game's steam_app_id unless the body gives {"steam_app_id": ...}.
+    """
+    if not STEAM_API_KEY:
+        return jsonify({'error': 'Steam API not configured'}), 400
+
+    conn = get_db()
+    cur = conn.cursor()
+
+    cur.execute('SELECT steam_app_id FROM games WHERE id=?', (game_id,))
+    game = cur.fetchone()
+    if not game:
+        conn.close()
+        return jsonify({'error': 'Game not found'}), 404
+
+    app_id = (request.get_json(silent=True) or {}).get('steam_app_id') or game['steam_app_id']
+    if not app_id:
+        conn.close()
+        return jsonify({'error': 'Game has no Steam App ID'}), 400
+
+    # Fetch before writing: the schema cache commits on its own connection
+    steam_achievements = get_steam_achievements(app_id)
+    if not steam_achievements:
+        conn.close()
+        return jsonify({'error': 'No achievements found for this game on Steam'}), 404
+
+    changes = sync_game_achievements(cur, game_id, steam_achievements)
+    conn.commit()
+
+    cur.execute('SELECT * FROM achievements WHERE game_id=? ORDER BY date DESC, id DESC', (game_id,))
+    achievements = [dict(r) for r in cur.fetchall()]
+    conn.close()
+    response_cache.invalidate('games', 'stats')
+
+    return jsonify({'success': True, 'changes': changes, 'achievements': achievements})
+
 @app.route('/api/steam/search')
 def steam_search():
     query = request.args.get('q', '')
@@ -1320,68 +4281,41 @@ def update_game_from_steam(game_id):
         
         hours_played = None
         if STEAM_USER_ID:
-            games_url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1"
-            games_response = steam_api_call_with_rate_limit(games_url)
+            try:
+                steam_game = steam_owned_games.get_game(app_id)
+            except SteamAPIError:
+                steam_game = None
             
-            if games_response.status_code == 200:
-                games_data = games_response.json()
-                for steam_game in games_data.get('response', {}).get('games', []):
-                    if steam_game.get('appid') == app_id:
-                        playtime_minutes = steam_game.get('playtime_forever', 0)
-                        hours_played = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else None
-                        break
+            if steam_game:
+                playtime_minutes = steam_game.get('playtime_forever', 0)
+                hours_played = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else None
+        
+        # Fetch before writing: the schema cache commits on its own connection
+        steam_achievements = get_steam_achievements(app_id)
         
         if hours_played is not None:
             cur.execute('UPDATE games SET hours_played=? WHERE id=?', (hours_played, game_id))
         
         achievements_updated = 0
+        achievement_changes = None
         all_achievements_unlocked = False
         completion_date = None
         
-        steam_achievements = get_steam_achievements(app_id)
         if steam_achievements and len(steam_achievements) > 0:
-            cur.execute('DELETE FROM achievements WHERE game_id=?', (game_id,))
-            
-            achievement_dates = []
-            
-            for ach in steam_achievements:
-                unlock_date = ach.get('unlock_date')
-                if unlock_date:
-                    achievement_dates.append(unlock_date)
-                
-                cur.execute(
-                    'INSERT INTO achievements (game_id, title, description, date, unlocked, icon_url) VALUES (?,?,?,?,?,?)',
-                    (game_id, ach.get('name'), ach.get('description'), 
-                     unlock_date, ach.get('achieved', 0), ach.get('icon'))
-                )
-            
+            achievement_changes = sync_game_achievements(cur, game_id, steam_achievements)
             achievements_updated = len(steam_achievements)
-            
-            unlocked_count = sum(1 for ach in steam_achievements if ach.get('achieved', 0))
-            if unlocked_count == len(steam_achievements) and len(steam_achievements) > 0:
-                all_achievements_unlocked = True
-                
-                if achievement_dates:
-                    try:
-                        date_objects = [datetime.strptime(date, '%Y-%m-%d') for date in achievement_dates if date]
-                        if date_objects:
-                            latest_date = max(date_objects)
-                            completion_date = latest_date.strftime('%Y-%m-%d')
-                    except Exception:
-                        completion_date = datetime.now().strftime('%Y-%m-%d')
-                else:
-                    completion_date = datetime.now().strftime('%Y-%m-%d')
-                
-                cur.execute('UPDATE games SET status=?, completion_date=? WHERE id=?', 
-                           ('Completed', completion_date, game_id))
+            all_achievements_unlocked, completion_date = mark_completed_if_all_unlocked(
+                cur, game_id, steam_achievements)
         
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats', 'top10')
         
         return jsonify({
             'success': True,
             'hours_updated': hours_played is not None,
             'achievements_updated': achievements_updated,
+            'achievement_changes': achievement_changes,
             'all_achievements_unlocked': all_achievements_unlocked,
             'completion_date': completion_date,
             'message': f'Updated {game["title"]} from Steam'
@@ -1391,13 +4325,78 @@ def update_game_from_steam(game_id):
         traceback.print_exc()
         return jsonify({'error': f'Update failed: {str(e)}'}), 500
 
+def run_steam_achievements_refresh_job(job, params):
+    """
+    Background job: refresh achievements for every Steam game, fetching many
+    games concurrently within the shared Steam rate budget.
+    """
+    conn = get_db()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT id, steam_app_id FROM games WHERE steam_app_id IS NOT NULL')
+        game_ids_by_app = {}
+        for row in cur.fetchall():
+            game_ids_by_app.setdefault(row['steam_app_id'], []).append(row['id'])
+        
+        counts = job.result = {
+            'success': True,
+            'games_updated': 0,
+            'achievements_updated': 0,
+            'achievement_changes': {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0},
+            'games_completed': 0,
+            'games_without_achievements': 0
+        }
+        job.update(processed=0, total=len(game_ids_by_app), message='Refreshing achievements', force=True)
+
+        done = 0
+        with closing(fetch_steam_achievements_bulk(game_ids_by_app)) as batches:
+            for batch in batches:
+                for app_id, steam_achievements, error in batch:
+                    if error is not None:
+                        job.errors += 1
+                        logger.error(f"Error refreshing achievements for app {app_id}: {error}")
+                    elif steam_achievements:
+                        for game_id in game_ids_by_app[app_id]:
+                            changes = sync_game_achievements(cur, game_id, steam_achievements)
+                            all_unlocked, _ = mark_completed_if_all_unlocked(cur, game_id, steam_achievements)
+                            counts['games_updated'] += 1
+                            counts['achievements_updated'] += len(steam_achievements)
+                            for key, value in changes.items():
+                                counts['achievement_changes'][key] += value
+                            counts['games_completed'] += 1 if all_unlocked else 0
+                    else:
+                        counts['games_without_achievements'] += 1
+                
+                conn.commit()
+                done += len(batch)
+                job.update(processed=done)
+        
+        job.update(processed=len(game_ids_by_app), force=True)
+    finally:
+        conn.close()
+        data_version.bump()
+        response_cache.invalidate('games', 'stats', 'top10')
+    
+    changes = counts['achievement_changes']
+    counts['message'] = (f"Synced {counts['achievements_updated']} achievements "
+                         f"across {counts['games_updated']} games from Steam: "
+                         f"{changes['added']} added, {changes['updated']} updated, {changes['removed']} removed")
+    job.message = counts['message']
+    return counts
+
 @app.route('/api/steam/update-all-games', methods=['POST'])
 @login_required
 def update_all_games_from_steam():
-    """Update all Steam games with current data"""
+    """
+    Update all Steam games with current data.
+    Hours are updated in the request; with {"include_achievements": true} an
+    achievements refresh is also started as a background job.
+    """
     if not STEAM_API_KEY or not STEAM_USER_ID:
         return jsonify({'error': 'Steam API not configured'}), 400
     
+    include_achievements = bool((request.get_json(silent=True) or {}).get('include_achievements'))
+    
     conn = None
     try:
         conn = get_db()
@@ -1410,18 +4409,11 @@ def update_all_games_from_steam():
             conn.close()
             return jsonify({'error': 'No Steam games found'}), 400
         
-        games_url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/?key={STEAM_API_KEY}&steamid={STEAM_USER_ID}&include_appinfo=1"
-        
         try:
-            games_response = steam_api_call_with_rate_limit(games_url)
-            
-            if games_response.status_code != 200:
-                conn.close()
-                return jsonify({'error': f'Steam API returned status {games_response.status_code}'}), 500
-            
-            games_data = games_response.json()
-            steam_library = {game['appid']: game for game in games_data.get('response', {}).get('games', [])}
-            
+            steam_library = steam_owned_games.get()
+        except SteamAPIError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 500
         except requests.exceptions.Timeout:
             if conn:
                 conn.close()
@@ -1431,35 +4423,39 @@ def update_all_games_from_steam():
                 conn.close()
             return jsonify({'error': 'Cannot connect to Steam API'}), 503
         
-        updated_count = 0
-        hours_updated = 0
-        
+        updates = []
         for game in steam_games:
-            app_id = game['steam_app_id']
-            steam_game = steam_library.get(app_id)
-            
-            if not steam_game:
-                continue
-            
-            try:
+            steam_game = steam_library.get(game['steam_app_id'])
+            if steam_game:
                 playtime_minutes = steam_game.get('playtime_forever', 0)
                 hours_played = round(playtime_minutes / 60, 1) if playtime_minutes > 0 else 0
-                
-                cur.execute('UPDATE games SET hours_played=? WHERE id=?', (hours_played, game['id']))
-                hours_updated += 1
-                updated_count += 1
-            except Exception:
-                continue
-        
+                updates.append((hours_played, game['id']))
+
+        for chunk in chunked(updates):
+            cur.executemany('UPDATE games SET hours_played=? WHERE id=?', chunk)
+        updated_count = hours_updated = len(updates)
+
         conn.commit()
         conn.close()
+        response_cache.invalidate('games', 'stats', 'top10')
         
-        return jsonify({
+        result = {
             'success': True,
             'games_updated': updated_count,
             'hours_updated': hours_updated,
             'message': f'Updated hours for {hours_updated} games from Steam'
-        })
+        }
+        
+        if include_achievements:
+            active_job = find_active_job('steam_achievements_refresh')
+            if active_job:
+                result['achievements_job_id'] = active_job['id']
+            else:
+                result['achievements_job_id'] = start_background_job(
+                    'steam_achievements_refresh', {}, run_steam_achievements_refresh_job)
+            result['message'] += ' - achievements are refreshing in the background'
+        
+        return jsonify(result)
         
     except Exception as e:
         traceback.print_exc()
@@ -1538,6 +4534,7 @@ def api_batch_update_status():
     
     conn.commit()
     conn.close()
+    response_cache.invalidate('games', 'stats', 'top10')
     
     return jsonify({'success': True, 'updated': len(game_ids)})
 
@@ -1558,63 +4555,25 @@ def api_batch_delete():
     
     conn.commit()
     conn.close()
+    response_cache.invalidate('games', 'stats', 'top10', 'completionist')
     
     return jsonify({'success': True, 'deleted': len(game_ids)})
 
 @app.route('/api/stats')
+@conditional_response
+@cached_response('stats')
 def api_stats():
     conn = None
     try:
         conn = get_db()
         cur = conn.cursor()
         
-        cur.execute('SELECT COUNT(*) as total FROM games')
-        total = cur.fetchone()['total']
-        
-        cur.execute("SELECT COUNT(*) as completed FROM games WHERE status='Completed'")
-        completed = cur.fetchone()['completed']
-        
-        cur.execute('SELECT SUM(hours_played) as total_hours FROM games')
-        total_hours = cur.fetchone()['total_hours'] or 0
-        
-        cur.execute('SELECT COUNT(*) as total_achievements FROM achievements WHERE unlocked=1')
-        achievements_unlocked = cur.fetchone()['total_achievements']
-        
-        cur.execute('SELECT COUNT(*) as total_achievements FROM achievements')
-        achievements_total = cur.fetchone()['total_achievements']
-        
-        cur.execute('''
-            SELECT g.id, g.title, 
-                   COUNT(CASE WHEN a.unlocked=1 THEN 1 END) as unlocked_achievements,
-                   COUNT(a.id) as total_achievements,
-                   CASE 
-                     WHEN COUNT(a.id) > 0 THEN 
-                       ROUND((COUNT(CASE WHEN a.unlocked=1 THEN 1 END) * 100.0 / COUNT(a.id)), 1)
-                     ELSE 0 
-                   END as completion_percentage
-            FROM games g
-            LEFT JOIN achievements a ON g.id = a.game_id
-            GROUP BY g.id
-            HAVING total_achievements > 0
-            ORDER BY completion_percentage DESC, total_achievements DESC
-        ''')
-        achievement_progress = [dict(r) for r in cur.fetchall()]
-        
-        cur.execute('''
-            SELECT status, COUNT(*) as count FROM games 
-            WHERE status IS NOT NULL AND status != ''
-            GROUP BY status
-            ORDER BY count DESC
-        ''')
-        status_breakdown = {row['status']: row['count'] for row in cur.fetchall()}
-        
-        cur.execute('''
-            SELECT platform, COUNT(*) as count FROM games 
-            WHERE platform IS NOT NULL AND platform != ''
-            GROUP BY platform
-            ORDER BY count DESC
-        ''')
-        platform_breakdown = {row['platform']: row['count'] for row in cur.fetchall()}
+        # Aggregates come from the trigger-maintained summary tables
+        stats = read_stats_summary(cur)
+        total = stats['total_games']
+        completed = stats['completed_games']
+        total_hours = stats['total_hours']
+        avg_rating = stats['avg_rating']
         
         cur.execute('''
             SELECT id, title, cover_url, completion_date, hours_played, rating 
@@ -1623,10 +4582,7 @@ def api_stats():
             ORDER BY completion_date DESC
             LIMIT 5
         ''')
-        recent_completions = [dict(r) for r in cur.fetchall()]
-        
-        cur.execute('SELECT AVG(rating) as avg_rating FROM games WHERE rating IS NOT NULL')
-        avg_rating = cur.fetchone()['avg_rating']
+        recent_completions = mirror_covers([dict(r) for r in cur.fetchall()])
         
         cur.execute('''
             SELECT title, hours_played 
@@ -1637,18 +4593,6 @@ def api_stats():
         ''')
         most_played = cur.fetchone()
         
-        cur.execute('''
-            SELECT 
-                SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END) as five_star,
-                SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END) as four_star,
-                SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END) as three_star,
-                SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END) as two_star,
-                SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END) as one_star,
-                SUM(CASE WHEN rating IS NULL THEN 1 ELSE 0 END) as unrated
-            FROM games
-        ''')
-        rating_distribution = dict(cur.fetchone())
-        
         completion_rate = round((completed / total * 100), 1) if total > 0 else 0
         avg_hours_per_game = round(total_hours / total, 1) if total > 0 else 0
         
@@ -1661,15 +4605,15 @@ def api_stats():
             'completion_rate': completion_rate,
             'total_hours': round(total_hours, 1),
             'avg_hours_per_game': avg_hours_per_game,
-            'achievements_unlocked': achievements_unlocked,
-            'achievements_total': achievements_total,
-            'achievement_progress': achievement_progress,
-            'status_breakdown': status_breakdown,
-            'platform_breakdown': platform_breakdown,
+            'achievements_unlocked': stats['achievements_unlocked'],
+            'achievements_total': stats['achievements_total'],
+            'achievement_progress': stats['achievement_progress'],
+            'status_breakdown': stats['status_breakdown'],
+            'platform_breakdown': stats['platform_breakdown'],
             'recent_completions': recent_completions,
             'avg_rating': round(avg_rating, 1) if avg_rating else 0,
             'most_played': dict(most_played) if most_played else None,
-            'rating_distribution': rating_distribution,
+            'rating_distribution': stats['rating_distribution'],
             'daily_hours_history': daily_hours_history
         })
     finally:
@@ -1677,6 +4621,7 @@ def api_stats():
             conn.close()
 
 @app.route('/api/games/<int:game_id>/completionist', methods=['GET', 'POST'])
+@conditional_response
 def api_completionist_achievements(game_id):
     if request.method == 'POST' and not session.get('logged_in'):
         return jsonify({'error': 'Authentication required'}), 401
@@ -1697,6 +4642,7 @@ def api_completionist_achievements(game_id):
         conn.commit()
         new_id = cur.lastrowid
         conn.close()
+        response_cache.invalidate('completionist')
         return jsonify({'id': new_id}), 201
     else:
         sort_by = request.args.get('sort', 'date')
@@ -1736,14 +4682,18 @@ def api_completionist_achievement(game_id, comp_id):
         )
         conn.commit()
         conn.close()
+        response_cache.invalidate('completionist')
         return ('', 204)
     else:  # DELETE
         cur.execute('DELETE FROM completionist_achievements WHERE id=? AND game_id=?', (comp_id, game_id))
         conn.commit()
         conn.close()
+        response_cache.invalidate('completionist')
         return ('', 204)
 
 @app.route('/api/completionist/all')
+@conditional_response
+@cached_response('completionist')
 def api_all_completionist():
     conn = None
     try:
@@ -1788,5 +4738,257 @@ def api_all_completionist():
         if conn:
             conn.close()
 
+# ==============================================================================
+# BACKGROUND JOB ROUTES
+# ==============================================================================
+
+@app.route('/api/jobs')
+@login_required
+def api_jobs():
+    return jsonify(get_recent_jobs(request.args.get('limit', 20, type=int)))
+
+@app.route('/api/jobs/<int:job_id>')
+@login_required
+def api_job(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+@login_required
+def api_cancel_job(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if not request_job_cancel(job_id):
+        return jsonify({'error': f"Job is already {job['status']}"}), 409
+    
+    return jsonify({'success': True, 'job': get_job(job_id)})
+
+# ==============================================================================
+# ADMIN ROUTES
+# ==============================================================================
+
+@app.route('/api/admin/cache', methods=['GET', 'DELETE'])
+@login_required
+def admin_response_cache():
+    """Response cache hit/miss counters, or clear the cache with DELETE"""
+    if request.method == 'DELETE':
+        response_cache.clear()
+        return jsonify({'success': True})
+    return jsonify(response_cache.stats())
+
+@app.route('/api/admin/metrics')
+@login_required
+def admin_metrics():
+    """
+    Request latency, SQL and Steam call metrics in the Prometheus text format,
+    summed over every worker and the scheduler process. Other processes'
+    numbers are up to METRICS_FLUSH_SECONDS old.
+    """
+    metrics_store.flush(metrics, force=True)
+    return app.response_class(metrics.render(metrics_store.collect(metrics)), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/export')
+@login_required
+def export_data():
+    """
+    Stream the whole tracker database as NDJSON (see iter_export_lines).
+    An interrupted download is resumed with ?table=<table>&after=<rowid> from
+    its last complete line, and ?export_id=<id> from its header so an import
+    treats both parts as one export.
+    """
+    table = request.args.get('table')
+    if table is not None and table not in EXPORT_TABLES:
+        return jsonify({'error': f'Unknown table: {table}'}), 400
+    try:
+        after = int(request.args.get('after', 0))
+    except ValueError:
+        return jsonify({'error': 'after must be a rowid'}), 400
+    export_id = request.args.get('export_id')
+    
+    def generate():
+        conn = get_db()
+        try:
+            yield from iter_export_lines(conn, export_id=export_id, from_table=table, after_rowid=after)
+        finally:
+            conn.close()
+    
+    filename = f"gametracker-{date.today().isoformat()}.ndjson"
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson',
+                              headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@app.route('/api/admin/import', methods=['POST'])
+@login_required
+def import_data():
+    """
+    Load an NDJSON export from the request body, read line by line as it arrives.
+    Posting the same export again after an interruption resumes it.
+    """
+    conn = get_db()
+    try:
+        summary = import_ndjson(conn, request.stream)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        conn.close()
+    return jsonify(summary)
+
+# ==============================================================================
+# CLI COMMANDS
+# ==============================================================================
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the stats summary tables from the live data."""
+    conn = get_db()
+    try:
+        rebuild_stats_summary(conn)
+    finally:
+        conn.close()
+    click.echo('Stats summary rebuilt')
+
+@app.cli.command('check-stats')
+def check_stats_command():
+    """Compare the stats summary tables against the live aggregates."""
+    conn = get_db()
+    try:
+        mismatches = check_stats_summary(conn)
+    finally:
+        conn.close()
+
+    if not mismatches:
+        click.echo('Stats summary is consistent')
+        return
+
+    for mismatch in mismatches:
+        click.echo(f'MISMATCH {mismatch}')
+    click.echo('Run "flask --app app rebuild-stats" to repair the summary')
+    raise SystemExit(1)
+
+@app.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    """Recompute the week/month/year playtime rollups from the daily play deltas."""
+    conn = get_db()
+    try:
+        rebuild_playtime_rollups(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    response_cache.invalidate('playtime')
+    click.echo('Playtime rollups rebuilt')
+
+@app.cli.command('rebuild-covers')
+@click.option('--force', is_flag=True, help='Discard the mirror and download every cover again.')
+def rebuild_covers_command(force):
+    """Mirror every game and snapshot cover into static/covers."""
+    conn = get_db()
+    try:
+        urls = [row['cover_url'] for row in conn.execute('''
+            SELECT cover_url FROM games WHERE cover_url IS NOT NULL
+            UNION
+            SELECT cover_url FROM daily_game_snapshots WHERE cover_url IS NOT NULL
+        ''')]
+    finally:
+        conn.close()
+
+    counts = cover_mirror.rebuild(urls, force=force)
+    click.echo(f"Covers: {counts['downloaded']} downloaded, {counts['failed']} failed, "
+               f"{counts['thumbnailed']} thumbnailed, {counts['removed']} orphaned files removed")
+
+@app.cli.command('build-assets')
+@click.option('--force', is_flag=True, help='Rewrite bundles that already exist.')
+def build_assets_command(force):
+    """Write fingerprinted, precompressed copies of the static bundles to static/dist and prune old ones."""
+    names = build_static_bundles(force=force)
+    for filename, name in names.items():
+        click.echo(f'{filename} -> {name}')
+    removed = prune_static_bundles(names)
+    click.echo(f'Removed {removed} files from older bundles, kept the previous {STATIC_BUNDLE_GENERATIONS - 1}')
+
+@app.cli.command('run-scheduler')
+def run_scheduler_command():
+    """Run the daily snapshot scheduler in the foreground (pair with SCHEDULER_MODE=external)."""
+    configure_logging()
+    lease = SchedulerLease()
+    click.echo(f'Scheduler {lease.holder} started; Ctrl+C to stop')
+    try:
+        run_scheduler_loop(tracker, lease)
+    except KeyboardInterrupt:
+        click.echo('Scheduler stopped')
+
+def _export_resume_point(path):
+    """
+    Scan a partly written export. Returns (export_id, table, rowid, complete,
+    good_bytes), where good_bytes is the length of its complete lines.
+    """
+    export_id, table, rowid, complete, good_bytes = None, None, 0, False, 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            good_bytes += len(line)
+            if 'format' in record:
+                export_id = record['export_id']
+            elif record.get('end'):
+                complete = True
+            else:
+                table, rowid = record['table'], record['rowid']
+    return export_id, table, rowid, complete, good_bytes
+
+@app.cli.command('export-data')
+@click.argument('output', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--resume', is_flag=True, help='Continue an interrupted export already in OUTPUT.')
+def export_data_command(output, resume):
+    """Write the whole database to OUTPUT as NDJSON ('-' for stdout)."""
+    export_id, table, rowid, complete, good_bytes = None, None, 0, False, 0
+    if resume and output != '-' and os.path.exists(output):
+        export_id, table, rowid, complete, good_bytes = _export_resume_point(output)
+        if complete:
+            click.echo(f'{output} is already a complete export', err=True)
+            return
+        if export_id is None:
+            good_bytes = 0
+        with open(output, 'r+b') as f:
+            f.truncate(good_bytes)
+    
+    conn = get_db()
+    try:
+        lines = iter_export_lines(conn, export_id=export_id, from_table=table, after_rowid=rowid,
+                                  include_header=export_id is None)
+        with click.open_file(output, 'a' if good_bytes else 'w', encoding='utf-8') as f:
+            for chunk in lines:
+                f.write(chunk)
+    finally:
+        conn.close()
+    click.echo(f'Exported to {output}' + (f' (resumed after {table or "header"} {rowid})' if good_bytes else ''),
+               err=True)
+
+@app.cli.command('import-data')
+@click.argument('source', type=click.File('rb'))
+def import_data_command(source):
+    """Load an NDJSON export ('-' for stdin). Run it again to resume an interrupted import."""
+    conn = get_db()
+    try:
+        summary = import_ndjson(conn, source)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        conn.close()
+    
+    for table, count in summary['rows'].items():
+        click.echo(f'{table}: {count} rows')
+    if summary['skipped']:
+        click.echo(f"Skipped {summary['skipped']} rows imported by an earlier run")
+    if not summary['complete']:
+        raise click.ClickException('The export ended early; import the rest of it to finish')
+    click.echo('Import complete')
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001, debug=False)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=5001, debug=False)
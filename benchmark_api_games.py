@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /api/games queries against library size.
+Compares the old per-game tag lookup (N+1) with query_games(), the query
+layer behind the current endpoint, for the full list and for the first page
+of the paginated list. Both sides run on the same kind of connection and
+return the same list of dicts; JSON encoding, compression and cover URL
+rewriting are the same for both and are left out.
+
+Usage: python benchmark_api_games.py [sizes...]
+"""
+
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import app as gametracker
+
+SIZES = [100, 500, 1000, 2500, 5000]
+RUNS = 5
+PAGE_SIZE = 50
+
+
+def seed_database(db_path, game_count):
+    """Fill a fresh database with games, achievements and tags"""
+    gametracker.DB_PATH = db_path
+    gametracker.init_db()
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    rng = random.Random(game_count)
+
+    for i in range(game_count):
+        app_id = 10000 + i
+        cur.execute(
+            """INSERT INTO games (title, platform, status, notes, hours_played, steam_app_id, cover_url, is_favorite)
+               VALUES (?,?,?,?,?,?,?,?)""",
+            (f'Game {i}', 'PC', rng.choice(['Playing', 'Completed', 'Backlog']), 'x' * 200,
+             round(rng.random() * 200, 1), app_id,
+             f"https://cdn.cloudflare.steamstatic.com/steam/apps/{app_id}/header.jpg",
+             1 if rng.random() < 0.05 else 0)
+        )
+        game_id = cur.lastrowid
+
+        for j in range(rng.randint(0, 40)):
+            cur.execute(
+                'INSERT INTO achievements (game_id, title, description, unlocked) VALUES (?,?,?,?)',
+                (game_id, f'Achievement {j}', 'Do the thing', rng.randint(0, 1))
+            )
+
+        for tag in rng.sample(['Action', 'RPG', 'Indie', 'Strategy', 'Puzzle', 'Single-player'], 3):
+            cur.execute('INSERT INTO tags (game_id, tag) VALUES (?,?)', (game_id, tag))
+
+    conn.commit()
+    conn.close()
+
+
+def legacy_tag_lookup(db_path):
+    """The previous implementation: one tag query per game"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+    cur.execute('''
+        SELECT g.*,
+               COUNT(CASE WHEN a.unlocked=1 THEN 1 END) as unlocked_achievements,
+               COUNT(a.id) as total_achievements
+        FROM games g
+        LEFT JOIN achievements a ON g.id = a.game_id
+        GROUP BY g.id
+        ORDER BY g.is_favorite DESC, g.created_at DESC
+    ''')
+    rows = [dict(r) for r in cur.fetchall()]
+    for game in rows:
+        cur.execute('SELECT tag FROM tags WHERE game_id=?', (game['id'],))
+        game['tags'] = [r['tag'] for r in cur.fetchall()]
+    conn.close()
+    return rows
+
+
+def time_call(fn):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def current_query(db_path, limit=None):
+    """The current query layer: constant queries whatever the library size"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows, _ = gametracker.query_games(conn.cursor(), limit=limit)
+    conn.close()
+    return rows
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+
+    print("=" * 78)
+    print("/api/games QUERY LATENCY VS LIBRARY SIZE (median of %d runs)" % RUNS)
+    print("=" * 78)
+    print(f"{'games':>8} {'legacy N+1 (ms)':>18} {'query_games (ms)':>18} {'speedup':>9} "
+          f"{f'first {PAGE_SIZE} (ms)':>16}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"bench_{size}.db"
+            seed_database(db_path, size)
+            assert len(current_query(db_path)) == len(legacy_tag_lookup(db_path)) == size
+
+            legacy_ms = time_call(lambda: legacy_tag_lookup(db_path))
+            current_ms = time_call(lambda: current_query(db_path))
+            page_ms = time_call(lambda: current_query(db_path, PAGE_SIZE))
+            print(f"{size:>8} {legacy_ms:>18.1f} {current_ms:>18.1f} {legacy_ms / current_ms:>8.1f}x "
+                  f"{page_ms:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
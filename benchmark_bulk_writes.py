@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bulk write layer against the previous row-at-a-time writes.
+Compares achievement replacement (one execute per achievement, one commit per
+game) and library import (one commit per game) with the executemany/chunked
+transaction paths the import and refresh jobs now use. The refresh pass
+re-syncs an unchanged list, which the apiname diff turns into no writes.
+
+Usage: python benchmark_bulk_writes.py [achievement counts...]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import app as gametracker
+
+SIZES = [10000, 25000, 50000]
+ACHIEVEMENTS_PER_GAME = 50
+
+
+def fresh_database(path):
+    gametracker.DB_PATH = path
+    gametracker.init_db()
+    return gametracker.get_db(path)
+
+
+def library(game_count):
+    rng = random.Random(game_count)
+    return [(f'Game {i}', 'PC', 'Playing', round(rng.random() * 200, 1), 10000 + i,
+             f"https://cdn.cloudflare.steamstatic.com/steam/apps/{10000 + i}/header.jpg", None, None)
+            for i in range(game_count)]
+
+
+def steam_achievements(count, seed):
+    rng = random.Random(seed)
+    return [{'name': f'Achievement {j}', 'description': 'Do the thing',
+             'unlock_date': '2024-01-01' if rng.random() < 0.5 else None,
+             'achieved': rng.randint(0, 1), 'icon': ''}
+            for j in range(count)]
+
+
+def legacy_import_games(conn, games):
+    """The previous import loop: one INSERT pair and one commit per game"""
+    cur = conn.cursor()
+    game_ids = {}
+    for game in games:
+        cur.execute(
+            """INSERT INTO games (title, platform, status, hours_played, steam_app_id, cover_url, rating, completion_date)
+               VALUES (?,?,?,?,?,?,?,?)""", game)
+        game_ids[game[4]] = cur.lastrowid
+        cur.execute('INSERT OR REPLACE INTO steam_import_status (steam_app_id, game_imported, achievements_imported) '
+                    'VALUES (?, 1, 0)', (game[4],))
+        conn.commit()
+    return game_ids
+
+
+def bulk_import_games(conn, games):
+    """The import job's path: executemany per chunk, one commit per chunk"""
+    cur = conn.cursor()
+    for chunk in gametracker.chunked(games):
+        gametracker.bulk_insert(cur, 'games', ('title', 'platform', 'status', 'hours_played', 'steam_app_id',
+                                               'cover_url', 'rating', 'completion_date'), chunk)
+        gametracker.bulk_insert(cur, 'steam_import_status', ('steam_app_id', 'game_imported', 'achievements_imported'),
+                                ((game[4], 1, 0) for game in chunk), or_clause='OR REPLACE')
+        conn.commit()
+    return gametracker.lookup_game_ids(cur, [game[4] for game in games])
+
+
+def legacy_replace_achievements(conn, achievements_by_game):
+    """The previous replacement: one INSERT per achievement, one commit per game"""
+    cur = conn.cursor()
+    for game_id, achievements in achievements_by_game.items():
+        cur.execute('DELETE FROM achievements WHERE game_id = ?', (game_id,))
+        for ach in achievements:
+            try:
+                cur.execute(
+                    'INSERT INTO achievements (game_id, title, description, date, unlocked, icon_url) VALUES (?,?,?,?,?,?)',
+                    (game_id, ach.get('name'), ach.get('description'),
+                     ach.get('unlock_date'), ach.get('achieved', 0), ach.get('icon'))
+                )
+            except Exception:
+                continue
+        conn.commit()
+
+
+def bulk_replace_achievements(conn, achievements_by_game):
+    """The import job's path: sync_game_achievements, commit every chunk of rows"""
+    cur = conn.cursor()
+    uncommitted_rows = 0
+    for game_id, achievements in achievements_by_game.items():
+        gametracker.sync_game_achievements(cur, game_id, achievements)
+        uncommitted_rows += len(achievements) + 1
+        if uncommitted_rows >= gametracker.BULK_WRITE_CHUNK_SIZE:
+            conn.commit()
+            uncommitted_rows = 0
+    conn.commit()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+
+    print("=" * 72)
+    print(f"BULK WRITES ({ACHIEVEMENTS_PER_GAME} achievements per game, "
+          f"chunk size {gametracker.BULK_WRITE_CHUNK_SIZE})")
+    print("=" * 72)
+    print(f"{'achievements':>12} {'step':>20} {'legacy rows/s':>14} {'bulk rows/s':>12} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            game_count = max(1, size // ACHIEVEMENTS_PER_GAME)
+            games = library(game_count)
+            results = {}
+
+            for label, import_games, replace in (('legacy', legacy_import_games, legacy_replace_achievements),
+                                                 ('bulk', bulk_import_games, bulk_replace_achievements)):
+                conn = fresh_database(Path(tmp) / f'{label}-{size}.db')
+                import_seconds, game_ids = timed(import_games, conn, games)
+                achievements_by_game = {game_id: steam_achievements(ACHIEVEMENTS_PER_GAME, game_id)
+                                        for game_id in game_ids.values()}
+                replace_seconds, _ = timed(replace, conn, achievements_by_game)
+                # Second pass: a refresh of achievements that are already stored
+                refresh_seconds, _ = timed(replace, conn, achievements_by_game)
+                count = conn.execute('SELECT COUNT(*) FROM achievements').fetchone()[0]
+                assert count == game_count * ACHIEVEMENTS_PER_GAME, count
+                conn.close()
+                results[label] = (import_seconds, replace_seconds, refresh_seconds)
+
+            rows = (game_count, game_count * ACHIEVEMENTS_PER_GAME, game_count * ACHIEVEMENTS_PER_GAME)
+            for step, name in enumerate(('import games', 'insert achievements', 'refresh achievements')):
+                legacy_rate = rows[step] / results['legacy'][step]
+                bulk_rate = rows[step] / results['bulk'][step]
+                print(f"{size:>12} {name:>20} {legacy_rate:>14,.0f} {bulk_rate:>12,.0f} "
+                      f"{bulk_rate / legacy_rate:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long a fresh process takes to import app.py, and how much
+create_app() adds on top (schema check, static bundles, scheduler start).
+Each run is a new interpreter, like a gunicorn worker or a test session,
+against a throwaway database. Also checks that the import alone leaves no
+files behind.
+
+Usage: python benchmark_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RUNS = 10
+REPO = Path(__file__).resolve().parent
+
+PROBE = '''
+import json, sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+if sys.argv[2] == 'create':
+    app.DB_PATH = Path('bench.db')
+    app.create_app()
+print(json.dumps({'import': imported - start, 'create': time.perf_counter() - imported}))
+'''
+
+
+def run_probe(mode):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SCHEDULER_MODE='external')
+        output = subprocess.run([sys.executable, '-c', PROBE, str(REPO), mode], cwd=tmp, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        leftovers = sorted(os.listdir(tmp))
+    return json.loads(output.strip().splitlines()[-1]), leftovers
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+
+    imports, creates = [], []
+    for _ in range(runs):
+        timings, leftovers = run_probe('import')
+        assert not leftovers, f"importing app.py wrote {leftovers}"
+        imports.append(timings['import'] * 1000)
+        timings, _ = run_probe('create')
+        creates.append(timings['create'] * 1000)
+
+    print("=" * 60)
+    print(f"APP STARTUP (median of {runs} fresh interpreters)")
+    print("=" * 60)
+    print(f"{'import app':<28} {statistics.median(imports):>10.1f} ms")
+    print(f"{'create_app() afterwards':<28} {statistics.median(creates):>10.1f} ms")
+    print("Import side effects: none")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark bare requests.get against the pooled SteamClient, using the local
+mock Steam server. Also checks that injected 429s are retried.
+
+Usage: python benchmark_steam_client.py [calls]
+"""
+
+import statistics
+import sys
+import time
+
+import requests
+
+from mock_steam_server import start_mock_server
+from steam_client import SteamClient
+
+CALLS = 300
+
+
+def run(fetch, base_url, calls):
+    timings = []
+    for i in range(calls):
+        url = f"{base_url}/ISteamUserStats/GetSchemaForGame/v2/?key=k&appid={10000 + i % 50}"
+        start = time.perf_counter()
+        response = fetch(url)
+        assert response.status_code == 200, response.status_code
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else CALLS
+
+    print("=" * 60)
+    print(f"STEAM HTTP CLIENT ({calls} sequential calls against the mock server)")
+    print("=" * 60)
+    print(f"{'client':>16} {'total (s)':>10} {'median (ms)':>12} {'connections':>12}")
+
+    server, base_url = start_mock_server()
+    bare = run(lambda url: requests.get(url, timeout=15), base_url, calls)
+    print(f"{'requests.get':>16} {sum(bare) / 1000:>10.2f} {statistics.median(bare):>12.2f} "
+          f"{server.state.connections:>12}")
+    server.shutdown()
+
+    server, base_url = start_mock_server()
+    client = SteamClient()
+    pooled = run(client.get, base_url, calls)
+    print(f"{'SteamClient':>16} {sum(pooled) / 1000:>10.2f} {statistics.median(pooled):>12.2f} "
+          f"{server.state.connections:>12}")
+    client.close()
+    server.shutdown()
+
+    server, base_url = start_mock_server(fail_every=5)
+    client = SteamClient(backoff=0.01)
+    run(client.get, base_url, 50)
+    print(f"\n429 on every 5th request: 50 calls succeeded after {server.state.requests} requests")
+    client.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
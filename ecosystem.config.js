@@ -3,17 +3,34 @@ module.exports = {
     {
       name: "gametracker",
       script: "/home/lilacrose/lilacrose.dev2.0/venv/bin/gunicorn",
-      args: "--bind 127.0.0.1:5001 --workers 1 --timeout 180 app:app",
+      args: "--bind 127.0.0.1:5001 --workers 4 --threads 2 --timeout 180 'app:create_app()'",
       cwd: "/home/lilacrose/lilacrose.dev2.0/gametracker",
       exec_mode: "fork",
       interpreter: "none",
       env: {
         FLASK_ENV: "production",
-        PYTHONUNBUFFERED: "1"
+        PYTHONUNBUFFERED: "1",
+        SCHEDULER_MODE: "external"
+      },
+      error_file: "/home/lilacrose/pm2_error.log",
+      out_file: "/home/lilacrose/pm2_out.log",
+      log_date_format: "YYYY-MM-DD HH:mm:ss"
+    },
+    {
+      name: "gametracker-scheduler",
+      script: "/home/lilacrose/lilacrose.dev2.0/venv/bin/flask",
+      args: "--app app run-scheduler",
+      cwd: "/home/lilacrose/lilacrose.dev2.0/gametracker",
+      exec_mode: "fork",
+      interpreter: "none",
+      env: {
+        FLASK_ENV: "production",
+        PYTHONUNBUFFERED: "1",
+        SCHEDULER_MODE: "external"
       },
       error_file: "/home/lilacrose/pm2_error.log",
       out_file: "/home/lilacrose/pm2_out.log",
       log_date_format: "YYYY-MM-DD HH:mm:ss"
     }
   ]
-};
\ No newline at end of file
+};
@@ -0,0 +1,273 @@
+"""
+Minimal metrics in the Prometheus text exposition format.
+
+Counters and histograms are updated in memory by each process. With
+several gunicorn workers, every process also writes its values to its own
+JSON file in a shared directory (MultiProcessStore), and a scrape sums the
+files of all processes, so whichever worker answers reports the totals.
+Files of processes that have exited are folded into one aggregate file.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: exited processes' files are kept instead of folded
+    fcntl = None
+
+# Latency buckets in seconds, from a cached read to a full Steam import page
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dump(self, values=None):
+        """This process's values, or merged `values`, as JSON-serializable entries"""
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        return [[list(key), value] for key, value in values.items()]
+
+    def merge(self, dumps):
+        """Sum dumps from several processes into {label key: value}"""
+        values = {}
+        for dump in dumps:
+            for key, value in dump:
+                values[tuple(key)] = values.get(tuple(key), 0) + value
+        return values
+
+    def samples(self, values=None):
+        if values is None:
+            values = self.merge([self.dump()])
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Bucketed observations per label set, with their sum and count"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}  # label key -> [per-bucket counts, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def dump(self, values=None):
+        """This process's values, or merged `values`, as JSON-serializable entries"""
+        if values is None:
+            with self._lock:
+                values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        return [[list(key), [list(counts), total]] for key, (counts, total) in values.items()]
+
+    def merge(self, dumps):
+        """Sum dumps from several processes into {label key: (bucket counts, sum)}"""
+        values = {}
+        for dump in dumps:
+            for key, (counts, total) in dump:
+                merged = values.setdefault(tuple(key), ([0] * len(self.buckets), 0.0))
+                values[tuple(key)] = ([a + b for a, b in zip(merged[0], counts)], merged[1] + total)
+        return values
+
+    def samples(self, values=None):
+        if values is None:
+            values = self.merge([self.dump()])
+        for key, (counts, total) in sorted(values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', {**labels, 'le': _format_value(bound)}, cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class MetricsRegistry:
+    """Named metrics of one process, rendered together for a scrape"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def dump(self):
+        """This process's values, as JSON-serializable {metric name: entries}"""
+        return {metric.name: metric.dump() for metric in self._metrics}
+
+    def merge(self, dumps):
+        """Sum several dumps into one in the same format; unknown metrics are dropped"""
+        return {metric.name: metric.dump(metric.merge([dump.get(metric.name, []) for dump in dumps]))
+                for metric in self._metrics}
+
+    def render(self, dumps=None):
+        """
+        Prometheus text format (version 0.0.4) of the sum of `dumps`, or of
+        this process alone without them
+        """
+        dumps = [self.dump()] if dumps is None else dumps
+        lines = []
+        for metric in self._metrics:
+            values = metric.merge([dump.get(metric.name, []) for dump in dumps])
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in metric.samples(values):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiProcessStore:
+    """
+    Per-process metric files in one directory, for summing across workers.
+
+    Each process rewrites its own file at most every `interval` seconds
+    (flush() is cheap to call on every request). Files are named by pid and
+    start time, so a recycled pid never overwrites an exited process. On
+    each collect(), the files of processes that have exited are added to
+    AGGREGATE_FILE and deleted: summed counters never go backwards, and the
+    directory doesn't grow with every worker restart.
+    """
+
+    AGGREGATE_FILE = 'aggregate.json'
+
+    def __init__(self, directory, interval=5.0):
+        self.directory = directory
+        self.interval = interval
+        self._last_flush = 0.0
+        self._pid = None
+        self._filename = None
+        self._lock = threading.Lock()
+
+    def flush(self, registry, force=False):
+        now = time.time()
+        with self._lock:
+            if self._pid != os.getpid():
+                # New process, or a fork that inherited this store
+                self._pid = os.getpid()
+                self._filename = f'{self._pid}-{time.time_ns():x}.json'
+                self._last_flush = 0.0
+            if not force and now - self._last_flush < self.interval:
+                return
+            self._last_flush = now
+        self._write(self._filename, registry.dump())
+
+    def _write(self, filename, dump):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(dump, f)
+        os.replace(tmp_path, path)
+
+    def _read(self, filename):
+        try:
+            with open(os.path.join(self.directory, filename)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _listdir(self):
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        except FileNotFoundError:
+            return []
+
+    @contextmanager
+    def _exclusive(self):
+        """Cross-process lock on the directory, so two scrapes never fold the same file twice"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def compact(self, registry):
+        """Fold the files of exited processes into AGGREGATE_FILE. Returns how many were folded."""
+        if fcntl is None:
+            return 0
+        with self._exclusive():
+            exited = []
+            for name in self._listdir():
+                pid = name.split('-', 1)[0]
+                if name != self.AGGREGATE_FILE and pid.isdigit() and not _pid_alive(int(pid)):
+                    exited.append(name)
+            if not exited:
+                return 0
+            dumps = [self._read(name) for name in [self.AGGREGATE_FILE] + exited]
+            self._write(self.AGGREGATE_FILE, registry.merge([dump for dump in dumps if dump]))
+            for name in exited:
+                os.remove(os.path.join(self.directory, name))
+        return len(exited)
+
+    def collect(self, registry):
+        """The aggregate of exited processes plus every live process's latest dump"""
+        self.compact(registry)
+        dumps = (self._read(name) for name in self._listdir())
+        return [dump for dump in dumps if dump is not None]
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Steam Web API, store and cover CDN endpoints the tracker uses.
+Point the app at it with STEAM_API_BASE / STEAM_STORE_BASE.
+
+Usage: python mock_steam_server.py [--port 8765] [--games 200] [--latency 0.05] [--fail-every 0]
+"""
+
+import argparse
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def mock_cover_bytes(app_id):
+    """A 460x215 JPEG like a Steam header image, unique per app"""
+    try:
+        from PIL import Image
+    except ImportError:
+        # Not decodable, but still unique bytes with a JPEG signature
+        return b'\xff\xd8\xff\xe0' + f'mock cover {app_id}'.encode() * 64 + b'\xff\xd9'
+    rng = random.Random(app_id)
+    image = Image.new('RGB', (460, 215), tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class MockSteamState:
+    """Fake library plus knobs for latency and injected 429s"""
+
+    def __init__(self, game_count=200, achievements_per_game=20, latency=0.0, fail_every=0, seed=1):
+        rng = random.Random(seed)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.games = [
+            {'appid': 10000 + i, 'name': f'Mock Game {i}', 'playtime_forever': rng.randint(0, 6000)}
+            for i in range(game_count)
+        ]
+        self.achievements = {
+            game['appid']: [
+                {'name': f'ACH_{j}', 'displayName': f'Achievement {j}', 'description': 'Do the thing',
+                 'icon': '', 'achieved': rng.randint(0, 1)}
+                for j in range(rng.randint(0, achievements_per_game))
+            ]
+            for game in self.games
+        }
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+
+class MockSteamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real endpoints
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.state._lock:
+            self.server.state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cover(self, app_id):
+        body = mock_cover_bytes(app_id)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        number = state.count_request()
+        if state.latency:
+            time.sleep(state.latency)
+        if state.fail_every and number % state.fail_every == 0:
+            return self._send_json({}, status=429, headers={'Retry-After': '0'})
+
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        app_id = int(query.get('appid') or query.get('appids') or 0)
+
+        if url.path.endswith('/GetOwnedGames/v0001/'):
+            return self._send_json({'response': {'game_count': len(state.games), 'games': state.games}})
+
+        if url.path.endswith('/GetSchemaForGame/v2/'):
+            schema = [{k: a[k] for k in ('name', 'displayName', 'description', 'icon')}
+                      for a in state.achievements.get(app_id, [])]
+            return self._send_json({'game': {'availableGameStats': {'achievements': schema}}})
+
+        if url.path.endswith('/GetPlayerAchievements/v0001/'):
+            player = [{'apiname': a['name'], 'achieved': a['achieved'],
+                       'unlocktime': 1700000000 if a['achieved'] else 0}
+                      for a in state.achievements.get(app_id, [])]
+            return self._send_json({'playerstats': {'success': True, 'achievements': player}})
+
+        if url.path == '/api/appdetails':
+            return self._send_json({str(app_id): {'success': True, 'data': {
+                'genres': [{'description': 'Action'}, {'description': 'Indie'}],
+                'categories': [{'description': 'Single-player'}]}}})
+
+        if url.path.startswith('/steam/apps/') and url.path.endswith('/header.jpg'):
+            return self._send_cover(int(url.path.split('/')[3]))
+
+        if url.path == '/api/storesearch/':
+            term = query.get('term', '').lower()
+            items = [{'id': g['appid'], 'name': g['name']} for g in state.games if term in g['name'].lower()]
+            return self._send_json({'total': len(items), 'items': items[:10]})
+
+        self._send_json({'error': 'not found'}, status=404)
+
+
+def start_mock_server(port=0, **state_options):
+    """Start the mock in a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockSteamHandler)
+    server.daemon_threads = True
+    server.state = MockSteamState(**state_options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--fail-every', type=int, default=0, help='answer every Nth request with 429')
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, game_count=args.games,
+                                         latency=args.latency, fail_every=args.fail_every)
+    print(f"Mock Steam API listening on {base_url}")
+    print(f"  STEAM_API_BASE={base_url} STEAM_STORE_BASE={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,37 @@ let selectedGames = new Set();
 let top10Games = [];
 let isEditingTop10 = false;
 
+// Cover image markup. Mirrored covers carry cover_srcset ({avif: ..., webp: ...})
+// so the browser picks the smallest thumbnail that fits `sizes`.
+function coverPicture(item, attrs, sizes) {
+  const sources = Object.entries(item.cover_srcset || {})
+    .map(([format, srcset]) => `<source type="image/${format}" srcset="${srcset}" sizes="${sizes}">`)
+    .join('');
+  return `<picture>${sources}<img src="${item.cover_url}" ${attrs} loading="lazy" /></picture>`;
+}
+
+// Smallest thumbnail URL at least minWidth px wide from a srcset string, or null
+function pickThumbnail(srcset, minWidth) {
+  const candidates = srcset.split(', ')
+    .map(entry => entry.split(' '))
+    .map(([url, width]) => ({ url, width: parseInt(width) }))
+    .filter(c => c.width >= minWidth)
+    .sort((a, b) => a.width - b.width);
+  return candidates.length ? candidates[0].url : null;
+}
+
+// CSS background for the library grid: thumbnails via image-set() where supported
+function coverBackground(item, cssWidth) {
+  const fallback = `url(${item.cover_url})`;
+  const minWidth = cssWidth * (window.devicePixelRatio || 1);
+  const options = Object.entries(item.cover_srcset || {})
+    .map(([format, srcset]) => [format, pickThumbnail(srcset, minWidth)])
+    .filter(([, url]) => url)
+    .map(([format, url]) => `url("${url}") type("image/${format}")`);
+  if (!options.length) return [fallback];
+  return [fallback, `image-set(${options.join(', ')}, url("${item.cover_url}") type("image/jpeg"))`];
+}
+
 function loadSavedFilters() {
   const savedStatus = localStorage.getItem('gameTracker_filter_status');
   const savedPlatform = localStorage.getItem('gameTracker_filter_platform');
@@ -165,7 +196,8 @@ function renderGames(games) {
     // Cover image
     const cover = el.querySelector('.game-cover');
     if (game.cover_url) {
-      cover.style.backgroundImage = `url(${game.cover_url})`;
+      // The plain url() stays in place on browsers that reject image-set()
+      coverBackground(game, 320).forEach(value => { cover.style.backgroundImage = value; });
     }
     
     // BATCH SELECTION CHECKBOX
@@ -347,7 +379,11 @@ async function updateGameFromSteam(gameId) {
     if (result.success) {
       let message = `Updated game from Steam`;
       if (result.hours_updated) message += ' - hours refreshed';
-      if (result.achievements_updated > 0) message += ` - ${result.achievements_updated} achievements updated`;
+      if (result.achievement_changes) {
+        message += ` - achievements: ${describeAchievementChanges(result.achievement_changes)}`;
+      } else if (result.achievements_updated > 0) {
+        message += ` - ${result.achievements_updated} achievements updated`;
+      }
       
       // Check if we should set completion date
       if (result.all_achievements_unlocked) {
@@ -680,7 +716,7 @@ document.getElementById('save-game').addEventListener('click', async () => {
     if (autoImportAppId && !currentEditId) { // Only for new games, not edits
       // Find the newly created game (it should be the first one in the list)
       setTimeout(async () => {
-        const gamesRes = await fetch('/api/games');
+        const gamesRes = await fetch('/api/games?fields=steam_app_id');
         const games = await gamesRes.json();
         const newGame = games.find(g => g.steam_app_id == autoImportAppId);
         
@@ -696,48 +732,42 @@ document.getElementById('save-game').addEventListener('click', async () => {
   }
 });
 
+// Sync a game's achievements from Steam on the server in one request.
+// Returns the server's result ({changes, achievements}) or null on error.
+async function syncAchievementsFromSteam(gameId, steamAppId) {
+  const res = await fetch(`/api/games/${gameId}/achievements/sync`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ steam_app_id: steamAppId })
+  });
+  
+  if (res.status === 401) {
+    alert('Your session has expired. Please login again.');
+    window.location.reload();
+    return null;
+  }
+  
+  const result = await res.json();
+  if (!res.ok) {
+    alert(result.error || 'Error syncing achievements from Steam');
+    return null;
+  }
+  return result;
+}
+
+function describeAchievementChanges(changes) {
+  return `${changes.added} new, ${changes.updated} changed, ${changes.removed} removed, ${changes.unchanged} unchanged`;
+}
+
 // Function to import achievements for a specific game
 async function importAchievementsForGame(gameId, steamAppId) {
   try {
-    const res = await fetch(`/api/steam/achievements/${steamAppId}`);
-    const achievements = await res.json();
+    if (!confirm('Import achievements from Steam? Steam\'s list will replace the existing achievements for this game.')) return;
     
-    if (achievements.length === 0) {
-      alert('No achievements found for this game on Steam.');
-      return;
-    }
-    
-    if (!confirm(`Import ${achievements.length} achievements from Steam? This will replace ALL existing achievements for this game.`)) return;
+    const result = await syncAchievementsFromSteam(gameId, steamAppId);
+    if (!result) return;
     
-    // Clear existing achievements first to avoid duplicates
-    const existingAchRes = await fetch(`/api/games/${gameId}/achievements`);
-    const existingAchievements = await existingAchRes.json();
-    
-    // Delete all existing achievements
-    for (const ach of existingAchievements) {
-      await fetch(`/api/games/${gameId}/achievements/${ach.id}`, {
-        method: 'DELETE'
-      });
-    }
-    
-    // Import new achievements
-    let importedCount = 0;
-    for (const ach of achievements) {
-      await fetch(`/api/games/${gameId}/achievements`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          title: ach.name,
-          description: ach.description,
-          date: ach.unlock_date || null,
-          unlocked: ach.achieved || 0,
-          icon_url: ach.icon
-        })
-      });
-      importedCount++;
-    }
-    
-    alert(`Imported ${importedCount} achievements for this game!`);
+    alert(`Imported ${result.achievements.length} achievements for this game! (${describeAchievementChanges(result.changes)})`);
     
     // Refresh achievements view if we're on the achievements tab
     if (document.getElementById('tab-achievements').classList.contains('active')) {
@@ -770,7 +800,7 @@ function editGame(game) {
   document.getElementById('input-tags').value = (game.tags || []).join(', ');
   document.getElementById('input-notes').value = game.notes || '';
   document.getElementById('input-steam-id').value = game.steam_app_id || '';
-  document.getElementById('input-cover').value = game.cover_url || '';
+  document.getElementById('input-cover').value = game.cover_source_url || game.cover_url || '';
   
   modal.classList.add('show');
 }
@@ -958,43 +988,23 @@ async function openAchievements(game) {
     const importBtn = document.getElementById('import-steam-ach');
     if (importBtn && game.steam_app_id) {
       importBtn.addEventListener('click', async () => {
-        const res = await fetch(`/api/steam/achievements/${game.steam_app_id}`);
-        const achievements = await res.json();
-        
-        if (!confirm(`Import ${achievements.length} achievements from Steam? This will replace ALL existing achievements for this game.`)) return;
+        if (!confirm('Import achievements from Steam? Steam\'s list will replace the existing achievements for this game.')) return;
         
         importBtn.disabled = true;
         importBtn.textContent = 'Importing...';
         
-        // Clear existing achievements first
-        const existingAchRes = await fetch(`/api/games/${game.id}/achievements`);
-        const existingAchievements = await existingAchRes.json();
-        
-        for (const ach of existingAchievements) {
-          await fetch(`/api/games/${game.id}/achievements/${ach.id}`, {
-            method: 'DELETE'
-          });
-        }
-        
-        // Import new achievements
-        for (const ach of achievements) {
-          await fetch(`/api/games/${game.id}/achievements`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              title: ach.name,
-              description: ach.description,
-              date: ach.unlock_date || new Date().toISOString().slice(0, 10),
-              unlocked: ach.achieved || 0,
-              icon_url: ach.icon
-            })
-          });
+        try {
+          const result = await syncAchievementsFromSteam(game.id, game.steam_app_id);
+          if (result) {
+            // Auto-refresh after import
+            loadAchievementsModal(game.id);
+          }
+        } catch (err) {
+          alert('Error importing achievements: ' + err.message);
+        } finally {
+          importBtn.textContent = 'Import from Steam';
+          importBtn.disabled = false;
         }
-        
-        // Auto-refresh after import
-        loadAchievementsModal(game.id);
-        importBtn.textContent = 'Import from Steam';
-        importBtn.disabled = false;
       });
     }
   }
@@ -1309,7 +1319,7 @@ async function loadStats() {
   if (stats.recent_completions && stats.recent_completions.length > 0) {
     recentCompletions.innerHTML = stats.recent_completions.map(game => `
       <div class="completion-item">
-        ${game.cover_url ? `<img src="${game.cover_url}" class="completion-cover" />` : ''}
+        ${game.cover_url ? coverPicture(game, 'class="completion-cover"', '80px') : ''}
         <div class="completion-info">
           <div class="completion-title">${game.title}</div>
           <div class="completion-meta">
@@ -1623,20 +1633,28 @@ async function showDailyBreakdown(date) {
     
     const totalHoursAdded = games.reduce((sum, g) => sum + g.hours_added, 0);
     
+    // After days without a snapshot, hours are measured from the last recorded day
+    const dayBefore = new Date(date + 'T00:00:00');
+    dayBefore.setDate(dayBefore.getDate() - 1);
+    const sinceDate = games[0].since_date;
+    const period = sinceDate && sinceDate !== dayBefore.toLocaleDateString('en-CA')
+      ? `since ${formatDate(sinceDate)}`
+      : 'this day';
+    
     breakdownDiv.innerHTML = `
       <div class="breakdown-header">
         <h4>Games Played on ${formatDate(date)}</h4>
-        <p class="breakdown-summary">${games.length} game${games.length !== 1 ? 's' : ''} • ${formatHours(totalHoursAdded)} played this day</p>
+        <p class="breakdown-summary">${games.length} game${games.length !== 1 ? 's' : ''} • ${formatHours(totalHoursAdded)} played ${period}</p>
         <button class="btn small secondary" onclick="hideDailyBreakdown()">Close</button>
       </div>
       <div class="breakdown-list">
         ${games.map((game, index) => `
           <div class="breakdown-game-item" style="animation-delay: ${0.1 + index * 0.05}s">
-            ${game.cover_url ? `<img src="${game.cover_url}" class="breakdown-game-cover" alt="${game.game_title}" />` : ''}
+            ${game.cover_url ? coverPicture(game, `class="breakdown-game-cover" alt="${game.game_title}"`, '106px') : ''}
             <div class="breakdown-game-info">
               <div class="breakdown-game-title">${game.game_title}</div>
               <div class="breakdown-game-hours">
-                <span class="hours-this-day">+${formatHours(game.hours_added)} played this day</span>
+                <span class="hours-this-day">+${formatHours(game.hours_added)} played ${period}</span>
                 <span class="total-hours">${formatHours(game.total_hours)} total by this date</span>
               </div>
             </div>
@@ -1661,7 +1679,13 @@ function hideDailyBreakdown() {
 // Import/Export
 document.getElementById('export-json').addEventListener('click', async () => {
   const res = await fetch('/api/games');
-  const data = await res.json();
+  const games = await res.json();
+  // cover_url may point at this server's cover mirror; export the original
+  // address so the JSON imports with working covers anywhere
+  const data = games.map(({ cover_source_url, cover_srcset, ...game }) => ({
+    ...game,
+    cover_url: cover_source_url || game.cover_url
+  }));
   document.getElementById('ie-data').value = JSON.stringify(data, null, 2);
 });
 
@@ -1688,13 +1712,47 @@ document.getElementById('import-json').addEventListener('click', async () => {
   }
 });
 
-// Steam library import
+// Steam library import (runs as a background job on the server)
+let steamImportJobId = null;
+
+function sleep(ms) {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+async function pollImportJob(jobId, btn) {
+  while (true) {
+    const res = await fetch(`/api/jobs/${jobId}`);
+    if (!res.ok) throw new Error(`Server returned ${res.status}: ${res.statusText}`);
+    const job = await res.json();
+    
+    if (job.status === 'queued' || job.status === 'running') {
+      btn.textContent = job.total > 0
+        ? `Importing... ${job.processed}/${job.total} (click to cancel)`
+        : 'Importing... (click to cancel)';
+      await sleep(2000);
+      continue;
+    }
+    
+    return job;
+  }
+}
+
 document.getElementById('import-steam-library').addEventListener('click', async () => {
   if (!isLoggedIn) {
     alert('Please login to import Steam library');
     return;
   }
   
+  const btn = document.getElementById('import-steam-library');
+  
+  if (steamImportJobId !== null) {
+    if (confirm('A Steam import is running. Cancel it? Games imported so far are kept.')) {
+      await fetch(`/api/jobs/${steamImportJobId}/cancel`, { method: 'POST' });
+      btn.textContent = 'Cancelling...';
+    }
+    return;
+  }
+  
   const importAchievements = false;
   
   let confirmMessage = 'Import your Steam library? This will add all games from your Steam account.';
@@ -1706,10 +1764,8 @@ document.getElementById('import-steam-library').addEventListener('click', async
   
   if (!confirm(confirmMessage)) return;
   
-  const btn = document.getElementById('import-steam-library');
   const originalText = btn.textContent;
   btn.textContent = 'Importing...';
-  btn.disabled = true;
   
   try {
     const res = await fetch('/api/steam/import-library', {
@@ -1719,7 +1775,7 @@ document.getElementById('import-steam-library').addEventListener('click', async
         'Accept': 'application/json'
       },
       body: JSON.stringify({ 
-        import_achievements: false 
+        import_achievements: importAchievements 
       })
     });
     
@@ -1738,9 +1794,13 @@ document.getElementById('import-steam-library').addEventListener('click', async
       throw new Error(errorMsg);
     }
     
-    const result = await res.json();
+    const started = await res.json();
+    steamImportJobId = started.job_id;
     
-    if (result.success) {
+    const job = await pollImportJob(steamImportJobId, btn);
+    const result = job.result || {};
+    
+    if (job.status === 'completed') {
       let message = `Successfully imported ${result.imported} games from Steam`;
       if (importAchievements && result.achievements_imported > 0) {
         message += ` with ${result.achievements_imported} achievements`;
@@ -1752,16 +1812,18 @@ document.getElementById('import-steam-library').addEventListener('click', async
         message += ` - ${result.achievements_failed} games had no achievements`;
       }
       alert(message);
-      fetchGames();
+    } else if (job.status === 'cancelled') {
+      alert(`Steam import cancelled after ${job.processed} of ${job.total} games (${result.imported || 0} imported)`);
     } else {
-      alert('Failed to import Steam library: ' + result.error);
+      alert('Failed to import Steam library: ' + job.message);
     }
+    fetchGames();
   } catch (err) {
     console.error('Import error:', err);
     alert('Error importing Steam library: ' + err.message);
   } finally {
+    steamImportJobId = null;
     btn.textContent = originalText;
-    btn.disabled = false;
   }
 });
 
@@ -2109,7 +2171,7 @@ function displayRandomGame(game) {
   
   document.getElementById('random-result').innerHTML = `
     <div class="random-game-card">
-      ${game.cover_url ? `<img src="${game.cover_url}" alt="${game.title}" style="width: 200px; height: 100px; object-fit: cover; border-radius: 8px; margin-bottom: 16px;">` : ''}
+      ${game.cover_url ? coverPicture(game, `alt="${game.title}" style="width: 200px; height: 100px; object-fit: cover; border-radius: 8px; margin-bottom: 16px;"`, '200px') : ''}
       <h3>${game.title}</h3>
       <div class="random-game-meta">
         <span class="badge">${game.platform || 'No platform'}</span>
@@ -2325,6 +2387,7 @@ function addGameToTop10(gameId) {
             hours_played: game.hours_played,
             rating: game.rating,
             cover_url: game.cover_url,
+            cover_srcset: game.cover_srcset,
             why_i_love_it: ''
         });
         
@@ -2362,7 +2425,7 @@ function renderTop10Selection() {
             <div class="drag-handle">⋮⋮</div>
             <div class="game-info">
                 <div style="display: flex; align-items: center; gap: 8px; margin-bottom: 8px;">
-                    ${game.cover_url ? `<img src="${game.cover_url}" style="width: 40px; height: 40px; object-fit: cover; border-radius: 4px;">` : ''}
+                    ${game.cover_url ? coverPicture(game, 'style="width: 40px; height: 40px; object-fit: cover; border-radius: 4px;"', '86px') : ''}
                     <div style="flex: 1;">
                         <strong>#${index + 1}. ${game.title}</strong>
                         <div style="font-size: 12px; color: var(--text-muted); margin-top: 2px;">
@@ -2815,12 +2878,42 @@ function setupBatchOperations() {
 }
 
 // Call this after loading games
+// The first page renders straight away; the rest of the library follows in
+// larger pages and is rendered once it has all arrived. The whole library is
+// kept in allGames because Top 10 search, batch edits and the game modals look
+// games up there, so filtering stays client-side instead of using the
+// status/platform/search parameters of /api/games.
+const GAMES_FIRST_PAGE = 60;
+const GAMES_PAGE = 500;
+let fetchGamesGeneration = 0;
+
+async function fetchGamesPage(limit, cursor) {
+  const params = new URLSearchParams({ limit });
+  if (cursor) params.set('cursor', cursor);
+  const res = await fetch(`/api/games?${params}`);
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  return res.json();
+}
+
 async function fetchGames() {
+  // A newer fetchGames() call supersedes this one
+  const generation = ++fetchGamesGeneration;
   try {
-    const res = await fetch('/api/games');
-    if (!res.ok) throw new Error(`HTTP ${res.status}`);
-    allGames = await res.json();
+    let page = await fetchGamesPage(GAMES_FIRST_PAGE);
+    if (generation !== fetchGamesGeneration) return;
+    const games = page.games;
+    allGames = games.slice();
     applySortingAndFiltering();
+    
+    while (page.next_cursor) {
+      page = await fetchGamesPage(GAMES_PAGE, page.next_cursor);
+      if (generation !== fetchGamesGeneration) return;
+      games.push(...page.games);
+    }
+    if (games.length > allGames.length) {
+      allGames = games;
+      applySortingAndFiltering();
+    }
   } catch (err) {
     console.error('Failed to fetch games:', err);
     document.getElementById('games-list').innerHTML = 
@@ -2854,7 +2947,7 @@ function renderTop10() {
     list.innerHTML = top10Games.map((game, index) => `
         <div class="top10-game-card">
             <div class="top10-rank">#${index + 1}</div>
-            ${game.cover_url ? `<img src="${game.cover_url}" class="top10-cover" alt="${game.title}" />` : ''}
+            ${game.cover_url ? coverPicture(game, `class="top10-cover" alt="${game.title}"`, '(max-width: 768px) 100vw, 180px') : ''}
             <div class="top10-content">
                 <h3>${game.title}</h3>
                 <div class="top10-meta">
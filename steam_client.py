@@ -0,0 +1,224 @@
+"""
+Shared HTTP client for the Steam Web API and Steam store.
+
+One pooled requests.Session is reused by every thread, so calls keep their
+TCP/TLS connections alive. Web API calls go through a shared token bucket,
+429/5xx responses and connection errors are retried with exponential backoff
+and jitter (honoring Retry-After) within an overall deadline per call, and
+each endpoint gets its own timeout.
+"""
+
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Base URLs, overridable so tests and benchmarks can point at mock_steam_server.py
+STEAM_API_BASE = os.getenv("STEAM_API_BASE", "https://api.steampowered.com").rstrip('/')
+STEAM_STORE_BASE = os.getenv("STEAM_STORE_BASE", "https://store.steampowered.com").rstrip('/')
+
+# Pooled connections kept per host
+STEAM_HTTP_POOL_SIZE = int(os.getenv("STEAM_HTTP_POOL_SIZE", 8))
+# Retries after the first attempt for 429/5xx responses and connection errors
+STEAM_HTTP_RETRIES = int(os.getenv("STEAM_HTTP_RETRIES", 3))
+STEAM_HTTP_BACKOFF = float(os.getenv("STEAM_HTTP_BACKOFF", 1.0))  # seconds, doubled per retry
+STEAM_HTTP_MAX_BACKOFF = float(os.getenv("STEAM_HTTP_MAX_BACKOFF", 30.0))
+# Overall budget for one get(), attempts and backoff sleeps included. Request
+# handlers call Steam, so this stays well under gunicorn's --timeout 180.
+STEAM_HTTP_DEADLINE = float(os.getenv("STEAM_HTTP_DEADLINE", 60.0))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# (connect, read) timeouts, matched against the URL path; first match wins
+TIMEOUT_POLICY = [
+    ('/api/storesearch', (3.05, 5)),
+    ('/api/appdetails', (3.05, 5)),
+    ('/GetOwnedGames/', (3.05, 30)),
+]
+DEFAULT_TIMEOUT = (3.05, 15)
+
+
+class SharedTokenBucket:
+    """
+    Token bucket whose state lives in a SQLite table, so every process on
+    the host draws from one budget. `connect` returns a connection to a
+    database with a rate_limit_buckets table; each acquire is one short
+    write transaction, which is cheap next to the Steam calls it guards.
+    """
+
+    def __init__(self, connect, name, rate, burst):
+        self.connect = connect
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+
+    def _take(self):
+        """Take a token if one is available. Returns 0, or the seconds until one will be."""
+        conn = self.connect()
+        try:
+            # IMMEDIATE takes the write lock up front, so the read-modify-write can't interleave
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limit_buckets WHERE name = ?',
+                               (self.name,)).fetchone()
+            now = time.time()
+            tokens = float(self.burst) if row is None else min(
+                self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            conn.execute('INSERT OR REPLACE INTO rate_limit_buckets (name, tokens, updated_at) VALUES (?, ?, ?)',
+                         (self.name, tokens, now))
+            conn.commit()
+            return wait
+        finally:
+            conn.close()
+
+    def acquire(self):
+        """Block until a token is available, then take it. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self._take()
+            if wait == 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def endpoint_label(url):
+    """
+    Low-cardinality name for a Steam URL, e.g. 'GetSchemaForGame' or
+    'appdetails'; anything off the Steam API and store hosts is 'other'.
+    """
+    parts = urlsplit(url)
+    if parts.netloc not in (urlsplit(STEAM_API_BASE).netloc, urlsplit(STEAM_STORE_BASE).netloc):
+        return 'other'
+    segments = [segment for segment in parts.path.split('/')
+                if segment and segment != 'api' and not (segment[0] == 'v' and segment[1:].isdigit())]
+    return segments[-1] if segments else 'other'
+
+
+class SteamClient:
+    """Pooled, rate-limited, retrying HTTP client for Steam endpoints"""
+
+    def __init__(self, rate_limiters=None, pool_size=STEAM_HTTP_POOL_SIZE,
+                 retries=STEAM_HTTP_RETRIES, backoff=STEAM_HTTP_BACKOFF,
+                 max_backoff=STEAM_HTTP_MAX_BACKOFF, deadline=STEAM_HTTP_DEADLINE, observer=None):
+        # host -> SharedTokenBucket; hosts without an entry are not rate limited
+        self.rate_limiters = rate_limiters or {}
+        # Called as observer(url, status, seconds) after every attempt, with
+        # status None when the request raised; rate limit waits aren't included
+        self.observer = observer
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @staticmethod
+    def timeout_for(url):
+        path = urlsplit(url).path
+        for fragment, timeout in TIMEOUT_POLICY:
+            if fragment in path:
+                return timeout
+        return DEFAULT_TIMEOUT
+
+    def _backoff_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        # Full jitter: anywhere up to the exponential ceiling
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    @staticmethod
+    def _clip_timeout(timeout, remaining):
+        """Shorten a timeout (seconds or a (connect, read) pair) to fit the remaining budget"""
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def get(self, url, params=None, timeout=None, retries=None, deadline=None):
+        """
+        GET a Steam URL. Returns the last response, which may still be a
+        429/5xx once retries run out; connection errors and timeouts are
+        re-raised after the final attempt.
+
+        All attempts and backoff sleeps share one `deadline` in seconds: no
+        retry starts that couldn't finish in time, and the last attempt's
+        timeout is cut to whatever budget is left.
+        """
+        timeout = timeout or self.timeout_for(url)
+        retries = self.retries if retries is None else retries
+        deadline = self.deadline if deadline is None else deadline
+        give_up_at = time.monotonic() + deadline
+        limiter = self.rate_limiters.get(urlsplit(url).netloc)
+
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                waited = limiter.acquire()
+                if waited > 0.5:
+                    logger.info(f"Rate limiting: waited {waited:.2f}s before Steam API call")
+
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Steam request deadline of {deadline:.0f}s exceeded")
+
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self._clip_timeout(timeout, remaining))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._observe(url, None, started)
+                delay = self._backoff_delay(attempt)
+                if attempt == retries or time.monotonic() + delay >= give_up_at:
+                    raise
+                logger.info(f"Steam request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            else:
+                self._observe(url, response.status_code, started)
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                delay = self._backoff_delay(attempt, response)
+                if time.monotonic() + delay >= give_up_at:
+                    logger.info(f"Steam returned {response.status_code}; no time left to retry")
+                    return response
+                logger.info(f"Steam returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+
+            time.sleep(delay)
+
+    def _observe(self, url, status, started):
+        if self.observer is not None:
+            self.observer(url, status, time.perf_counter() - started)
+
+    def close(self):
+        self.session.close()
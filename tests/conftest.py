@@ -0,0 +1,70 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# No scheduler thread in test processes; the embedded one would start on first request
+os.environ.setdefault('SCHEDULER_MODE', 'external')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as gametracker  # noqa: E402
+from metrics import MultiProcessStore  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """
+    A fresh, fully migrated database that get_db() and the daily tracker
+    use. Every file the app keeps next to the database (version tokens,
+    metrics, the cover mirror) is redirected into tmp_path along with it.
+    """
+    path = tmp_path / 'gametracker.db'
+    monkeypatch.setattr(gametracker, 'DB_PATH', path)
+    monkeypatch.setattr(gametracker, 'tracker', gametracker.DailyHoursTracker(path))
+    monkeypatch.setattr(gametracker, 'data_version', gametracker.DataVersion(tmp_path / 'data_version'))
+    monkeypatch.setattr(gametracker, 'response_cache', gametracker.ResponseCache(tmp_path))
+    monkeypatch.setattr(gametracker, 'metrics_store', MultiProcessStore(str(tmp_path / 'metrics')))
+    monkeypatch.setattr(gametracker, 'cover_mirror', gametracker.CoverMirror(
+        tmp_path / 'covers', gametracker.COVER_MIRROR_MAX_BYTES, tmp_path / 'cover_mirror_version'))
+    gametracker.init_db(path)
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = gametracker.get_db(db_path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def client(db_path, monkeypatch):
+    """Test client for the app; init_db already ran, so first-request setup is skipped"""
+    monkeypatch.setattr(gametracker, '_app_initialized', True)
+    gametracker.app.config['TESTING'] = True
+    return gametracker.app.test_client()
+
+
+@pytest.fixture
+def admin(client):
+    """The test client with a logged-in session"""
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+    return client
+
+
+def add_game(conn, title, platform='PC', status='Playing', hours=0.0, rating=None):
+    cur = conn.execute('INSERT INTO games (title, platform, status, hours_played, rating) VALUES (?, ?, ?, ?, ?)',
+                       (title, platform, status, hours, rating))
+    conn.commit()
+    return cur.lastrowid
+
+
+def record_snapshot(db_path, day):
+    """Record the daily snapshot as the scheduler would on `day` (a date)"""
+    tracker = gametracker.DailyHoursTracker(db_path)
+    tracker.get_current_date_est = lambda: day
+    result = tracker.record_daily_snapshot()
+    assert result['success'], result
+    return result
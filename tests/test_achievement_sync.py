@@ -0,0 +1,83 @@
+import app as gametracker
+from conftest import add_game
+
+
+def steam(apiname, name, achieved=0, unlock_date=None, description=None, icon=None):
+    """One entry shaped like get_steam_achievements() returns it"""
+    return {'apiname': apiname, 'name': name, 'description': description, 'achieved': achieved,
+            'unlock_date': unlock_date, 'icon': icon}
+
+
+def stored(conn, game_id):
+    return {row['apiname']: dict(row) for row in conn.execute(
+        'SELECT id, apiname, title, unlocked, date FROM achievements WHERE game_id = ? ORDER BY id', (game_id,))}
+
+
+def sync(conn, game_id, achievements):
+    summary = gametracker.sync_game_achievements(conn.cursor(), game_id, achievements)
+    conn.commit()
+    return summary
+
+
+def test_resync_with_changed_schema_keeps_rows_and_unlocks(conn):
+    game_id = add_game(conn, 'Hades')
+    # Rows saved before apinames were stored
+    conn.executemany('INSERT INTO achievements (game_id, title, date, unlocked) VALUES (?, ?, ?, ?)',
+                     [(game_id, 'Escaped', '2025-01-02', 1), (game_id, 'Old Friend', None, 0)])
+    conn.commit()
+    legacy_ids = [row['id'] for row in conn.execute('SELECT id FROM achievements ORDER BY id')]
+
+    first = sync(conn, game_id, [
+        steam('ESCAPE', 'Escaped', achieved=1, unlock_date='2025-01-02'),
+        steam('FRIEND', 'Old Friend'),
+        steam('HEAT', 'Heat Seeker'),
+    ])
+    assert first == {'added': 1, 'updated': 0, 'removed': 0, 'unchanged': 2}
+    rows = stored(conn, game_id)
+    # Title matches adopt the legacy rows instead of adding duplicates
+    assert [rows['ESCAPE']['id'], rows['FRIEND']['id']] == legacy_ids
+    assert rows['ESCAPE']['unlocked'] == 1
+
+    # Steam renames one achievement, drops another, adds one and reports a new unlock
+    second = sync(conn, game_id, [
+        steam('ESCAPE', 'Escaped the Underworld', achieved=1, unlock_date='2025-01-02'),
+        steam('HEAT', 'Heat Seeker', achieved=1, unlock_date='2025-02-01'),
+        steam('FAMILY', 'Family Reunion'),
+    ])
+    assert second == {'added': 1, 'updated': 2, 'removed': 1, 'unchanged': 0}
+    after = stored(conn, game_id)
+    assert set(after) == {'ESCAPE', 'HEAT', 'FAMILY'}
+    assert after['ESCAPE']['id'] == rows['ESCAPE']['id']
+    assert after['ESCAPE']['title'] == 'Escaped the Underworld'
+    assert after['ESCAPE']['unlocked'] == 1 and after['ESCAPE']['date'] == '2025-01-02'
+    assert after['HEAT']['id'] == rows['HEAT']['id'] and after['HEAT']['unlocked'] == 1
+    assert conn.execute('SELECT COUNT(*) FROM achievements WHERE game_id = ?', (game_id,)).fetchone()[0] == 3
+
+    # Nothing changed on Steam: nothing is written
+    third = sync(conn, game_id, [
+        steam('ESCAPE', 'Escaped the Underworld', achieved=1, unlock_date='2025-01-02'),
+        steam('HEAT', 'Heat Seeker', achieved=1, unlock_date='2025-02-01'),
+        steam('FAMILY', 'Family Reunion'),
+    ])
+    assert third == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 3}
+    assert stored(conn, game_id) == after
+
+
+def test_legacy_rows_sharing_a_title_are_each_adopted_once(conn):
+    game_id = add_game(conn, 'Celeste')
+    conn.executemany("INSERT INTO achievements (game_id, title, unlocked) VALUES (?, 'Secret', ?)",
+                     [(game_id, 1), (game_id, 0)])
+    conn.commit()
+
+    summary = sync(conn, game_id, [steam('SECRET_1', 'Secret', achieved=1), steam('SECRET_2', 'Secret')])
+    assert summary['added'] == 0 and summary['removed'] == 0
+    rows = stored(conn, game_id)
+    assert set(rows) == {'SECRET_1', 'SECRET_2'}
+    assert rows['SECRET_1']['unlocked'] == 1 and rows['SECRET_2']['unlocked'] == 0
+
+
+def test_unnamed_achievements_are_skipped(conn):
+    game_id = add_game(conn, 'Outer Wilds')
+    summary = sync(conn, game_id, [steam('NAMELESS', None), steam('SUPERNOVA', 'Supernova')])
+    assert summary['added'] == 1
+    assert set(stored(conn, game_id)) == {'SUPERNOVA'}
@@ -0,0 +1,93 @@
+import pytest
+
+import app as gametracker
+from conftest import add_game
+
+
+@pytest.fixture
+def library(conn):
+    """Eight games: two favorites, and created_at ties so only the id breaks them"""
+    games = {}
+    for i in range(8):
+        game_id = add_game(conn, f'Game {i}', platform='PC' if i % 2 else 'Switch',
+                           status='Completed' if i < 3 else 'Playing')
+        conn.execute('UPDATE games SET created_at = ?, is_favorite = ?, notes = ? WHERE id = ?',
+                     ('2025-01-01 00:00:00' if i < 6 else '2025-02-01 00:00:00', int(i in (2, 5)),
+                      'a hidden gem' if i == 4 else None, game_id))
+        games[i] = game_id
+    conn.execute("INSERT INTO tags (game_id, tag) VALUES (?, 'Roguelike')", (games[7],))
+    conn.commit()
+    return games
+
+
+def ids(response):
+    body = response.get_json()
+    return [game['id'] for game in (body['games'] if isinstance(body, dict) else body)]
+
+
+def test_default_order_is_favorites_then_newest_then_id(client, library):
+    expected = [library[2], library[5], library[6], library[7], library[0], library[1], library[3], library[4]]
+    assert ids(client.get('/api/games')) == expected
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 5])
+def test_pages_cover_every_game_once_when_sort_keys_tie(client, library, limit):
+    full = ids(client.get('/api/games'))
+    seen = []
+    cursor = None
+    while True:
+        url = f'/api/games?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url).get_json()
+        assert len(body['games']) <= limit
+        seen.extend(game['id'] for game in body['games'])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert seen == full
+
+
+@pytest.mark.parametrize('query', ['cursor=not-a-cursor', 'cursor=WzEsMl0', 'limit=0', 'limit=abc',
+                                   'fields=title,secret', 'favorite=yes'])
+def test_bad_arguments_return_400(client, library, query):
+    response = client.get(f'/api/games?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_fields_projection(client, library):
+    games = client.get('/api/games?fields=title,tags').get_json()
+    assert all(set(game) == {'id', 'title', 'tags'} for game in games)
+    # No cover is mirrored here, so there is no srcset to return, but cover_url stays out too
+    assert all(set(game) == {'id', 'title'} for game in client.get('/api/games?fields=title,cover_srcset').get_json())
+
+    page = client.get('/api/games?fields=title&limit=3').get_json()
+    assert all(set(game) == {'id', 'title'} for game in page['games'])
+    assert page['next_cursor']
+
+
+def test_search_matches_title_notes_and_tags(client, library):
+    assert ids(client.get('/api/games?search=game 3')) == [library[3]]
+    assert ids(client.get('/api/games?search=HIDDEN')) == [library[4]]
+    assert ids(client.get('/api/games?search=rogue')) == [library[7]]
+    assert ids(client.get('/api/games?search=nothing matches')) == []
+
+
+def test_status_platform_and_favorite_filters(client, library):
+    assert ids(client.get('/api/games?status=Completed')) == [library[2], library[0], library[1]]
+    assert ids(client.get('/api/games?status=Completed&platform=PC')) == [library[1]]
+    assert ids(client.get('/api/games?favorite=1')) == [library[2], library[5]]
+    assert library[2] not in ids(client.get('/api/games?favorite=0'))
+    page = client.get('/api/games?favorite=0&limit=2').get_json()
+    assert [game['id'] for game in page['games']] == [library[6], library[7]]
+
+
+def test_query_games_attaches_achievement_progress(conn, library):
+    conn.executemany('INSERT INTO achievements (game_id, title, unlocked) VALUES (?, ?, ?)',
+                     [(library[0], 'First', 1), (library[0], 'Second', 0)])
+    conn.commit()
+    rows, next_cursor = gametracker.query_games(conn.cursor())
+    progress = {game['id']: game['achievement_progress'] for game in rows}
+    assert next_cursor is None
+    assert progress[library[0]] == {'unlocked_achievements': 1, 'total_achievements': 2,
+                                    'completion_percentage': 50.0}
+    assert progress[library[1]] is None
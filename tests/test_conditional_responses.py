@@ -0,0 +1,63 @@
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import app as gametracker
+from conftest import add_game
+
+
+def set_data_version(token, modified):
+    gametracker.data_version.path.write_text(f'{token} {modified}')
+
+
+def test_matching_etag_returns_304(client, conn):
+    add_game(conn, 'Hades')
+    first = client.get('/api/stats')
+    assert first.status_code == 200 and first.headers['ETag']
+
+    again = client.get('/api/stats', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+def test_write_changes_the_etag(admin, conn):
+    game_id = add_game(conn, 'Hades', status='Playing')
+    first = admin.get('/api/stats')
+
+    response = admin.post('/api/batch/update-status', json={'game_ids': [game_id], 'status': 'Completed'})
+    assert response.status_code == 200
+
+    after = admin.get('/api/stats', headers={'If-None-Match': first.headers['ETag']})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != first.headers['ETag']
+    assert after.get_json()['completed_games'] == 1
+
+
+def test_etag_depends_on_the_url(client, conn):
+    add_game(conn, 'Hades')
+    games = client.get('/api/games')
+    page = client.get('/api/games?limit=1', headers={'If-None-Match': games.headers['ETag']})
+    assert page.status_code == 200
+
+
+def test_if_modified_since_once_the_second_is_over(client, conn):
+    add_game(conn, 'Hades')
+    modified = int(time.time()) - 10
+    set_data_version('settled', modified)
+
+    first = client.get('/api/stats')
+    assert first.last_modified == datetime.fromtimestamp(modified, tz=timezone.utc)
+    again = client.get('/api/stats', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert again.status_code == 304
+
+
+def test_no_last_modified_within_the_write_second(client, conn):
+    add_game(conn, 'Hades')
+    set_data_version('fresh', time.time())
+
+    response = client.get('/api/stats')
+    assert 'Last-Modified' not in response.headers
+    # A second write in this same second would keep the timestamp; only the ETag can tell
+    later = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    assert client.get('/api/stats', headers={'If-Modified-Since': later}).status_code == 200
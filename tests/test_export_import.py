@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import app as gametracker
+from conftest import add_game
+
+
+def populate(conn):
+    games = [add_game(conn, f'Game {i}', platform='PC' if i % 2 else 'Switch',
+                      status='Completed' if i % 3 == 0 else 'Playing', hours=i * 2.5, rating=i % 5 or None)
+             for i in range(1, 8)]
+    conn.executemany('INSERT INTO tags (game_id, tag) VALUES (?, ?)',
+                     [(game_id, tag) for game_id in games[:3] for tag in ('cozy', 'roguelike')])
+    conn.executemany('INSERT INTO achievements (game_id, title, description, date, unlocked) VALUES (?, ?, ?, ?, ?)',
+                     [(game_id, f'Achievement {n}', 'Do the "thing"\nand more', '2025-01-02', n % 2)
+                      for game_id in games for n in range(4)])
+    conn.execute("INSERT INTO top10_games (game_id, position, why_i_love_it) VALUES (?, 1, 'ünïcode ✓')", (games[0],))
+    conn.execute("INSERT INTO daily_snapshots (date, total_hours, games_played) VALUES ('2025-01-01', 70, 7)")
+    conn.executemany('''
+        INSERT INTO daily_game_snapshots (date, game_id, game_title, hours_played, cover_url)
+        VALUES ('2025-01-01', ?, ?, ?, NULL)
+    ''', [(game_id, f'Game {i}', i * 2.5) for i, game_id in enumerate(games, start=1)])
+    conn.commit()
+
+
+def table_contents(conn):
+    return {table: [tuple(row) for row in conn.execute(f'SELECT rowid, * FROM {table} ORDER BY rowid')]
+            for table in gametracker.EXPORT_TABLES}
+
+
+@pytest.fixture
+def source(conn):
+    populate(conn)
+    return conn
+
+
+@pytest.fixture
+def target(tmp_path):
+    conn = gametracker.get_db(tmp_path / 'target.db')
+    yield conn
+    conn.close()
+
+
+def test_export_then_import_reproduces_every_table(source, target, monkeypatch):
+    # Small fetches so the export spans several chunks
+    monkeypatch.setattr(gametracker, 'EXPORT_FETCH_SIZE', 5)
+    lines = ''.join(gametracker.iter_export_lines(source)).splitlines(keepends=True)
+
+    summary = gametracker.import_ndjson(target, lines)
+
+    assert summary['complete'] and summary['skipped'] == 0
+    assert table_contents(target) == table_contents(source)
+    assert gametracker.check_stats_summary(target) == []
+    assert gametracker.read_stats_summary(target.cursor()) == gametracker.read_stats_summary(source.cursor())
+
+
+def test_interrupted_import_resumes_from_checkpoint(source, target, monkeypatch):
+    monkeypatch.setattr(gametracker, 'BULK_WRITE_CHUNK_SIZE', 4)
+    lines = ''.join(gametracker.iter_export_lines(source)).splitlines(keepends=True)
+
+    first = gametracker.import_ndjson(target, lines[:len(lines) // 2])
+    assert not first['complete']
+    second = gametracker.import_ndjson(target, lines)
+
+    assert second['complete'] and second['skipped'] > 0
+    assert table_contents(target) == table_contents(source)
+    assert target.execute('SELECT COUNT(*) FROM import_checkpoints').fetchone()[0] == 0
+
+
+def test_resumed_export_continues_after_rowid(source):
+    header, *rows = ''.join(gametracker.iter_export_lines(source)).splitlines()
+    export_id = json.loads(header)['export_id']
+    records = [json.loads(line) for line in rows[:-1]]
+    cut = records[10]
+
+    resumed = ''.join(gametracker.iter_export_lines(source, export_id, cut['table'], cut['rowid'],
+                                                    include_header=False)).splitlines()
+    assert [json.loads(line) for line in resumed[:-1]] == records[11:]
+
+
+def test_import_rejects_foreign_input(target):
+    with pytest.raises(ValueError):
+        gametracker.import_ndjson(target, ['{"format": "something-else", "version": 1}\n'])
+    with pytest.raises(ValueError):
+        gametracker.import_ndjson(target, ['not json\n'])
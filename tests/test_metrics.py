@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+from metrics import MetricsRegistry, MultiProcessStore
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ('endpoint',))
+    latency = registry.histogram('request_seconds', 'Latency', ('endpoint',), buckets=(0.1, 1))
+    return registry, requests, latency
+
+
+def write_worker_file(store, pid, requests, seconds):
+    """What a worker with this pid would have flushed before it exited"""
+    registry, counter, histogram = make_registry()
+    for _ in range(requests):
+        counter.inc(endpoint='api_games')
+        histogram.observe(seconds, endpoint='api_games')
+    os.makedirs(store.directory, exist_ok=True)
+    with open(os.path.join(store.directory, f'{pid}-{pid:x}.json'), 'w') as f:
+        json.dump(registry.dump(), f)
+
+
+def test_exited_workers_are_folded_into_the_aggregate(tmp_path):
+    store = MultiProcessStore(str(tmp_path / 'metrics'))
+    registry, counter, _ = make_registry()
+    counter.inc(endpoint='api_games')
+    store.flush(registry, force=True)
+
+    write_worker_file(store, exited_pid(), requests=3, seconds=0.5)
+    write_worker_file(store, exited_pid(), requests=2, seconds=2)
+    rendered = registry.render(store.collect(registry))
+
+    assert 'requests_total{endpoint="api_games"} 6' in rendered
+    assert 'request_seconds_bucket{endpoint="api_games",le="1"} 3' in rendered
+    assert 'request_seconds_count{endpoint="api_games"} 5' in rendered
+    remaining = sorted(name for name in os.listdir(store.directory) if name.endswith('.json'))
+    assert remaining == sorted([MultiProcessStore.AGGREGATE_FILE, store._filename])
+
+    # Another restart: the aggregate keeps growing instead of the directory
+    write_worker_file(store, exited_pid(), requests=4, seconds=0.05)
+    rendered = registry.render(store.collect(registry))
+    assert 'requests_total{endpoint="api_games"} 10' in rendered
+    assert len([name for name in os.listdir(store.directory) if name.endswith('.json')]) == 2
+
+
+def test_live_workers_are_kept(tmp_path):
+    store = MultiProcessStore(str(tmp_path / 'metrics'))
+    registry, counter, _ = make_registry()
+    counter.inc(3, endpoint='api_stats')
+    store.flush(registry, force=True)
+
+    assert store.compact(registry) == 0
+    assert 'requests_total{endpoint="api_stats"} 3' in registry.render(store.collect(registry))
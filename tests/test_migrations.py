@@ -0,0 +1,50 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import app as gametracker
+
+REPO = Path(__file__).resolve().parent.parent
+LATEST = gametracker.MIGRATIONS[-1][0]
+
+
+def test_fresh_database_is_at_latest_version(conn):
+    assert gametracker.get_schema_version(conn) == LATEST
+    assert gametracker.run_migrations(conn) == []
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in gametracker.MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+
+def test_concurrent_workers_migrate_once(tmp_path):
+    path = tmp_path / 'gametracker.db'
+    script = 'import sys, app; app.init_db(sys.argv[1])'
+    workers = [subprocess.Popen([sys.executable, '-c', script, str(path)], cwd=REPO,
+                                env={'SCHEDULER_MODE': 'external', 'PATH': ''},
+                                stderr=subprocess.PIPE, text=True)
+               for _ in range(4)]
+    for worker in workers:
+        _, stderr = worker.communicate(timeout=60)
+        assert worker.returncode == 0, stderr
+
+    conn = gametracker.get_db(path)
+    try:
+        assert gametracker.get_schema_version(conn) == LATEST
+        assert gametracker.check_stats_summary(conn) == []
+    finally:
+        conn.close()
+
+
+def test_upgrade_counts_latest_snapshot_as_last_scheduled_run(conn):
+    # Roll the database back to before migration 15, with snapshot history
+    conn.execute('DROP TABLE scheduler_lease')
+    conn.executemany('INSERT INTO daily_snapshots (date, total_hours, games_played) VALUES (?, 0, 0)',
+                     [('2025-03-01',), ('2025-03-02',)])
+    conn.execute('PRAGMA user_version = 14')
+    conn.commit()
+
+    assert gametracker.run_migrations(conn) == [15, 16]
+    row = conn.execute("SELECT last_run_date FROM scheduler_lease WHERE name = 'daily-snapshot'").fetchone()
+    assert row['last_run_date'] == '2025-03-02'
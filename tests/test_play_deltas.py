@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+
+import app as gametracker
+from conftest import add_game, record_snapshot
+
+START = date(2025, 1, 1)
+DAYS = gametracker.SNAPSHOT_KEYFRAME_DAYS + 15
+# Days the scheduler missed; the next snapshot diffs against the one before
+SKIPPED = {7, 8, 29, 30}
+
+
+def play(conn, games, day):
+    """Change the library the way a day of play would"""
+    for index, game_id in enumerate(games):
+        if day % (index + 2) == 0:
+            conn.execute('UPDATE games SET hours_played = hours_played + ? WHERE id = ?',
+                         (round(0.5 * (index + 1), 1), game_id))
+    if day == 12:
+        conn.execute("UPDATE games SET title = 'Renamed', cover_url = 'renamed.jpg' WHERE id = ?", (games[1],))
+    if day == 20:
+        # Hours reset (e.g. removed from the Steam library) and come back later
+        conn.execute('UPDATE games SET hours_played = 0 WHERE id = ?', (games[2],))
+    if day == 33:
+        conn.execute('UPDATE games SET hours_played = 5 WHERE id = ?', (games[2],))
+    conn.commit()
+
+
+def library_state(conn):
+    return {row['id']: (row['title'], row['hours_played'], row['cover_url']) for row in conn.execute(
+        'SELECT id, title, hours_played, cover_url FROM games WHERE hours_played > 0')}
+
+
+def record_history(db_path, conn):
+    """
+    Record a snapshot every day but the SKIPPED ones. Returns the library
+    state on each recorded date and the hours each game gained per date.
+    """
+    games = [add_game(conn, f'Game {i}', hours=1.0 + i) for i in range(4)]
+    add_game(conn, 'Never played')
+    states = {}
+    deltas = {}
+    previous = None
+    for day in range(DAYS):
+        play(conn, games, day)
+        if day in SKIPPED:
+            continue
+        date_str = (START + timedelta(days=day)).isoformat()
+        record_snapshot(db_path, START + timedelta(days=day))
+        states[date_str] = library_state(conn)
+        if previous is not None:
+            gained = {game_id: round(hours - states[previous].get(game_id, ('', 0, ''))[1], 1)
+                      for game_id, (_, hours, _) in states[date_str].items()}
+            deltas[date_str] = {game_id: hours for game_id, hours in gained.items() if hours > 0.01}
+        previous = date_str
+    return states, deltas
+
+
+def stored_deltas(conn):
+    deltas = {}
+    for row in conn.execute('SELECT date, game_id, hours_added FROM daily_play_deltas'):
+        deltas.setdefault(row['date'], {})[row['game_id']] = row['hours_added']
+    return deltas
+
+
+def test_recorded_snapshots_rebuild_exactly(db_path, conn):
+    states, _ = record_history(db_path, conn)
+
+    keyframes = [row['date'] for row in conn.execute(
+        'SELECT date FROM daily_snapshots WHERE is_keyframe = 1 ORDER BY date')]
+    assert keyframes[0] == START.isoformat() and len(keyframes) == 2
+    full_copies = sum(len(state) for state in states.values())
+    assert conn.execute('SELECT COUNT(*) FROM daily_game_snapshots').fetchone()[0] < full_copies
+
+    cur = conn.cursor()
+    for date_str, state in states.items():
+        rebuilt = gametracker.DailyHoursTracker.get_snapshot_games(cur, date_str)
+        assert {game_id: (row['game_title'], row['hours_played'], row['cover_url'])
+                for game_id, row in rebuilt.items()} == state, date_str
+
+
+def test_play_deltas_span_missed_days(db_path, conn):
+    _, expected = record_history(db_path, conn)
+    assert stored_deltas(conn) == {date_str: games for date_str, games in expected.items() if games}
+
+    # Days 7 and 8 were missed, so day 9 holds what was played since day 6
+    after_gap = (START + timedelta(days=9)).isoformat()
+    prev_dates = {row['prev_date'] for row in conn.execute(
+        'SELECT prev_date FROM daily_play_deltas WHERE date = ?', (after_gap,))}
+    assert prev_dates == {(START + timedelta(days=6)).isoformat()}
+
+
+def test_backfill_matches_deltas_written_at_snapshot_time(db_path, conn):
+    record_history(db_path, conn)
+    written = stored_deltas(conn)
+
+    conn.execute('DELETE FROM daily_play_deltas')
+    gametracker.backfill_daily_play_deltas(conn)
+    conn.commit()
+    assert stored_deltas(conn) == written
+
+
+def test_rerecording_a_day_replaces_its_deltas(db_path, conn):
+    game_id = add_game(conn, 'Hades', hours=1.0)
+    record_snapshot(db_path, START)
+    conn.execute('UPDATE games SET hours_played = 2.5 WHERE id = ?', (game_id,))
+    conn.commit()
+    record_snapshot(db_path, START + timedelta(days=1))
+    conn.execute('UPDATE games SET hours_played = 4.0 WHERE id = ?', (game_id,))
+    conn.commit()
+    record_snapshot(db_path, START + timedelta(days=1))
+
+    assert stored_deltas(conn) == {(START + timedelta(days=1)).isoformat(): {game_id: 3.0}}
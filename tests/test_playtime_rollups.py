@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+import pytest
+
+import app as gametracker
+from conftest import add_game, record_snapshot
+from test_play_deltas import record_history
+
+BUCKETS = tuple(gametracker.ROLLUP_PERIOD_SQL)
+
+
+def rollups(conn):
+    totals = {(row['bucket'], row['period']): round(row['hours'], 3)
+              for row in conn.execute('SELECT bucket, period, hours FROM playtime_rollups')
+              if abs(row['hours']) > 0.001}
+    per_game = {(row['bucket'], row['period'], row['game_id']): (row['game_title'], round(row['hours'], 3))
+                for row in conn.execute('SELECT bucket, period, game_id, game_title, hours FROM playtime_game_rollups')
+                if abs(row['hours']) > 0.001}
+    return totals, per_game
+
+
+def test_incremental_rollups_match_a_rebuild(db_path, conn):
+    record_history(db_path, conn)
+    incremental = rollups(conn)
+
+    gametracker.rebuild_playtime_rollups(conn)
+    conn.commit()
+    assert rollups(conn) == incremental
+
+
+def test_rerecorded_day_is_not_counted_twice(db_path, conn):
+    game_id = add_game(conn, 'Hades', hours=1.0)
+    record_snapshot(db_path, date(2025, 3, 3))
+    for hours in (2.0, 6.0):
+        conn.execute('UPDATE games SET hours_played = ? WHERE id = ?', (hours, game_id))
+        conn.commit()
+        record_snapshot(db_path, date(2025, 3, 4))
+
+    totals, per_game = rollups(conn)
+    assert totals == {('week', '2025-03-03'): 5.0, ('month', '2025-03-01'): 5.0, ('year', '2025-01-01'): 5.0}
+    assert per_game[('week', '2025-03-03', game_id)] == ('Hades', 5.0)
+
+
+@pytest.mark.parametrize('bucket', BUCKETS)
+def test_query_playtime_agrees_with_daily_deltas(db_path, conn, bucket):
+    _, deltas = record_history(db_path, conn)
+    first, last = min(deltas), max(deltas)
+
+    rolled = gametracker.query_playtime(conn.cursor(), bucket, first, last)
+    daily = gametracker.query_playtime(conn.cursor(), 'day', first, last)
+    expected_total = round(sum(sum(games.values()) for games in deltas.values()), 1)
+    assert rolled['total_hours'] == daily['total_hours'] == expected_total
+    assert rolled['top_games'] == daily['top_games']
+
+
+def test_weeks_start_on_monday(db_path, conn):
+    game_id = add_game(conn, 'Hades', hours=1.0)
+    sunday = date(2025, 3, 9)
+    record_snapshot(db_path, sunday - timedelta(days=1))
+    for day in (sunday, sunday + timedelta(days=1)):
+        conn.execute('UPDATE games SET hours_played = hours_played + 1 WHERE id = ?', (game_id,))
+        conn.commit()
+        record_snapshot(db_path, day)
+
+    weeks = gametracker.query_playtime(conn.cursor(), 'week', '2025-03-01', '2025-03-31')['series']
+    assert weeks == [{'period': '2025-03-03', 'hours': 1.0}, {'period': '2025-03-10', 'hours': 1.0}]
@@ -0,0 +1,55 @@
+import app as gametracker
+from conftest import add_game
+
+
+def cached_scopes():
+    return {scope for scope, _ in gametracker.response_cache._entries}
+
+
+def test_repeated_get_is_served_from_the_cache(client, conn):
+    add_game(conn, 'Hades')
+    first = client.get('/api/games')
+    hits = gametracker.response_cache.hits
+
+    second = client.get('/api/games')
+    assert gametracker.response_cache.hits == hits + 1
+    assert second.get_json() == first.get_json()
+
+
+def test_invalidation_drops_only_the_written_scopes(admin, conn):
+    game_id = add_game(conn, 'Hades')
+    for url in ('/api/games', '/api/stats', '/api/top10'):
+        assert admin.get(url).status_code == 200
+    assert cached_scopes() == {'games', 'stats', 'top10'}
+
+    # Saving the Top 10 only changes the top10 scope
+    response = admin.post('/api/top10', json=[{'game_id': game_id, 'position': 1}])
+    assert response.status_code == 200
+    assert cached_scopes() == {'games', 'stats'}
+
+    hits = gametracker.response_cache.hits
+    admin.get('/api/games')
+    assert gametracker.response_cache.hits == hits + 1
+    assert [game['game_id'] for game in admin.get('/api/top10').get_json()] == [game_id]
+
+
+def test_write_serves_fresh_data_afterwards(admin, conn):
+    game_id = add_game(conn, 'Hades', status='Playing')
+    assert admin.get('/api/games').get_json()[0]['status'] == 'Playing'
+
+    admin.post('/api/batch/update-status', json={'game_ids': [game_id], 'status': 'Completed'})
+    assert 'games' not in cached_scopes()
+    assert admin.get('/api/games').get_json()[0]['status'] == 'Completed'
+
+
+def test_invalidation_reaches_other_processes_through_the_scope_token(client, conn, tmp_path):
+    add_game(conn, 'Hades')
+    client.get('/api/games')
+    # Another worker's cache shares the version files but not the entries
+    other_worker = gametracker.ResponseCache(tmp_path)
+    other_worker.invalidate('games')
+
+    misses = gametracker.response_cache.misses
+    client.get('/api/games')
+    assert gametracker.response_cache.misses == misses + 1
+    assert 'games' in cached_scopes()
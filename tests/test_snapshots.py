@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import app as gametracker
+from conftest import add_game
+
+START = date(2025, 1, 1)
+DAYS = gametracker.SNAPSHOT_KEYFRAME_DAYS + 10
+
+
+def write_full_copies(conn, games):
+    """
+    The pre-compaction layout: every day stores a full copy of every game
+    with hours. Returns date -> {game_id: (title, hours, cover_url)}.
+    """
+    expected = {}
+    for day in range(DAYS):
+        date_str = (START + timedelta(days=day)).isoformat()
+        state = {}
+        for game_id in games:
+            hours = round(game_id * 1.5 + (day // 3 if game_id % 2 else 0), 1)
+            # One game leaves the snapshot for a stretch across the keyframe and comes back
+            if game_id == games[0] and 25 <= day < 35:
+                hours = 0
+            if hours > 0:
+                cover = f'cover-{game_id}-{day // 20}.jpg'
+                state[game_id] = (f'Game {game_id}', hours, cover)
+        conn.execute('INSERT INTO daily_snapshots (date, total_hours, games_played) VALUES (?, ?, ?)',
+                     (date_str, sum(hours for _, hours, _ in state.values()), len(state)))
+        conn.executemany('''
+            INSERT INTO daily_game_snapshots (date, game_id, game_title, hours_played, cover_url)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(date_str, game_id, *values) for game_id, values in state.items()])
+        expected[date_str] = state
+    conn.commit()
+    return expected
+
+
+def test_compaction_round_trip_across_keyframe_boundary(conn):
+    games = [add_game(conn, f'Game {i}') for i in range(1, 6)]
+    expected = write_full_copies(conn, games)
+    rows_before = conn.execute('SELECT COUNT(*) FROM daily_game_snapshots').fetchone()[0]
+
+    gametracker.compact_daily_game_snapshots(conn)
+    conn.commit()
+
+    keyframes = [row['date'] for row in conn.execute(
+        'SELECT date FROM daily_snapshots WHERE is_keyframe = 1 ORDER BY date')]
+    assert keyframes == [START.isoformat(),
+                         (START + timedelta(days=gametracker.SNAPSHOT_KEYFRAME_DAYS)).isoformat()]
+    assert conn.execute('SELECT COUNT(*) FROM daily_game_snapshots').fetchone()[0] < rows_before
+
+    cur = conn.cursor()
+    for date_str, state in expected.items():
+        rebuilt = gametracker.DailyHoursTracker.get_snapshot_games(cur, date_str)
+        assert {game_id: (row['game_title'], row['hours_played'], row['cover_url'])
+                for game_id, row in rebuilt.items()} == state, date_str
+
+
+def test_get_snapshot_games_orders_by_hours(conn):
+    games = [add_game(conn, f'Game {i}') for i in range(1, 4)]
+    conn.execute("INSERT INTO daily_snapshots (date, total_hours, games_played) VALUES ('2025-01-01', 6, 3)")
+    conn.executemany('''
+        INSERT INTO daily_game_snapshots (date, game_id, game_title, hours_played, cover_url)
+        VALUES ('2025-01-01', ?, ?, ?, NULL)
+    ''', [(games[0], 'Game 1', 1.0), (games[1], 'Game 2', 3.0), (games[2], 'Game 3', 2.0)])
+    conn.commit()
+
+    rebuilt = gametracker.DailyHoursTracker.get_snapshot_games(conn.cursor(), '2025-01-01')
+    assert list(rebuilt) == [games[1], games[2], games[0]]
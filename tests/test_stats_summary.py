@@ -0,0 +1,37 @@
+import app as gametracker
+from conftest import add_game
+
+
+def summary_after_rebuild(conn):
+    gametracker.rebuild_stats_summary(conn)
+    return gametracker.read_stats_summary(conn.cursor())
+
+
+def test_triggers_match_rebuild_after_inserts_updates_and_deletes(conn):
+    first = add_game(conn, 'Hades', platform='PC', status='Completed', hours=42.5, rating=5)
+    second = add_game(conn, 'Celeste', platform='Switch', status='Playing', hours=12.0, rating=4)
+    third = add_game(conn, 'Outer Wilds', platform='PC', status='Backlog', hours=0.0)
+    conn.executemany('INSERT INTO achievements (game_id, title, unlocked) VALUES (?, ?, ?)',
+                     [(first, 'Escape', 1), (first, 'Heat 8', 0), (second, 'Summit', 1), (third, 'Supernova', 0)])
+    conn.commit()
+
+    conn.execute("UPDATE games SET status = 'Completed', rating = 3, hours_played = 20 WHERE id = ?", (second,))
+    conn.execute("UPDATE games SET platform = '' WHERE id = ?", (third,))
+    conn.execute('UPDATE achievements SET unlocked = 1 WHERE game_id = ?', (first,))
+    conn.execute('DELETE FROM achievements WHERE game_id = ?', (third,))
+    conn.execute('DELETE FROM games WHERE id = ?', (first,))
+    conn.commit()
+
+    assert gametracker.check_stats_summary(conn) == []
+    incremental = gametracker.read_stats_summary(conn.cursor())
+    assert incremental == summary_after_rebuild(conn)
+    assert incremental['total_games'] == 2
+    assert incremental['status_breakdown'] == {'Completed': 1, 'Backlog': 1}
+    assert incremental['platform_breakdown'] == {'Switch': 1}
+
+
+def test_empty_library(conn):
+    assert gametracker.check_stats_summary(conn) == []
+    stats = summary_after_rebuild(conn)
+    assert stats['total_games'] == 0
+    assert stats['avg_rating'] is None
@@ -0,0 +1,63 @@
+"""
+Cover thumbnail generation.
+
+Kept out of app.py so process-pool workers only import this module and
+Pillow, not the whole Flask app.
+"""
+
+import os
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional; without it covers are served full size
+    Image = None
+
+# Pillow format name and encoder options per output extension
+FORMATS = {
+    'avif': ('AVIF', {'quality': 55}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+
+def supported_formats(wanted):
+    """The subset of `wanted` extensions this Pillow build can encode"""
+    if Image is None:
+        return []
+    return [ext for ext in wanted if ext in FORMATS and features.check(FORMATS[ext][0].lower())]
+
+
+def thumbnail_name(source_name, width, ext):
+    return f"{Path(source_name).stem}-{width}.{ext}"
+
+
+def generate_cover_thumbnails(source_path, thumbs_path, widths, formats):
+    """
+    Write resized copies of one cover for every width narrower than the
+    source, in every format. Existing files are left alone, so this is safe
+    to call again. Returns the list of thumbnail file names.
+    """
+    source_path = Path(source_path)
+    thumbs_path = Path(thumbs_path)
+    names = []
+
+    with Image.open(source_path) as img:
+        img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        for width in sorted(widths):
+            if width >= img.width:
+                continue
+            height = max(1, round(img.height * width / img.width))
+            resized = None
+            for ext in formats:
+                name = thumbnail_name(source_path.name, width, ext)
+                path = thumbs_path / name
+                if not path.exists():
+                    if resized is None:
+                        resized = img.resize((width, height), Image.LANCZOS)
+                    pil_format, options = FORMATS[ext]
+                    tmp_path = path.with_name(f".{name}.{os.getpid()}.tmp")
+                    resized.save(tmp_path, format=pil_format, **options)
+                    os.replace(tmp_path, path)
+                names.append(name)
+
+    return names